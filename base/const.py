@@ -55,6 +55,12 @@ ARC_ASPECTNODE_FILTER = 'aspectNodeFilterArc'
 
 # Extended link role
 ROLE_LINK = 'http://www.xbrl.org/2003/role/link'
+# Linkbase reference roles
+ROLE_LINKBASE_REF_LABEL = 'http://www.xbrl.org/2003/role/labelLinkbaseRef'
+ROLE_LINKBASE_REF_REFERENCE = 'http://www.xbrl.org/2003/role/referenceLinkbaseRef'
+ROLE_LINKBASE_REF_PRESENTATION = 'http://www.xbrl.org/2003/role/presentationLinkbaseRef'
+ROLE_LINKBASE_REF_CALCULATION = 'http://www.xbrl.org/2003/role/calculationLinkbaseRef'
+ROLE_LINKBASE_REF_DEFINITION = 'http://www.xbrl.org/2003/role/definitionLinkbaseRef'
 # Standard roles
 ROLE_LABEL = 'http://www.xbrl.org/2003/role/label'
 ROLE_LABEL_2008 = 'http://www.xbrl.org/2008/role/label'
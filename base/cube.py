@@ -59,15 +59,12 @@ class Cube:
                         self.add_mem(dimfull, f'{(e2.tag.replace("{", "").replace("}", ":"))}|{e2.text}', ent))
 
     def handle_concept(self, qname, xid):
-        pref = qname.split(':')[0] if ':' in qname else None
-        if pref is None:
+        if ':' not in qname:
             return
-        namespace = xid.taxonomy.resolve_prefix(pref)
-        nm = qname.split(':')[1] if ':' in qname else qname
         concept = xid.taxonomy.concepts_by_qname.get(qname, None)
         if concept is None:
             return
-        self.add_label(self.add_lex(f'{namespace}:{nm}'), concept.get_label())
+        self.add_label(self.add_lex(xid.taxonomy.resolve_qname(qname)), concept.get_label())
 
     def add_label(self, key, label):
         if key is None or label is None:
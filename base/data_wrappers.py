@@ -19,8 +19,15 @@ Enumeration = namedtuple('Enumeration', 'Key,Concepts,Members')
     then the arc's 'to' attribute points to the concept. If it is in the chain_up collection, then 
     the arc's 'from' attribute points to the concept.
     IsLeaf: True if the node does not have descendant nodes, otherwise False.
+    Label: Label of the concept. If the node is created without label (None), the label is resolved on access.
 """
-BaseSetNode = namedtuple('BaseSetNode', 'Concept,Level,Arc,IsLeaf,Label')
+class BaseSetNode(namedtuple('BaseSetNode', 'Concept,Level,Arc,IsLeaf,Label')):
+    __slots__ = ()
+
+    @property
+    def Label(self):
+        label = tuple.__getitem__(self, 4)
+        return self.Concept.get_label() if label is None else label
 
 
 """ Represents a constraint in a table cell.
@@ -46,3 +53,14 @@ OimFact = namedtuple('OimFact', 'Id,Signature,Value')
 
 DpmMapMandatoryDimensions = ['Label', 'Metrics', 'Data Type', 'Period Type']
 Axis = enum.Enum('Axis', 'X Y Z')
+
+""" Compact records emitted by the streaming instance reader (instance.m_xbrl_stream).
+    StreamContext.Dimensions is a tuple of (dimension QName, member) pairs, where member is the member QName for
+    explicit dimensions and the text value for typed dimensions.
+    StreamUnit.Measure is the unit signature, e.g. iso4217:EUR or iso4217:EUR/xbrli:shares.
+    StreamFact.Id is the id attribute of the fact or, if it has none, the string f<n>, where n is the position of the
+    fact in the document, counting nested facts. StreamFact.Parent is the id of the containing tuple fact, or None for
+    top level facts. """
+StreamContext = namedtuple('StreamContext', 'Id,EntityScheme,EntityIdentifier,PeriodInstant,PeriodStart,PeriodEnd,Dimensions')
+StreamUnit = namedtuple('StreamUnit', 'Id,Measure')
+StreamFact = namedtuple('StreamFact', 'Id,Concept,ContextRef,UnitRef,Decimals,Precision,Value,Parent')
@@ -32,42 +32,57 @@ class XmlElementBase:
     def serialize(self):
         if self.origin is None:
             return None
-        if self.origin.tag is lxml.Comment:
-            return f'<!-- {self.origin.text} -->'
-        output = [f'<{self.qname}']
-        self.serialize_attributes(output)
-        if len(self.origin):
-            output.append('>')
-            if self.origin.text:
-                output.append(self.origin.text)
-            for e2 in self.origin.iterchildren():
-                eb2 = XmlElementBase(e2, parsers=None, assign_origin=True)
-                output.append(eb2.serialize())
-                if e2.tail:
-                    output.append(e2.tail)
-            if self.origin.tail:
-                output.append(self.origin.tail)
-            output.append(f'</{self.qname}>')
-        else:
-            if not self.origin.text:
-                output.append("/>")
-            else:
-                output.append(f'>{util.escape_xml(self.origin.text)}</{self.qname}>')
-        return ''.join(output)
+        return serialize_element(self.origin)
 
     def serialize_attributes(self, output):
-        for a in self.origin.attrib.items():
-            a_value = a[1]
-            a_name = util.get_local_name(a[0])
-            a_uri = util.get_namespace(a[0])
-            a_qname = a_name
-            if a_uri:
-                plist = [p for p, u in self.origin.nsmap.items() if u == a_uri]
-                a_prefix = plist[0] if plist else 'ns1'
-                a_qname = f'{a_prefix}:{a_name}'
-            output.append(f' {a_qname}="{a_value}"')
+        append_attributes(self.origin, output)
 
     def l_default(self, e):
         default_method = self.parsers.get('default')
         if default_method is not None:
             default_method(e)
+
+
+def serialize_element(e):
+    """ Serializes an element the same way as XmlElementBase.serialize, but without creating wrapper objects. """
+    output = []
+    append_element(e, output)
+    return ''.join(output)
+
+
+def append_element(e, output):
+    if e.tag is lxml.Comment:
+        output.append(f'<!-- {e.text} -->')
+        return
+    name = util.get_local_name(str(e.tag))
+    qname = f'{e.prefix}:{name}' if e.prefix else name
+    output.append(f'<{qname}')
+    append_attributes(e, output)
+    if len(e):
+        output.append('>')
+        if e.text:
+            output.append(e.text)
+        for e2 in e.iterchildren():
+            append_element(e2, output)
+            if e2.tail:
+                output.append(e2.tail)
+        if e.tail:
+            output.append(e.tail)
+        output.append(f'</{qname}>')
+    elif not e.text:
+        output.append('/>')
+    else:
+        output.append(f'>{util.escape_xml(e.text)}</{qname}>')
+
+
+def append_attributes(e, output):
+    for a_name, a_value in e.attrib.items():
+        a_uri = util.get_namespace(a_name)
+        a_qname = util.get_local_name(a_name)
+        if a_uri == const.NS_XML:
+            a_qname = f'xml:{a_qname}'  # The xml prefix is never declared
+        elif a_uri:
+            plist = [p for p, u in e.nsmap.items() if u == a_uri]
+            a_prefix = plist[0] if plist else 'ns1'
+            a_qname = f'{a_prefix}:{a_qname}'
+        output.append(f' {a_qname}="{a_value}"')
@@ -28,28 +28,7 @@ class XmlFileBase(ebase.XmlElementBase):
         super().__init__(root, parsers)
 
     def get_root(self):
-        """ If the location can be found in an open package, then extract it from the package """
-        url = self.location
-        if self.pool and self.pool.packaged_locations:
-            t = self.pool.packaged_locations.get(url)
-            if t:
-                pck = t[0]
-                content = pck.get_url(url)
-                p = lxml.XMLParser(huge_tree=True)
-                try:
-                    return lxml.XML(content, parser=p)
-                except Exception:
-                    s = content.decode('utf-8')
-                    s = s.replace('\n', '')  # Try to correct eventually broken lines
-                    root = lxml.XML(bytes(s, encoding='utf-8'), parser=p)
-                    return root
-        filename = url
-        if self.pool:
-            filename = self.pool.cache(url)
-        elif url.startswith('http://') or url.startswith('https://'):
-            filename, headers = urllib.request.urlretrieve(url)
-        dom = lxml.parse(filename)
-        return dom.getroot()
+        return read_root(self.location, self.pool)
 
     def l_schema_location(self, e):
         sl = e.attrib.get(f'{{{const.NS_XSI}}}schemaLocation')
@@ -80,3 +59,28 @@ class XmlFileBase(ebase.XmlElementBase):
             self.l_namespaces(e)
         for e2 in e.iterchildren():
             self.l_namespaces_rec(e2)
+
+
+def read_root(url, container_pool=None):
+    """ Reads and parses the document at given URL and returns the root element.
+        If the location can be found in an open package, then extract it from the package """
+    if container_pool and container_pool.packaged_locations:
+        t = container_pool.packaged_locations.get(url)
+        if t:
+            pck = t[0]
+            content = pck.get_url(url)
+            p = lxml.XMLParser(huge_tree=True)
+            try:
+                return lxml.XML(content, parser=p)
+            except Exception:
+                s = content.decode('utf-8')
+                s = s.replace('\n', '')  # Try to correct eventually broken lines
+                root = lxml.XML(bytes(s, encoding='utf-8'), parser=p)
+                return root
+    filename = url
+    if container_pool:
+        filename = container_pool.cache(url)
+    elif url.startswith('http://') or url.startswith('https://'):
+        filename, headers = urllib.request.urlretrieve(url)
+    dom = lxml.parse(filename)
+    return dom.getroot()
@@ -0,0 +1,158 @@
+import os
+import tempfile
+import threading
+import http.client
+import urllib.error
+import urllib.parse
+import urllib.request
+import concurrent.futures
+
+
+class Fetcher:
+    """ Downloads Web resources to local files. Connections are kept alive and reused per host, the number of
+        concurrent downloads is bounded and content is streamed byte by byte to a temporary file, which is renamed
+        to the target file name only after the download is complete. """
+    def __init__(self, max_workers=8, max_connections_per_host=4, timeout=60, chunk_size=65536):
+        self.max_workers = max_workers
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 6.1) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/41.0.2228.0 Safari/537.36',
+            'Connection': 'keep-alive'}
+        self.max_redirects = 5
+        """ Idle connections. Key is the tuple (scheme, host, port), value is the list of connections. """
+        self.idle = {}
+        """ Semaphores limiting the number of concurrent connections per host. """
+        self.host_limits = {}
+        """ Number of connections opened so far. """
+        self.connections_opened = 0
+        self.lock = threading.Lock()
+        self.proxies = urllib.request.getproxies()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        with self.lock:
+            for conns in self.idle.values():
+                for conn in conns:
+                    conn.close()
+            self.idle = {}
+
+    def get_host_limit(self, key):
+        with self.lock:
+            return self.host_limits.setdefault(key, threading.BoundedSemaphore(self.max_connections_per_host))
+
+    def get_connection(self, key):
+        """ Returns a tuple (connection, flag whether it is reused). """
+        with self.lock:
+            conns = self.idle.get(key)
+            if conns:
+                return conns.pop(), True
+        return self.open_connection(key), False
+
+    def open_connection(self, key):
+        with self.lock:
+            self.connections_opened += 1
+        scheme, host, port = key
+        proxy = self.proxies.get(scheme)
+        if proxy and not urllib.request.proxy_bypass(host):
+            p = urllib.parse.urlsplit(proxy)
+            if scheme == 'https':
+                conn = http.client.HTTPSConnection(p.hostname, p.port, timeout=self.timeout)
+                conn.set_tunnel(host, port)
+                return conn
+            return http.client.HTTPConnection(p.hostname, p.port, timeout=self.timeout)
+        if scheme == 'https':
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def release_connection(self, key, conn):
+        with self.lock:
+            self.idle.setdefault(key, []).append(conn)
+
+    def fetch(self, url, filename):
+        """ Downloads the resource at given URL and stores it in the file with given name. """
+        for i in range(self.max_redirects + 1):
+            location = self.fetch_once(url, filename)
+            if location is None:
+                return filename
+            url = urllib.parse.urljoin(url, location)
+        raise urllib.error.URLError(f'Too many redirects: {url}')
+
+    def fetch_once(self, url, filename):
+        """ Executes a single GET request. Returns the redirect location if any, otherwise None. """
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        use_proxy = parts.scheme == 'http' and self.proxies.get('http') and not urllib.request.proxy_bypass(parts.hostname)
+        target = url if use_proxy else urllib.parse.urlunsplit(('', '', parts.path or '/', parts.query, ''))
+        location, error = None, None
+        with self.get_host_limit(key):
+            conn, reused = self.get_connection(key)
+            try:
+                try:
+                    conn.request('GET', target, headers=self.headers)
+                    response = conn.getresponse()
+                except (http.client.RemoteDisconnected, ConnectionError):
+                    if not reused:
+                        raise
+                    # Idle connection was closed by the server - try again with a new one
+                    conn.close()
+                    conn = self.open_connection(key)
+                    conn.request('GET', target, headers=self.headers)
+                    response = conn.getresponse()
+                if response.status in (301, 302, 303, 307, 308):
+                    response.read()
+                    location = response.getheader('Location')
+                elif response.status != 200:
+                    response.read()
+                    error = urllib.error.HTTPError(url, response.status, response.reason, response.headers, None)
+                else:
+                    self.stream(response, filename)
+            except Exception:
+                conn.close()
+                raise
+            self.recycle(key, conn, response)
+        if error is not None:
+            raise error
+        return location
+
+    def recycle(self, key, conn, response):
+        if response.will_close:
+            conn.close()
+        else:
+            self.release_connection(key, conn)
+
+    def stream(self, response, filename):
+        folder = os.path.dirname(filename)
+        fd, temp_filename = tempfile.mkstemp(dir=folder if folder else None, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                while True:
+                    chunk = response.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+            if response.length:
+                # http.client does not raise, if the connection is closed before the announced content is sent
+                raise http.client.IncompleteRead(b'', response.length)
+            os.replace(temp_filename, filename)
+        except Exception:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
+
+    def fetch_many(self, downloads):
+        """ Downloads a list of (url, filename) pairs concurrently.
+            Returns a dictionary, where key is the URL and value is the exception raised for that URL, if any. """
+        errors = {}
+        if not downloads:
+            return errors
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.fetch, url, filename): url for url, filename in downloads}
+            for future in concurrent.futures.as_completed(futures):
+                ex = future.exception()
+                if ex is not None:
+                    errors[futures[future]] = ex
+        return errors
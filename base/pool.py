@@ -1,12 +1,14 @@
 import os, zipfile, functools
 from lxml import etree as lxml
-from xbrl.base import resolver, util
-from xbrl.taxonomy import taxonomy, schema, tpack, linkbase
-from xbrl.instance import instance
+from xbrl.base import resolver, util, fbase
+from xbrl.taxonomy import taxonomy, schema, tpack, linkbase, snapshot, discovery
+from xbrl.instance import instance, m_xbrl_stream
+from xbrl.ixbrl import ixds
 
 
 class Pool(resolver.Resolver):
-    def __init__(self, cache_folder=None, output_folder=None, alt_locations=None):
+    def __init__(self, cache_folder=None, output_folder=None, alt_locations=None, use_snapshots=False,
+                 discovery_workers=None, lazy_linkbases=False, load_profile=None):
         super().__init__(cache_folder, output_folder)
         self.taxonomies = {}
         self.current_taxonomy = None
@@ -14,6 +16,14 @@ class Pool(resolver.Resolver):
         self.discovered = {}
         self.schemas = {}
         self.linkbases = {}
+        """ Parsed schemas and linkbases shared by all taxonomies. Key is the location, value is the root element.
+            Each taxonomy builds its own schema and linkbase objects from them, so that relationships and resources
+            of one DTS are not visible in another one. """
+        self.documents = {}
+        """ Key is the location of a schema or linkbase, value is the set of hashes of taxonomies using it. """
+        self.document_references = {}
+        """ Number of schemas and linkbases taken from the parsed documents instead of being parsed again. """
+        self.parses_avoided = 0
         self.instances = {}
         """ Alternative locations. If set, this is used to resolve Qeb references to alternative (existing) URLs. """
         self.alt_locations = alt_locations
@@ -24,6 +34,17 @@ class Pool(resolver.Resolver):
         self.active_packages = {}
         """ Currently opened archive, where files can be read from - optional."""
         self.active_file_archive = None
+        """ Persistent cache of compiled taxonomies - optional. """
+        self.snapshots = snapshot.SnapshotCache(self) if use_snapshots else None
+        """ Number of threads for parallel DTS discovery. If not set, DTS is discovered serially. """
+        self.discovery_workers = discovery_workers
+        """ Documents parsed by the parallel discovery, which are not yet loaded. Key is the location. """
+        self.prefetched = {}
+        """ If set, label, reference, presentation, calculation, table and formula linkbases are loaded only
+            when their content is accessed for the first time. """
+        self.lazy_linkbases = lazy_linkbases
+        """ Load profile (taxonomy.profile.LoadProfile) filtering linkbase content to be loaded - optional. """
+        self.load_profile = load_profile
 
     def __str__(self):
         return self.info()
@@ -36,7 +57,8 @@ class Pool(resolver.Resolver):
             f'Taxonomies: {len(self.taxonomies)}',
             f'Instance documents: {len(self.instances)}',
             f'Taxonomy schemas: {len(self.schemas)}',
-            f'Taxonomy linkbases: {len(self.linkbases)}'])
+            f'Taxonomy linkbases: {len(self.linkbases)}',
+            f'Parses avoided: {self.parses_avoided}'])
 
     def index_packages(self):
         """ Index the content of taxonomy packages found in cache/taxonomies/ """
@@ -58,6 +80,10 @@ class Pool(resolver.Resolver):
         self.add_instance(xid, key, attach_taxonomy)
         return xid
 
+    def stream_instance(self, location):
+        """ Returns a streaming reader for large XBRL instance documents. The instance is not added to the pool. """
+        return m_xbrl_stream.XbrlStream(location, self)
+
     def add_instance_archive(self, archive_location, filename, key=None, attach_taxonomy=False):
         if not os.path.exists(archive_location):
             return
@@ -70,6 +96,13 @@ class Pool(resolver.Resolver):
                 root = lxml.XML(xf.read())
                 return self.add_instance_element(root, xid_file if key is None else key, attach_taxonomy)
 
+    def add_ixds(self, location, key=None, attach_taxonomy=False, workers=None):
+        """ Loads an inline XBRL document set from a folder, a ZIP archive, a list of document locations or a single
+            document. Documents are parsed in parallel by worker processes (see ixbrl.ixds.IxdsLoader). """
+        xid = ixds.IxdsLoader(self, workers).load(location)
+        self.add_instance(xid, str(location) if key is None else key, attach_taxonomy)
+        return xid
+
     def add_instance_element(self, e, key=None, attach_taxonomy=False):
         xid = instance.Instance(container_pool=self, root=e)
         if key is None:
@@ -99,7 +132,16 @@ class Pool(resolver.Resolver):
         key = ','.join(entry_points)
         if key in self.taxonomies:
             return self.taxonomies[key]  # Previously loaded
-        taxonomy.Taxonomy(ep_list, self)  # Sets the new taxonomy as current
+        tax = self.snapshots.load(ep_list) if self.snapshots else None  # Sets the stored taxonomy as current
+        if tax is not None and not self.lazy_linkbases:
+            tax.load_linkbases()  # The snapshot may be stored in lazy mode
+        if tax is None:
+            if self.discovery_workers:
+                discovery.DtsDiscovery(self, self.discovery_workers).prefetch(ep_list)
+            taxonomy.Taxonomy(ep_list, self)  # Sets the new taxonomy as current
+            self.prefetched = {}
+            if self.snapshots:
+                self.snapshots.save(self.current_taxonomy)
         self.taxonomies[key] = self.current_taxonomy
         self.packaged_locations = None
         return self.current_taxonomy
@@ -112,6 +154,7 @@ class Pool(resolver.Resolver):
         if pck is None:
             pck = tpack.TaxonomyPackage(pf)
             pck.compile()
+            self.active_packages[pf] = pck
         self.index_package_files(pck)
 
     def index_package_files(self, pck):
@@ -135,15 +178,15 @@ class Pool(resolver.Resolver):
         tax = self.add_taxonomy(entry_points)
         return tax
 
-    def add_reference(self, href, base):
+    def resolve_reference(self, href, base):
+        """ Returns the effective location of a referenced schema or linkbase, or None if it is not to be loaded. """
         if href is None:
-            return
-        """ Loads schema or linkbase depending on file type. TO IMPROVE!!! """
+            return None
         allowed_extensions = ('xsd', 'xml', 'json')
         if not href.split('.')[-1] in allowed_extensions:  # if pairs in
-            return
+            return None
         if 'http://xbrl.org' in href or 'http://www.xbrl.org' in href:
-            return  # Basic schema objects are predefined.
+            return None  # Basic schema objects are predefined.
 
         # Artificially replace the reference - only done for very specific purposes.
         if self.alt_locations and href in self.alt_locations:
@@ -151,6 +194,13 @@ class Pool(resolver.Resolver):
 
         if not href.startswith('http'):
             href = util.reduce_url(os.path.join(base, href).replace(os.path.sep, '/'))
+        return href
+
+    def add_reference(self, href, base):
+        """ Loads schema or linkbase depending on file type. TO IMPROVE!!! """
+        href = self.resolve_reference(href, base)
+        if href is None:
+            return
         key = f'{self.current_taxonomy_hash}_{href}'
         if key in self.discovered:
             return
@@ -158,15 +208,68 @@ class Pool(resolver.Resolver):
 
         try:
             if href.endswith(".xsd"):
-                sh = self.schemas.get(href, schema.Schema(href, self))
+                sh = self.get_document(href, schema.Schema)
                 self.current_taxonomy.attach_schema(href, sh)
             else:
-                lb = self.linkbases.get(href, linkbase.Linkbase(href, self))
+                lb = self.get_document(href, linkbase.Linkbase)
                 self.current_taxonomy.attach_linkbase(href, lb)
         except Exception as ex:
             print('Error when loading: ', href, ex)
             raise
 
+    def get_document(self, href, document_class):
+        """ Builds the schema or linkbase for the current taxonomy. The document is parsed only if it is not
+            parsed yet. """
+        location = util.reduce_url(href)
+        root = self.documents.get(location)
+        if root is None:
+            root = self.prefetched.pop(location, None)
+            if root is None:
+                root = fbase.read_root(location, self)
+            self.documents[location] = root
+        else:
+            self.parses_avoided += 1
+        doc = document_class(href, self, root)
+        self.reference_document(doc.location)
+        return doc
+
+    def load_deferred_linkbases(self, href, kinds):
+        """ Loads deferred linkbases of given kinds in all taxonomies using the document at given location. """
+        hashes = self.document_references.get(href)
+        if not hashes:
+            return
+        for key, tax in list(self.taxonomies.items()):
+            if not any(kind in tax.deferred_linkbases for kind in kinds):
+                continue
+            if util.get_hash(key) in hashes:
+                tax.load_linkbases(kinds)
+
+    def reference_document(self, href):
+        self.document_references.setdefault(href, set()).add(self.current_taxonomy_hash)
+
+    def remove_taxonomy(self, key):
+        """ Removes a taxonomy from the pool together with all parsed documents, which are not used by any other
+            taxonomy. """
+        tax = self.taxonomies.pop(key, None)
+        if tax is None:
+            return
+        tax_hash = util.get_hash(','.join(tax.entry_points))
+        for href in [doc.location for doc in list(tax.schemas.values()) + list(tax.linkbases.values())]:
+            refs = self.document_references.get(href)
+            if refs is None:
+                continue
+            refs.discard(tax_hash)
+            if refs:
+                continue
+            del self.document_references[href]
+            self.documents.pop(href, None)
+            self.schemas.pop(href, None)
+            self.linkbases.pop(href, None)
+        self.discovered = {k: v for k, v in self.discovered.items() if not k.startswith(f'{tax_hash}_')}
+        if self.current_taxonomy is tax:
+            self.current_taxonomy = None
+            self.current_taxonomy_hash = None
+
     @staticmethod
     def check_create_path(existing_path, part):
         new_path = os.path.join(existing_path, part)
@@ -1,8 +1,6 @@
 import os
-import shutil
 import tempfile
-import urllib.request
-from xbrl.base import const, util
+from xbrl.base import const, util, fetcher
 
 
 class Resolver:
@@ -25,8 +23,11 @@ class Resolver:
         self.taxonomies_folder = os.path.join(self.cache_folder, 'taxonomies')
         if not os.path.exists(self.taxonomies_folder):
             os.mkdir(self.taxonomies_folder)
+        self.fetcher = fetcher.Fetcher()
 
-    def cache(self, location):
+    def get_cached_location(self, location, create_folders=False):
+        """ Returns the local file name corresponding to a Web location without downloading anything.
+            For locations, which are not Web resources the location itself is returned. """
         if location is None:
             return None
         parts = location.replace(os.path.sep, "/").split('/')
@@ -35,28 +36,35 @@ class Resolver:
         if protocol not in const.KNOWN_PROTOCOLS:
             return location
         cached_file = self.cache_folder
-        new_location = '/'.join(new_parts)
         # Starts from the second part, because the first one is the protocol and the second one is empty.
         # The last part of this list is the file name, so it is handled separately
         for part in new_parts[2:-1]:
             cached_file = os.path.join(cached_file, part)
-            if not os.path.exists(cached_file):
-                os.makedirs(cached_file)
+        if create_folders:
+            os.makedirs(cached_file, exist_ok=True)  # Folders may be created concurrently by parallel downloads
         fn = new_parts[-1]
-        cached_file = os.path.join(cached_file, fn)
-        if not os.path.exists(cached_file):
-            user_agent = 'Mozilla/5.0 (Windows NT 6.1) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/41.0.2228.0 Safari/537.36'
-            headers = {'User-Agent': user_agent}
-            req = urllib.request.Request(new_location, headers=headers)
-            with urllib.request.urlopen(req) as response:
-                html = response.read()
-                with open(cached_file, 'w', encoding='utf-8') as f:
-                    try:
-                        s = html.decode(encoding='utf-8')
-                        f.write(s)
-                    except Exception as ex:
-                        print(ex)
-            # temp_file, headers = urllib.request.urlretrieve(new_location)
-            # shutil.move(temp_file, cached_file)
+        return os.path.join(cached_file, fn)
+
+    def get_web_location(self, location):
+        return '/'.join(util.reduce_url_parts(location.replace(os.path.sep, "/").split('/')))
 
+    def cache(self, location):
+        if location is None:
+            return None
+        cached_file = self.get_cached_location(location, create_folders=True)
+        if cached_file == location:
+            return location
+        if not os.path.exists(cached_file):
+            self.fetcher.fetch(self.get_web_location(location), cached_file)
         return cached_file
+
+    def prefetch(self, locations):
+        """ Downloads all Web resources from the list of locations, which are not yet in the cache, concurrently.
+            Returns a dictionary, where key is the location and value is the exception raised for that location. """
+        downloads = {}
+        for location in locations:
+            cached_file = self.get_cached_location(location, create_folders=True)
+            if cached_file is None or cached_file == location or os.path.exists(cached_file):
+                continue
+            downloads[self.get_web_location(location)] = cached_file
+        return self.fetcher.fetch_many(list(downloads.items()))
@@ -1,4 +1,4 @@
-import os, itertools, hashlib, datetime, string, re
+import os, sys, itertools, hashlib, datetime, string, re
 from functools import reduce
 from xbrl.base import const
 from lxml import etree as lxml
@@ -68,6 +68,46 @@ def get_label(lst, lang='en', role='/label'):
     return sorted(li, key=lambda x: len(x) if x else 0)[0] if li else ''
 
 
+def compile_labels(lst):
+    """ Resolves labels for the combinations of language and role, under which they are usually requested: the full
+        language (en-GB) and its primary tag (en), combined with the full role URI and the role ending (/terseLabel).
+        Returns a dictionary, where key is the tuple (lang, role) and value is the interned label text, the same as
+        returned by get_label. Combinations not in the dictionary must be resolved by get_label. """
+    res = lst.get('label', {})
+    variants = set()
+    for key in res:
+        lang, sep, role = key.partition('|')
+        if not sep:
+            continue
+        for lng in (lang, lang.split('-')[0]):
+            for rl in (role, role[role.rfind('/'):]):
+                variants.add((lng, rl))
+    labels = {}
+    items = res.items()
+    for lang, role in variants:
+        # Same resolution as in get_resource_nlr, but without building intermediate lists for each variant
+        exact = res.get(f'{lang}|{role}')
+        li = [lbl.text for lbl in exact] if exact is not None else \
+            [lbl.text for k, v in items if k.startswith(lang) and k.endswith(role) for lbl in v]
+        lbl = min(li, key=lambda x: len(x) if x else 0) if li else get_label(lst, lang, role)
+        labels[(lang, role)] = intern_label(lbl)
+    return labels
+
+
+def get_compiled_label(labels, lst, lang='en', role='/label'):
+    """ Returns the label from a dictionary created by compile_labels. Missing combinations are resolved and added. """
+    key = (lang, role)
+    if key in labels:
+        return labels[key]
+    lbl = intern_label(get_label(lst, lang, role))
+    labels[key] = lbl
+    return lbl
+
+
+def intern_label(lbl):
+    return sys.intern(lbl) if isinstance(lbl, str) else lbl
+
+
 def get_rc_label(lst):
     return '' if lst is None else ','.join(
         ['' if lbl.text is None else lbl.text for lbl in get_resource_nlr(lst, 'label', 'en', const.ROLE_LABEL_RC)])
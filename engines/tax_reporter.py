@@ -92,6 +92,7 @@ class TaxonomyReporter(html_helper.HtmlHelper):
         self.add('</td></tr>')
         self.finalize_table()
 
+        c.load_resources(('label', 'reference'))
         lbls = c.resources.get('label', None)
         if lbls is not None:
             self.add('<tr><td>Labels</br/>')
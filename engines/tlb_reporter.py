@@ -647,7 +647,7 @@ class TableReporter(base_reporter.BaseReporter):
         concept = self.taxonomy.concepts_by_qname.get(constraint.Member, None)
         if concept is None:
             return False  # The concept must be available in taxonomy
-        drs_for_pi = self.taxonomy.idx_pi_drs.get(concept.qname, None)
+        drs_for_pi = self.taxonomy.get_validity_index().get_drs(concept.qname)
         if drs_for_pi is None:
             return False  # the concept must be a primary item and it must be connected to at least one DRS
         drs_for_tbl = [drs for drs in drs_for_pi
@@ -661,25 +661,7 @@ class TableReporter(base_reporter.BaseReporter):
         return True
 
     def validate_drs(self, c, drs):
-        checklist = {asp: co for asp, co in c.constraints.items() if asp != 'concept'}
-        for hc in drs.hypercubes.values():
-            for dim in hc.dimensions.values():
-                constraint = checklist.get(dim.concept.qname, None)
-                if constraint is None:
-                    if dim.members is not None \
-                            and [m for m in dim.members.values() if m.Concept.qname in self.taxonomy.default_members]:
-                        # There is a dimension in DRS, which is not in cell. constraints, but it has a default member
-                        # and can be skipped
-                        continue
-                    else:
-                        # There is a dimension in DRS, which is not in cell constraints and this dimension
-                        # has no default member
-                        return False
-                if constraint.Member is None:
-                    del checklist[dim.concept.qname]  # This is an open dimension and so it matches
-                    continue
-                for mem in dim.members.values():
-                    if mem.Concept.qname == constraint.Member:
-                        del checklist[dim.concept.qname]
-                        break
-        return False if checklist else True
+        """ Checks cell constraints against a DRS. DRS dimensions not constrained by the cell are accepted,
+            if they have a default member. Open dimensions (constraint without member) match any member. """
+        members = {asp: co.Member for asp, co in c.constraints.items() if asp != 'concept'}
+        return self.taxonomy.get_validity_index().match_drs(drs, members)
@@ -0,0 +1,53 @@
+from xbrl.base import const
+
+
+class XdtValidator:
+    """ Checks dimensional validity of the facts of XBRL instances against the dimensional relationship sets of
+        a taxonomy. Facts are grouped by the key (concept, dimension signature of the context), so that each distinct
+        combination is validated only once. Typed dimension values are not validated. """
+    def __init__(self, taxonomy):
+        self.taxonomy = taxonomy
+        self.index = taxonomy.get_validity_index()
+        """ Validation results. Key is the tuple (concept QName, dimension signature), value is True if valid. """
+        self.results = {}
+
+    def get_signature(self, ctx):
+        """ Returns the hashable dimension signature of a context - the tuple (segment, scenario), where each part
+            is a sorted tuple of (dimension QName, member QName) pairs. Member of a typed dimension is None. """
+        return self.get_dimensions(ctx.segment), self.get_dimensions(ctx.scenario)
+
+    @staticmethod
+    def get_dimensions(container):
+        if not container:
+            return ()
+        return tuple(sorted(
+            (dim, e.text.strip() if e.tag == f'{{{const.NS_XBRLDI}}}explicitMember' and e.text else None)
+            for dim, e in container.items()))
+
+    def validate_key(self, key):
+        valid = self.results.get(key)
+        if valid is None:
+            qname, (segment, scenario) = key
+            valid = self.index.is_valid_context(qname, dict(segment), dict(scenario))
+            self.results[key] = valid
+        return valid
+
+    def validate(self, xid):
+        """ Validates all facts of an instance. Returns a dictionary, where key is the fact id and value is
+            True if the fact is dimensionally valid. Facts without context (e.g. tuples) are not reported. """
+        signatures = {}  # Key is the context, value is its dimension signature
+        groups = {}  # Key is the tuple (concept QName, dimension signature), value is the list of fact ids
+        for fct in xid.xbrl.facts.values():
+            ctx = fct.context
+            if ctx is None:
+                continue
+            sig = signatures.get(ctx)
+            if sig is None:
+                sig = self.get_signature(ctx)
+                signatures[ctx] = sig
+            groups.setdefault((fct.qname, sig), []).append(fct.id)
+        return {fid: valid for key, fids in groups.items() for valid in [self.validate_key(key)] for fid in fids}
+
+    def get_invalid_facts(self, xid):
+        """ Returns the list of ids of facts, which are not dimensionally valid. """
+        return [fid for fid, valid in self.validate(xid).items() if not valid]
@@ -1,3 +1,4 @@
+import copy
 from xbrl.base import ebase, const
 
 
@@ -24,7 +25,8 @@ class Context(ebase.XmlElementBase):
             f'{{{const.NS_XBRLDI}}}explicitMember': self.l_member,
             f'{{{const.NS_XBRLDI}}}typedMember': self.l_member
         }
-        super().__init__(e, parsers)
+        # Parsed from a detached copy, so that member elements do not keep the whole instance document alive
+        super().__init__(copy.deepcopy(e), parsers)
 
     def l_context(self, e):
         self.l_children(e)
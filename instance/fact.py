@@ -1,25 +1,164 @@
-from xbrl.base import ebase
+import sys
+import types
+from xbrl.base import ebase, const, util
 
+""" Shared empty collection of nested facts for facts, which are not tuples. """
+NO_NESTED_FACTS = types.MappingProxyType({})
+""" Attributes stored in dedicated fields. All other attributes of a fact element are kept in Fact.attributes. """
+FACT_ATTRIBUTES = ('id', 'contextRef', 'unitRef', 'decimals', 'precision')
 
-class Fact(ebase.XmlElementBase):
-    def __init__(self, default_id, e):
-        self.context_ref = e.attrib.get('contextRef') if e is not None else None
-        self.context = None
-        self.unit_ref = e.attrib.get('unitRef') if e is not None else None
-        self.unit = None
-        self.decimals = e.attrib.get('decimals') if e is not None else None
-        self.precision = e.attrib.get('precision') if e is not None else None
-        self.value = e.text if e is not None else None
-        self.footnotes = []
-        self.nested_facts = {}
-        self.counter = 0
-        parsers = {'default': self.l_nested}
-        super().__init__(e, parsers, assign_origin=True)
+
+class Fact:
+    """ Compact representation of a fact. Strings repeated across facts (QNames, namespaces, context and unit
+        references, decimals) are interned, so that they are shared. The lxml element is kept only if requested. """
+    __slots__ = ('id', 'explicit_id', 'qname', 'namespace', 'context_ref', 'context', 'unit_ref', 'unit', 'decimals',
+                 'precision', 'value', 'lang', 'attributes', 'footnotes', 'nested_facts', 'origin')
+
+    def __init__(self, default_id, e, assign_origin=False):
+        a = e.attrib
+        self.id = a.get('id')
+        self.explicit_id = self.id is not None
         if self.id is None:
             self.id = default_id
+        self.qname = sys.intern(f'{e.prefix}:{util.get_local_name(e.tag)}' if e.prefix else util.get_local_name(e.tag))
+        self.namespace = sys.intern(util.get_namespace(e.tag))
+        self.context_ref = self.intern(a.get('contextRef'))
+        self.context = None
+        self.unit_ref = self.intern(a.get('unitRef'))
+        self.unit = None
+        self.decimals = self.intern(a.get('decimals'))
+        self.precision = self.intern(a.get('precision'))
+        self.value = e.text
+        self.lang = a.get(f'{{{const.NS_XML}}}lang')
+        """ Other attributes (e.g. xsi:nil) as tuple of (qualified name, value) pairs - None if there are none. """
+        self.attributes = None
+        if len(a) > (self.context_ref is not None) + (self.unit_ref is not None) + (self.decimals is not None) + \
+                (self.precision is not None) + self.explicit_id:
+            self.attributes = tuple(self.get_extra_attributes(e))
+        self.footnotes = ()
+        self.nested_facts = NO_NESTED_FACTS
+        self.origin = e if assign_origin else None
+        if len(e):
+            self.l_nested(e, assign_origin)
+
+    @classmethod
+    def create(cls, default_id, qname, namespace, context_ref=None, unit_ref=None, decimals=None, precision=None,
+               value=None):
+        """ Creates a fact from values, e.g. extracted from an inline XBRL document, without an XML element. """
+        fct = cls.__new__(cls)
+        fct.id = default_id
+        fct.explicit_id = False
+        fct.qname = sys.intern(qname)
+        fct.namespace = sys.intern(namespace)
+        fct.context_ref = cls.intern(context_ref)
+        fct.context = None
+        fct.unit_ref = cls.intern(unit_ref)
+        fct.unit = None
+        fct.decimals = cls.intern(decimals)
+        fct.precision = cls.intern(precision)
+        fct.value = value
+        fct.lang = None
+        fct.attributes = None
+        fct.footnotes = ()
+        fct.nested_facts = NO_NESTED_FACTS
+        fct.origin = None
+        return fct
+
+    def __getstate__(self):
+        """ Facts are pickled (e.g. passed from worker processes) without XML elements, contexts, units and
+            footnotes, which are assigned again when the model is compiled. """
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state['origin'] = state['context'] = state['unit'] = None
+        state['footnotes'] = ()
+        state['nested_facts'] = dict(self.nested_facts) if self.nested_facts else None
+        return state
 
-    def l_nested(self, e):
-        self.counter += 1
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        if self.nested_facts is None:
+            self.nested_facts = NO_NESTED_FACTS
+
+    def copy(self):
+        """ Returns a copy of the fact, e.g. to be added to another model. The XML element is not kept, because
+            references of the copy may be renamed. Nested facts and footnotes are shared with the original. """
+        fct = Fact.__new__(Fact)
+        for name in self.__slots__:
+            setattr(fct, name, getattr(self, name))
+        fct.origin = None
+        return fct
+
+    @staticmethod
+    def intern(s):
+        return None if s is None else sys.intern(s)
+
+    @staticmethod
+    def get_extra_attributes(e):
+        """ Yields (name, value) pairs of attributes without a dedicated field. Namespaced attributes are named with
+            the prefix declared in the document, the xml namespace with the prefix xml. If no prefix is declared for
+            the namespace, the name is kept in Clark notation and resolved when the fact is serialized. """
+        for name, value in e.attrib.items():
+            if name in FACT_ATTRIBUTES:
+                continue
+            uri = util.get_namespace(name)
+            if uri == const.NS_XML:
+                name = f'xml:{util.get_local_name(name)}'
+            elif uri:
+                plist = [p for p, u in e.nsmap.items() if u == uri and p is not None]
+                if plist:
+                    name = f'{plist[0]}:{util.get_local_name(name)}'
+            yield name, value
+
+    @property
+    def name(self):
+        return self.qname.split(':')[-1]
+
+    @property
+    def prefix(self):
+        return self.qname.split(':')[0] if ':' in self.qname else None
+
+    def l_nested(self, e, assign_origin):
+        self.nested_facts = {}
+        counter = 0
         for e2 in e.iterchildren():
-            fct = Fact(f'{self.id}.{self.counter}', e2)
+            if not isinstance(e2.tag, str):
+                continue
+            counter += 1
+            fct = Fact(f'{self.id}.{counter}', e2, assign_origin)
             self.nested_facts[fct.id] = fct
+
+    def add_footnote(self, fn):
+        if not self.footnotes:
+            self.footnotes = []
+        self.footnotes.append(fn)
+
+    def serialize(self, namespaces_reverse=None):
+        """ Serializes the fact. namespaces_reverse (key is the namespace URI, value is the prefix) is used to name
+            attributes, for which no prefix was declared in the source document. Attributes in a namespace without
+            any prefix are skipped. """
+        if self.origin is not None:
+            return ebase.serialize_element(self.origin)
+        output = [f'<{self.qname}']
+        if self.explicit_id:
+            output.append(f' id="{self.id}"')
+        for name, value in (('contextRef', self.context_ref), ('unitRef', self.unit_ref),
+                            ('decimals', self.decimals), ('precision', self.precision)):
+            if value is not None:
+                output.append(f' {name}="{value}"')
+        if self.attributes:
+            for name, value in self.attributes:
+                if name.startswith('{'):
+                    prefix = namespaces_reverse.get(util.get_namespace(name)) if namespaces_reverse else None
+                    if prefix is None:
+                        continue  # Not serializable without a declared prefix
+                    name = f'{prefix}:{util.get_local_name(name)}'
+                output.append(f' {name}="{util.escape_xml(value)}"')
+        if self.nested_facts:
+            output.append('>')
+            output.extend(f.serialize(namespaces_reverse) for f in self.nested_facts.values())
+            output.append(f'</{self.qname}>')
+        elif not self.value:
+            output.append('/>')
+        else:
+            output.append(f'>{util.escape_xml(self.value)}</{self.qname}>')
+        return ''.join(output)
@@ -0,0 +1,99 @@
+import array
+import decimal
+try:
+    import numpy
+except ImportError:
+    numpy = None  # Columns are returned as array.array objects
+
+
+class FactTable:
+    """ Columnar representation of the facts of an instance document. Aspect columns are dictionary encoded:
+        each column holds integer codes, which are indexes into the corresponding dictionary, where code 0 always
+        stands for None (e.g. dimension not present in the context). Columns are NumPy arrays if NumPy is installed,
+        otherwise array.array objects, which expose the same contiguous buffer. Nested facts of tuples are not included. """
+    def __init__(self, facts, numeric_type='float'):
+        """ Number of rows """
+        self.size = 0
+        """ Fact id for each row """
+        self.ids = []
+        """ Key is the column name, value is the column. Aspect columns are named concept, entity, period_start,
+            period_end, unit and decimals, dimension columns are named by dimension QName. Column value holds numeric
+            values - float64 (NaN for non-numeric facts) or Decimal (None for non-numeric facts). """
+        self.columns = {}
+        """ Key is the column name, value is the list of distinct values. Codes in the column are indexes to the list. """
+        self.dictionaries = {}
+        """ Encoding dictionaries. Key is the column name, value is a dictionary mapping value to code. """
+        self.codes = {}
+        self.numeric_type = numeric_type
+        self.build(facts)
+
+    def encode(self, column, value):
+        codes = self.codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = len(codes)
+            codes[value] = code
+            self.dictionaries[column].append(value)
+        return code
+
+    def add_column(self, name):
+        self.codes[name] = {None: 0}
+        self.dictionaries[name] = [None]
+        self.columns[name] = array.array('i')
+
+    def build(self, facts):
+        facts = [f for f in facts if f.context is not None]
+        # Contexts are encoded once - facts only refer to the encoded tuple
+        encoded_contexts = {}
+        contexts = list(dict.fromkeys(f.context for f in facts))
+        dimensions = list(dict.fromkeys(d for ctx in contexts for d in ctx.descriptors))
+        for name in ['concept', 'entity', 'period_start', 'period_end', 'unit', 'decimals'] + sorted(dimensions):
+            self.add_column(name)
+        for ctx in contexts:
+            encoded_contexts[ctx] = (
+                self.encode('entity', f'{ctx.entity_scheme}:{ctx.entity_identifier}'),
+                self.encode('period_start', ctx.period_start),
+                self.encode('period_end', ctx.period_instant if ctx.period_instant else ctx.period_end),
+                [(self.columns[d], self.encode(d, ctx.get_member(d))) for d in ctx.descriptors])
+        c_concept, c_entity, c_start, c_end, c_unit, c_decimals = [
+            self.columns[name] for name in ['concept', 'entity', 'period_start', 'period_end', 'unit', 'decimals']]
+        c_dimensions = [self.columns[d] for d in sorted(dimensions)]
+        values = array.array('d') if self.numeric_type == 'float' else []
+        for fct in facts:
+            entity, start, end, members = encoded_contexts[fct.context]
+            c_concept.append(self.encode('concept', fct.qname))
+            c_entity.append(entity)
+            c_start.append(start)
+            c_end.append(end)
+            c_unit.append(self.encode('unit', None if fct.unit is None else fct.unit.get_aspect_value()))
+            c_decimals.append(self.encode('decimals', fct.decimals))
+            for column in c_dimensions:
+                column.append(0)
+            for column, code in members:
+                column[-1] = code
+            values.append(self.get_numeric_value(fct))
+            self.ids.append(fct.id)
+        self.size = len(facts)
+        self.columns['value'] = values
+        if numpy is not None:
+            for name, column in self.columns.items():
+                if isinstance(column, array.array):
+                    dtype = numpy.int32 if column.typecode == 'i' else numpy.float64
+                    self.columns[name] = numpy.frombuffer(column, dtype=dtype)
+
+    def get_numeric_value(self, fct):
+        if fct.unit_ref is None or fct.value is None:
+            return float('nan') if self.numeric_type == 'float' else None
+        try:
+            return float(fct.value) if self.numeric_type == 'float' else decimal.Decimal(fct.value.strip())
+        except (ValueError, decimal.InvalidOperation):
+            return float('nan') if self.numeric_type == 'float' else None
+
+    def decode(self, column):
+        """ Returns the list of values of an encoded column. """
+        dictionary = self.dictionaries[column]
+        return [dictionary[code] for code in self.columns[column]]
+
+    def get_code(self, column, value):
+        """ Returns the code of a value in an encoded column or None if the value does not occur. """
+        return self.codes[column].get(value)
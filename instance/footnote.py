@@ -1,7 +1,8 @@
+import copy
 from xbrl.taxonomy import resource
 
 
 class Footnote(resource.Resource):
     def __init__(self, e):
-        super(Footnote, self).__init__(e, assign_origin=True)
+        super(Footnote, self).__init__(copy.deepcopy(e), assign_origin=True)
         self.facts = []
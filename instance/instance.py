@@ -2,12 +2,13 @@ import os
 from xbrl.instance import m_xbrl
 from xbrl.base import fbase, const
 from xbrl.ixbrl import m_ixbrl
-from lxml import etree as lxml
 
 
 class Instance(fbase.XmlFileBase):
-    def __init__(self, location=None, container_pool=None, root=None):
+    def __init__(self, location=None, container_pool=None, root=None, keep_origin=False):
         self.pool = container_pool
+        """ If set, facts keep references to their XML elements. """
+        self.keep_origin = keep_origin
         self.taxonomy = None
         self.xbrl = None
         self.ixbrl = None
@@ -46,11 +47,7 @@ Filing Indicators: {len(self.xbrl.filing_indicators)}"""
         # self.l_namespaces_rec(e, target_tags=[
         #     f'{{{const.NS_IXBRL}}}nonNumeric',
         #     f'{{{const.NS_IXBRL}}}nonFraction'])
-        self.ixbrl.strip()
-        s = ''.join(self.ixbrl.output)
-        parser = lxml.XMLParser(huge_tree=True)
-        root = lxml.XML(s, parser)
-        self.l_xbrl(root)
+        self.xbrl = self.ixbrl.to_model()
 
     def to_xml(self):
         return self.ixbrl.to_xml() if self.ixbrl else self.xbrl.to_xml() if self.xbrl else None
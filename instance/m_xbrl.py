@@ -1,4 +1,6 @@
-from xbrl.instance import fact, footnote, unit, context
+import copy
+import array
+from xbrl.instance import fact, footnote, unit, context, fact_table
 from xbrl.taxonomy import arc, locator
 from xbrl.base import ebase, const, util
 
@@ -6,8 +8,6 @@ from xbrl.base import ebase, const, util
 class XbrlModel(ebase.XmlElementBase):
     def __init__(self, e, container_instance):
         self.instance = container_instance
-        if e is None:
-            return
         self.linkbase_refs = set([])
         self.schema_refs = set([])
         self.contexts = {}
@@ -22,10 +22,20 @@ class XbrlModel(ebase.XmlElementBase):
         self.filing_indicators = []
         self.taxonomy = None
         self.output = None
+        """ If set, facts keep their XML elements, otherwise the parsed document is released after loading. """
+        self.keep_origin = getattr(container_instance, 'keep_origin', False)
         """ List of available aspects. """
         self.aspects = set({})
         """ Key is the aspect name, value is the list of belonging values """
         self.aspect_values = {}
+        """ Facts in document order. The position of a fact in the list is its integer id used in posting lists. """
+        self.fact_rows = []
+        """ Inverted index of facts. Key is the tuple (aspect name, aspect value), value is the posting list -
+            the ascending array of integer ids of facts having that value. None, if the index is to be rebuilt. """
+        self.postings = None
+        """ Key is the dimension QName, value is the posting list of facts, which have that dimension with any
+            member. Built together with postings. """
+        self.dimension_postings = None
         self.parsers = {
             'default': self.l_fact,
             f'{{{const.NS_XBRLI}}}xbrl': self.l_xbrl,
@@ -40,10 +50,19 @@ class XbrlModel(ebase.XmlElementBase):
             f'{{{const.NS_FIND}}}fIndicators': self.l_filing_indicators,
             f'{{{const.NS_FIND}}}filingIndicator': self.l_filing_indicator
         }
+        """ Signature indices kept by merge_many - None until first used. Key is the context signature (see
+            Context.get_signature), value is the context. """
+        self.contexts_by_signature = None
+        """ Key is the unit aspect value, value is the unit. """
+        self.units_by_signature = None
+        """ Keys (concept, context signature, unit aspect value, value) of all facts with context. """
+        self.fact_keys = None
         # Helper dictionaries for merge process
         self.map_ctx = {}  # Map contextRef of merged fact to new contextRef
         self.map_uni = {}  # Map unitRef of merged fact to new unitRef
 
+        if e is None:
+            return  # Populated by the caller, e.g. from an inline XBRL document
         super().__init__(e, self.parsers)
         self.compile()
 
@@ -80,7 +99,9 @@ class XbrlModel(ebase.XmlElementBase):
         self.units[uni.id] = uni
 
     def l_fact(self, e):
-        fct = fact.Fact(len(self.facts) + 1, e)
+        self.add_fact(fact.Fact(len(self.facts) + 1, e, self.keep_origin))
+
+    def add_fact(self, fct):
         asp = 'conceptAspect'
         self.aspects.add(asp)
         self.aspect_values.setdefault(asp, set({})).add(fct.qname)
@@ -99,13 +120,13 @@ class XbrlModel(ebase.XmlElementBase):
         self.arcs.append(a)
 
     def l_footnote_link(self, e):
-        self.footnote_links.append(e)
+        self.footnote_links.append(copy.deepcopy(e))  # Detached, so that the document can be released
 
     def l_filing_indicators(self, e):
         self.l_children(e)
 
     def l_filing_indicator(self, e):
-        self.filing_indicators.append(e)
+        self.filing_indicators.append(copy.deepcopy(e))
 
     def compile(self):
         # Set references to contexts
@@ -127,10 +148,84 @@ class XbrlModel(ebase.XmlElementBase):
                 fn = self.footnotes.get(a.xl_to)
                 if fct is None or fn is None:
                     continue
-                fct.footnotes.append(fn)
+                fct.add_footnote(fn)
                 fn.facts.append(fct)
         self.locators = None
         self.arcs = None
+        self.build_index()
+
+    def build_index(self):
+        """ Builds posting lists for concept, entity identifier, period, unit and dimension aspects.
+            Aspect names and values are the same as in aspect_values. """
+        self.fact_rows = list(self.facts.values())
+        self.postings = postings = {}
+        self.dimension_postings = dimension_postings = {}
+        ctx_keys = {}  # Key is the context, value is the list of its (aspect, value) keys
+        uni_keys = {}  # Key is the unit, value is its (aspect, value) key
+        for row, fct in enumerate(self.fact_rows):
+            keys = [('conceptAspect', fct.qname)]
+            ctx = fct.context
+            if ctx is not None:
+                ck = ctx_keys.get(ctx)
+                if ck is None:
+                    ck = [('entityIdentifierAspect', ctx.entity_identifier), ('periodAspect', ctx.get_period_string())]
+                    ck.extend((d, ctx.get_member(d)) for d in ctx.descriptors)
+                    ctx_keys[ctx] = ck
+                keys.extend(ck)
+                for d in ctx.descriptors:
+                    lst = dimension_postings.get(d)
+                    if lst is None:
+                        lst = array.array('i')
+                        dimension_postings[d] = lst
+                    lst.append(row)
+            uni = fct.unit
+            if uni is not None:
+                uk = uni_keys.get(uni)
+                if uk is None:
+                    uk = ('unitAspect', uni.get_aspect_value())
+                    uni_keys[uni] = uk
+                keys.append(uk)
+            for key in keys:
+                lst = postings.get(key)
+                if lst is None:
+                    lst = array.array('i')
+                    postings[key] = lst
+                lst.append(row)
+
+    def get_posting(self, aspect, value):
+        """ Returns the set of integer ids of facts having given aspect value. Value can be a list, tuple or set of
+            alternative values. If the aspect is a dimension and the value is None, facts without the dimension are
+            returned. """
+        if self.postings is None:
+            self.build_index()
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return set().union(*[self.get_posting(aspect, v) for v in value])
+        if value is None:
+            return set(range(len(self.fact_rows))).difference(self.dimension_postings.get(aspect, ()))
+        return set(self.postings.get((aspect, value), ()))
+
+    def query(self, concept=None, entity=None, period=None, unit=None, dims=None):
+        """ Returns the list of facts (in document order) matching all given aspect values. Each value can be a single
+            value or a collection of alternative values. Period is given as in Context.get_period_string - instant or
+            start/end. dims is a dictionary, where key is the dimension QName and value is the member (None for facts
+            without that dimension). """
+        if self.postings is None:
+            self.build_index()
+        criteria = [(asp, val) for asp, val in (('conceptAspect', concept), ('entityIdentifierAspect', entity),
+                                                ('periodAspect', period), ('unitAspect', unit)) if val is not None]
+        if dims:
+            criteria.extend(dims.items())
+        if not criteria:
+            return list(self.fact_rows)
+        # Intersect starting with the shortest posting list
+        postings = sorted((self.get_posting(asp, val) for asp, val in criteria), key=len)
+        rows = postings[0].intersection(*postings[1:])
+        return [self.fact_rows[row] for row in sorted(rows)]
+
+    def to_columns(self, numeric_type='float'):
+        """ Returns facts as a table of dictionary encoded columns (see fact_table.FactTable).
+            numeric_type is either float (values as float64) or decimal (values as Decimal). """
+        return fact_table.FactTable(self.facts.values(), numeric_type)
 
     def index_hashed(self):
         self.contexts_hashed = {}
@@ -144,12 +239,93 @@ class XbrlModel(ebase.XmlElementBase):
             self.units_hashed[sig_hash] = uni
 
     def merge(self, xid):
+        self.postings = None
+        self.contexts_by_signature = None  # Signature indices of merge_many are rebuilt on next use
         self.index_hashed()
         self.merge_contexts(xid)
         self.merge_units(xid)
         self.merge_facts(xid)
         # TODO: Merge footnotes and references
 
+    def index_signatures(self):
+        self.contexts_by_signature = {}
+        for ctx in self.contexts.values():
+            self.contexts_by_signature.setdefault(ctx.get_signature(), ctx)
+        self.units_by_signature = {}
+        for uni in self.units.values():
+            self.units_by_signature.setdefault(uni.get_aspect_value(), uni)
+        self.fact_keys = set()
+        for fct in self.facts.values():
+            if fct.context is not None:
+                self.fact_keys.add(self.get_fact_key(fct, fct.context.get_signature()))
+
+    @staticmethod
+    def get_fact_key(fct, ctx_signature, uni=None):
+        uni = fct.unit if uni is None else uni
+        return fct.qname, ctx_signature, None if uni is None else uni.get_aspect_value(), fct.value
+
+    def merge_many(self, models):
+        """ Merges many instance documents in one pass. models is an iterable (e.g. a generator) of XbrlModel or
+            Instance objects. Contexts and units are matched by signature, so that each distinct context and unit
+            is kept once, and facts with the same concept, context, unit and value are kept once. Signature indices
+            are kept between calls, so that the cost is proportional to the size of merged documents. Merged models
+            are not changed - contexts, units and facts are copied before they are renamed or attached. """
+        if self.contexts_by_signature is None:
+            self.index_signatures()
+        self.postings = None
+        for model in models:
+            model = getattr(model, 'xbrl', model)  # Instance or XbrlModel
+            map_ctx = {cid: self.add_merged_context(ctx) for cid, ctx in model.contexts.items()}
+            map_uni = {uid: self.add_merged_unit(uni) for uid, uni in model.units.items()}
+            for fct in model.facts.values():
+                self.add_merged_fact(fct, map_ctx, map_uni)
+
+    def add_merged_context(self, ctx):
+        """ Returns the tuple (context, signature) of the context in this document, which corresponds to ctx. """
+        sig = ctx.get_signature()
+        existing_ctx = self.contexts_by_signature.get(sig)
+        if existing_ctx is not None:
+            return existing_ctx, sig
+        ctx = copy.copy(ctx)
+        if ctx.id in self.contexts:
+            ctx.id = util.get_hash(sig)
+        self.contexts[ctx.id] = ctx
+        self.contexts_by_signature[sig] = ctx
+        return ctx, sig
+
+    def add_merged_unit(self, uni):
+        sig = uni.get_aspect_value()
+        existing_uni = self.units_by_signature.get(sig)
+        if existing_uni is not None:
+            return existing_uni
+        uni = copy.copy(uni)
+        if uni.id in self.units:
+            uni.id = util.get_hash(sig)
+            uni.origin = copy.deepcopy(uni.origin)  # Units are serialized from their element
+            uni.origin.set('id', uni.id)
+        self.units[uni.id] = uni
+        self.units_by_signature[sig] = uni
+        return uni
+
+    def add_merged_fact(self, fct, map_ctx, map_uni):
+        ctx, ctx_signature = map_ctx.get(fct.context_ref, (None, None))
+        uni = map_uni.get(fct.unit_ref)
+        if ctx is not None:
+            key = self.get_fact_key(fct, ctx_signature, uni)
+            if key in self.fact_keys:
+                return  # Duplicate fact
+            self.fact_keys.add(key)
+        fct = fct.copy()
+        fct.context, fct.context_ref = ctx, fct.context_ref if ctx is None else ctx.id
+        fct.unit, fct.unit_ref = uni, fct.unit_ref if uni is None else uni.id
+        if fct.id in self.facts:
+            counter = len(self.facts) + 1
+            while f'f{counter}' in self.facts:
+                counter += 1
+            fct.id = f'f{counter}'
+            fct.explicit_id = True
+        self.facts[fct.id] = fct
+
     def merge_facts(self, xid):
         # Merge facts
         for fct in xid.facts.values():
@@ -162,6 +338,7 @@ class XbrlModel(ebase.XmlElementBase):
             if fct.id in self.facts:
                 new_fct_id = f'f{(len(self.facts)+1)}'
                 fct.id = new_fct_id
+                fct.explicit_id = True
             self.facts[fct.id] = fct
 
     def merge_units(self, xid):
@@ -211,8 +388,9 @@ class XbrlModel(ebase.XmlElementBase):
                 self.contexts[ctx.id] = ctx
                 self.contexts_hashed[sig_hash] = ctx
 
-    def serialize(self):
-        self.output = []
+    def serialize(self, output=None):
+        """ Appends parts of the document to output - a new list if not given. """
+        self.output = [] if output is None else output
         self.output.append(const.XML_START)
         self.output.append(f'<xbrl xmlns="{const.NS_XBRLI}" ')
         for ns in self.instance.namespaces.items():
@@ -256,9 +434,10 @@ class XbrlModel(ebase.XmlElementBase):
             self.output.append(u.serialize())
 
     def serialize_facts(self):
+        namespaces_reverse = getattr(self.instance, 'namespaces_reverse', None)
         for it in self.facts.items():
             f = it[1]
-            self.output.append(f.serialize())
+            self.output.append(f.serialize(namespaces_reverse))
 
     def serialize_refs(self):
         for r in self.schema_refs:
@@ -268,10 +447,8 @@ class XbrlModel(ebase.XmlElementBase):
 
     def serialize_dimensional_container(self, dc, name):
         self.output.append(f'<{name}>')
-        for it in dc.items():
-            e = it[1]
-            eb = ebase.XmlElementBase(e, assign_origin=True)
-            self.output.append(eb.serialize())
+        for e in dc.values():
+            ebase.append_element(e, self.output)
         self.output.append(f'</{name}>')
 
     def serialize_contexts(self):
@@ -292,9 +469,48 @@ class XbrlModel(ebase.XmlElementBase):
             self.output.append(f'</period>')
             if c.scenario:
                 self.serialize_dimensional_container(c.scenario, 'scenario')
-            self.output.append(f'</entity>')
             self.output.append(f'</context>')
 
     def to_xml(self):
         self.serialize()
         return ''.join(self.output)
+
+    def save(self, location, buffer_size=65536):
+        """ Writes the instance document to a file with given location or to a binary stream. Output is written
+            through a buffer of bounded size, so that no string of the whole document is built. """
+        if isinstance(location, str):
+            with open(location, 'wb') as f:
+                self.save(f, buffer_size)
+            return
+        output = StreamOutput(location, buffer_size)
+        try:
+            self.serialize(output)
+            output.flush()
+        finally:
+            self.output = None
+
+
+class StreamOutput:
+    """ Collects serialized parts like a list, but writes them UTF-8 encoded to a binary stream, whenever
+        the buffered text exceeds the buffer size. """
+    def __init__(self, stream, buffer_size=65536):
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.parts = []
+        self.size = 0
+
+    def append(self, s):
+        self.parts.append(s)
+        self.size += len(s)
+        if self.size >= self.buffer_size:
+            self.flush()
+
+    def extend(self, lst):
+        for s in lst:
+            self.append(s)
+
+    def flush(self):
+        if self.parts:
+            self.stream.write(''.join(self.parts).encode('utf-8'))
+        self.parts = []
+        self.size = 0
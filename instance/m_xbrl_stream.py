@@ -0,0 +1,86 @@
+from lxml import etree as lxml
+from xbrl.instance import context, unit
+from xbrl.base import const, data_wrappers
+
+
+class XbrlStream:
+    """ Streaming reader of XBRL instance documents. Contexts, units and facts are emitted one by one as compact
+        records (see data_wrappers.StreamContext, StreamUnit and StreamFact) and processed elements are released
+        immediately, so that the memory consumption does not depend on the size of the document.
+        Footnote links are not processed. """
+    def __init__(self, location, container_pool=None):
+        self.location = location
+        self.pool = container_pool
+        self.schema_refs = []
+        self.linkbase_refs = []
+        """ List of tuples (filing indicator code, filed flag) """
+        self.filing_indicators = []
+        self.namespaces = {}
+        """ Number of facts emitted so far, including nested facts. """
+        self.fact_count = 0
+        self.skipped = {
+            f'{{{const.NS_LINK}}}roleRef', f'{{{const.NS_LINK}}}arcroleRef', f'{{{const.NS_LINK}}}footnoteLink'}
+
+    def __iter__(self):
+        return self.read()
+
+    def read(self):
+        """ Generator of StreamContext, StreamUnit and StreamFact records in document order. """
+        location = self.location
+        if self.pool is not None:
+            location = self.pool.cache(location)
+        root = None
+        for event, e in lxml.iterparse(location, events=('start', 'end'), huge_tree=True, remove_comments=True):
+            if root is None:
+                root = e
+                self.namespaces = {k: v for k, v in e.nsmap.items() if k is not None}
+                continue
+            if event == 'start' or e.getparent() is not root:
+                continue  # Only children of the root element are processed - with their descendants
+            yield from self.l_element(e)
+            # Release the element and all preceding siblings, which are already processed
+            e.clear()
+            while e.getprevious() is not None:
+                del root[0]
+
+    def l_element(self, e):
+        tag = e.tag
+        if not isinstance(tag, str) or tag in self.skipped:
+            return
+        if tag == f'{{{const.NS_XBRLI}}}context':
+            ctx = context.Context(e)
+            yield data_wrappers.StreamContext(
+                ctx.id, ctx.entity_scheme, ctx.entity_identifier, ctx.period_instant, ctx.period_start,
+                ctx.period_end, tuple((d, ctx.get_member(d)) for d in ctx.descriptors))
+        elif tag == f'{{{const.NS_XBRLI}}}unit':
+            uni = unit.Unit(e)
+            yield data_wrappers.StreamUnit(uni.id, uni.get_aspect_value())
+        elif tag == f'{{{const.NS_LINK}}}schemaRef':
+            self.schema_refs.append(e.attrib.get(f'{{{const.NS_XLINK}}}href'))
+        elif tag == f'{{{const.NS_LINK}}}linkbaseRef':
+            self.linkbase_refs.append(e.attrib.get(f'{{{const.NS_XLINK}}}href'))
+        elif tag == f'{{{const.NS_FIND}}}fIndicators':
+            for fi in e.iterchildren(f'{{{const.NS_FIND}}}filingIndicator'):
+                self.filing_indicators.append((fi.text, fi.attrib.get(f'{{{const.NS_FIND}}}filed', 'true')))
+        else:
+            yield from self.l_fact(e, None)
+
+    def l_fact(self, e, parent_id):
+        self.fact_count += 1
+        fact_id = e.attrib.get('id')
+        if fact_id is None:
+            fact_id = f'f{self.fact_count}'  # Unique, because nested facts are counted as well
+        local_name = e.tag[e.tag.find('}') + 1:]
+        a = e.attrib
+        yield data_wrappers.StreamFact(
+            fact_id, f'{e.prefix}:{local_name}' if e.prefix else local_name, a.get('contextRef'), a.get('unitRef'),
+            a.get('decimals'), a.get('precision'), None if len(e) else e.text, parent_id)
+        for e2 in e.iterchildren():
+            if isinstance(e2.tag, str):
+                yield from self.l_fact(e2, fact_id)
+
+    def read_facts(self):
+        """ Generator of facts only. """
+        for record in self.read():
+            if isinstance(record, data_wrappers.StreamFact):
+                yield record
@@ -1,3 +1,4 @@
+import copy
 from xbrl.base import ebase, const
 
 
@@ -14,7 +15,8 @@ class Unit(ebase.XmlElementBase):
             f'{{{const.NS_XBRLI}}}unitNumerator': self.l_numerator,
             f'{{{const.NS_XBRLI}}}unitDenominator': self.l_denominator
         }
-        super().__init__(e, parsers, assign_origin=True)
+        # Parsed from a detached copy, so that the origin does not keep the whole instance document alive
+        super().__init__(copy.deepcopy(e), parsers, assign_origin=True)
 
     def l_unit(self, e):
         self.l_children(e)
@@ -0,0 +1,154 @@
+import os
+import zipfile
+import concurrent.futures
+from lxml import etree as lxml
+from xbrl.base import fbase
+from xbrl.ixbrl import m_ixbrl
+from xbrl.instance import instance, m_xbrl
+
+""" File extensions of inline XBRL documents. """
+IXBRL_EXTENSIONS = ('.htm', '.html', '.xhtml')
+
+
+class IxdsPart:
+    """ Content of one document of an inline XBRL document set. Holds only plain values, so that it can be passed
+        from a worker process. Contexts and units are kept as serialized XML. """
+    def __init__(self, name):
+        self.name = name
+        self.namespaces = {}
+        self.schema_refs = []
+        self.linkbase_refs = []
+        """ Serialized xbrli:context and xbrli:unit elements """
+        self.resources = []
+        """ Facts in document order. Ids are assigned again when parts are merged. """
+        self.facts = []
+        """ Facts continued in other elements as tuples of (index in facts, continuedAt, is escaped) """
+        self.open_continuations = []
+        """ Key is the continuation id, value is the tuple (text, escaped content, continuedAt) """
+        self.continuations = {}
+
+
+def extract_part(name, source):
+    """ Parses one document of an inline XBRL document set and extracts its content. Source is a file location or
+        the content of the document. Runs in a worker process - all iXBRL indices are built there. """
+    parser = lxml.XMLParser(huge_tree=True)
+    root = lxml.parse(source, parser).getroot() if isinstance(source, str) else lxml.XML(source, parser)
+    container = fbase.XmlFileBase(root=root)
+    ixm = m_ixbrl.IxbrlModel(root, container)
+    ixm.follow_continuations = False
+    model = m_xbrl.XbrlModel(None, container)
+    ixm.extract_refs(model)
+    ixm.extract_non_fraction(model)
+    ixm.extract_non_numeric(model)
+
+    part = IxdsPart(name)
+    part.namespaces = container.namespaces
+    part.schema_refs = sorted(model.schema_refs)
+    part.linkbase_refs = sorted(model.linkbase_refs)
+    part.resources = [lxml.tostring(e, encoding='unicode', with_tail=False) for e in ixm.get_resources()]
+    part.facts = list(model.facts.values())
+    positions = {fct: i for i, fct in enumerate(part.facts)}
+    part.open_continuations = [(positions[fct], continued_at, is_escaped)
+                               for fct, continued_at, is_escaped in ixm.open_continuations]
+    for eb in ixm.get_by_name('continuation'):
+        e = eb.origin
+        cid = e.attrib.get('id')
+        if cid is None or cid in part.continuations:
+            continue
+        continued_at = e.attrib.get('continuedAt')
+        part.continuations[cid] = (
+            ixm.normalize_line_breaks(ixm.get_content(e, False)),
+            ixm.normalize_line_breaks(ixm.get_content(e, True)),
+            continued_at.strip() if continued_at else None)
+    return part
+
+
+class IxdsLoader:
+    """ Loads an inline XBRL document set (IXDS) - several inline documents forming one target XBRL document.
+        Documents are parsed in parallel by a pool of worker processes and their content is merged into a single
+        XBRL model. Continuations are resolved across documents. On platforms starting worker processes with
+        spawn (Windows, macOS), the calling script must be guarded with if __name__ == '__main__'. """
+    def __init__(self, container_pool, workers=None):
+        self.pool = container_pool
+        self.workers = workers if workers else os.cpu_count()
+
+    def load(self, location):
+        """ Loads the document set from a folder, a ZIP archive, a list of document locations or a single document
+            and returns the instance. """
+        names, sources = self.get_sources(location)
+        if len(sources) > 1 and self.workers > 1:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=min(self.workers, len(sources))) as executor:
+                futures = [executor.submit(extract_part, name, source) for name, source in zip(names, sources)]
+                parts = [self.get_part(name, future.result) for name, future in zip(names, futures)]
+        else:
+            parts = [self.get_part(name, extract_part, name, source) for name, source in zip(names, sources)]
+        return self.merge([p for p in parts if p is not None], location)
+
+    @staticmethod
+    def get_part(name, method, *args):
+        try:
+            return method(*args)
+        except Exception as ex:
+            print('Cannot load inline XBRL document', name, ex)
+            return None
+
+    @staticmethod
+    def get_sources(location):
+        """ Returns the list of document names and the list of sources (locations or contents) of the set. """
+        if isinstance(location, (list, tuple)):
+            return list(location), list(location)
+        if os.path.isdir(location):
+            names = sorted(os.path.join(location, f) for f in os.listdir(location)
+                           if f.lower().endswith(IXBRL_EXTENSIONS))
+            return names, names
+        if location.lower().endswith(IXBRL_EXTENSIONS):
+            return [location], [location]  # Set of a single document
+        with zipfile.ZipFile(location) as archive:
+            names = sorted(f for f in archive.namelist() if f.lower().endswith(IXBRL_EXTENSIONS))
+            return names, [archive.read(f) for f in names]
+
+    def merge(self, parts, location):
+        xid = instance.Instance(container_pool=self.pool)
+        if isinstance(location, str):
+            xid.location = location
+            xid.base = location if os.path.isdir(location) else os.path.split(location)[0]
+        for part in parts:
+            for prefix, uri in part.namespaces.items():
+                if prefix not in xid.namespaces:
+                    xid.namespaces[prefix] = uri
+                    xid.namespaces_reverse.setdefault(uri, prefix)
+        model = m_xbrl.XbrlModel(None, xid)
+        continuations = {}
+        for part in parts:
+            model.schema_refs.update(part.schema_refs)
+            model.linkbase_refs.update(part.linkbase_refs)
+            for r in part.resources:
+                model.load(lxml.XML(r))
+            for cid, continuation in part.continuations.items():
+                continuations.setdefault(cid, continuation)
+        for part in parts:
+            for index, continued_at, is_escaped in part.open_continuations:
+                content = self.get_continued_content(continuations, continued_at, is_escaped)
+                if content:
+                    fct = part.facts[index]
+                    fct.value = f'{fct.value or ""}{content}'
+            for fct in part.facts:
+                fct.id = len(model.facts) + 1
+                model.add_fact(fct)
+        model.compile()
+        xid.xbrl = model
+        return xid
+
+    @staticmethod
+    def get_continued_content(continuations, continued_at, is_escaped):
+        """ Follows a continuation chain across documents. The chain stops at a missing or repeated id. """
+        result = []
+        visited = set()
+        while continued_at and continued_at not in visited:
+            visited.add(continued_at)
+            continuation = continuations.get(continued_at)
+            if continuation is None:
+                break
+            result.append(continuation[1] if is_escaped else continuation[0])
+            continued_at = continuation[2]
+        return ''.join(result)
@@ -1,250 +1,110 @@
 import re
 import datetime
+import functools
 from xbrl.base import util as util
 
+""" Maximum number of memoised (value, format) pairs. Filings repeat the same few values (dates, zeros, dashes). """
+TRANSFORM_CACHE_SIZE = 8192
+MONTHS = '(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr' \
+         '|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC|JANUARY|FEBRUARY|MARCH' \
+         '|APRIL|MAY|JUNE|JULY|AUGUST|SEPTEMBER|OCTOBER|NOVEMBER|DECEMBER)'
+""" Precompiled patterns of transformations """
+P_NUMDOTDECIMAL = re.compile('[0-9]{1,3}((,| | )?[0-9]{3})*(\\.[0-9]+)?')
+P_NUMCOMMA = re.compile('\\d+(,\\d+)?')
+P_NUMCOMMADOT = re.compile('\\d{1,3}(,\\d{3,3})*(\\.\\d+)?')
+P_DATEMONTHDAYYEAREN = re.compile(f'{MONTHS}[^0-9]+[0-9]{{1,2}}[^0-9]+([0-9]{{1,2}}|[0-9]{{4}}) ')
+P_DATEMONTHDAYYEAREN_MONTH = re.compile(f'{MONTHS} ')
+P_NON_DIGITS = re.compile('[^0-9]+')
+P_DATEDOTUS = re.compile('\\d{1,2}\\.\\d{1,2}\\.(\\d|\\d{2,2}|\\d{4,4})')
+P_DATELONGUK = re.compile(
+    '(\\d|\\d{2,2}) (January|February|March|April|May|June|July|August|September|October|November|December) '
+    '(\\d{2,2}|\\d{4,4})')
+P_DATELONGUS = re.compile(
+    '(January|February|March|April|May|June|July|August|September|October|November|December) (\\d|\\d{2,2}), '
+    '(\\d{2,2}|\\d{4,4})')
+P_DATESHORTUK = re.compile('(\\d|\\d{2,2}) (Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) (\\d{2,2}|\\d{4,4})')
+P_DATESHORTUS = re.compile('(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) (\\d|\\d{2,2}), (\\d{4,4}|\\d{2,2})')
+P_DATESLASH = re.compile('\\d{1,2}/\\d{1,2}/(\\d|\\d{2,2}|\\d{4,4})')
+
 
 class Formatter:
+    """ Applies inline XBRL transformations. Transformations are registered in CONVERTORS by method name, which is
+        shared by all formatters, as well as the lookup tables below. Subclasses may override both the methods and
+        the tables. Each formatter memoises its own results. """
+    sec_states = {
+        'alabama': 'AL', 'alaska': 'AK', 'arizona': 'AZ', 'arkansas': 'AR', 'california': 'CA',
+        'colorado': 'CO', 'connecticut': 'CT', 'delaware': 'DE', 'florida': 'FL', 'georgia': 'GA',
+        'hawaii': 'HI', 'idaho': 'ID', 'illinois': 'IL', 'indiana': 'IN', 'iowa': 'IA',
+        'kansas': 'KS', 'kentucky': 'KY', 'louisiana': 'LA', 'maine': 'ME', 'maryland': 'MD',
+        'massachusetts': 'MA', 'michigan': '', 'MI': '', 'minnesota': 'MN', 'mississippi': 'MS',
+        'missouri': 'MO', 'montana': 'MT', 'nebraska': 'NE', 'nevada': 'NV', 'new hampshire': 'NH',
+        'new jersey': 'NJ', 'new mexico': 'NM', 'new york': 'NY', 'north carolina': 'NC', 'north dakota': 'ND',
+        'ohio': 'OH', 'oklahoma': 'OK', 'oregon': 'OR', 'pennsylvania': 'PA', 'rhode island': 'RI',
+        'south carolina': 'SC', 'south dakota': 'SD', 'tennessee': 'TN', 'texas': 'TX', 'utah': 'UT',
+        'vermont': 'VT', 'virginia': 'VA', 'washington': 'WA', 'west virginia': 'WV', 'wisconsin': 'WI',
+        'wyoming': 'WY'
+    }
+    en_months_short = {
+        'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+        'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12}
+    en_months_long = {
+        'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
+        'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12}
+    zerodash_chars = ['-', '-', '-', '֊', '־', '‐', '‑', '‒', '–', '—', '―', '﹘', '﹣', '－']
+    dct_numbers = {
+        'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7,
+        'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14,
+        'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19, 'twenty': 20,
+        'thirty': 30, 'forty': 40, 'fifty': 50, 'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90}
+    dct_quantifiers = {
+        'hundred': 100, 'thousand': 1000, 'million': 10 ** 6, 'billion': 10 ** 9, 'trillion': 10 ** 12,
+        'quadrillion': 10 ** 15, 'quintillion': 10 ** 18}
+
+    exch_names = util.create_key_index({
+        'The New York Stock Exchange': 'NYSE',
+        'York Stock Exchange LLC': 'NYSE',
+        'NASDAQ Global Select Market': 'NASDAQ',
+        'The Nasdaq Stock Market LLC': 'NASDAQ',
+        'BOX Exchange LLC': 'BOX',
+        'Nasdaq BX, Inc.': 'BX',
+        'Cboe C2 Exchange, Inc.': 'C2',
+        'Cboe Exchange, Inc.': 'CBOE',
+        'Chicago Stock Exchange, Inc.': 'CHX',
+        'Cboe BYX Exchange, Inc.': 'CboeBYX',
+        'Cboe BZX Exchange, Inc.': 'CboeBZX',
+        'Cboe EDGA Exchange, Inc.': 'CboeEDGA',
+        'Cboe EDGX Exchange, Inc.': 'CboeEDGX',
+        'Nasdaq GEMX, LLC': 'GEMX',
+        'Investors Exchange LLC': 'IEX',
+        'Nasdaq ISE, LLC': 'ISE',
+        'Miami International Securities Exchange': 'MIAX',
+        'Nasdaq MRX, LLC': 'MRX',
+        'NYSE American LLC': 'NYSEAMER',
+        'NYSE Arca, Inc.': 'NYSEArca',
+        'NYSE National, Inc.': 'NYSENAT',
+        'MIAX PEARL, LLC': 'PEARL',
+        'Nasdaq PHLX LLC': 'Phlx'
+    })
+
     def __init__(self):
-        self.convertors = {
-            # TR1
-            'datedoteu': self.c_datedoteu,
-            'datedotus': self.c_datedotus,
-            'datelonguk': self.c_datelonguk,
-            'datelongus': self.c_datelongus,
-            'dateshortuk': self.c_dateshortuk,
-            'dateshortus': self.c_dateshortus,
-            'dateslasheu': self.c_dateslasheu,
-            'dateslashus': self.c_dateslashus,
-            'datelongdaymonthuk': self.c_datelongdaymonthuk,
-            'datelongmonthdayus': self.c_datelongmonthdayus,
-            'dateshortdaymonthuk': self.c_dateshortdaymonthuk,
-            'dateshortmonthdayus': self.c_dateshortmonthdayus,
-            'dateslashdaymontheu': self.c_dateslashdaymontheu,
-            'dateslashmonthdayus': self.c_dateslashmonthdayus,
-            'datelongyearmonth': self.c_datelongyearmonth,
-            'dateshortyearmonth': self.c_dateshortyearmonth,
-            'datelongmonthyear': self.c_datelongmonthyear,
-            'dateshortmonthyear': self.c_dateshortmonthyear,
-            'numcomma': self.c_numcomma,
-            'numcommadot': self.c_numcommadot,
-            'numdash': self.c_numdash,
-            'numdotcomma': self.c_numdotcomma,
-            'numspacecomma': self.c_numspacecomma,
-            'numspacedot': self.c_numspacedot,
-            # TR2
-
-            'datemonthdayyearen': self.c_datemonthdayyearen,
-            'numdotdecimal': self.c_numdotdecimal,
-            'nocontent': self.c_nocontent,
-            'zerodash': self.c_zerodash,
-
-            # TR3
-            'booleanfalse': self.c_booleanfalse,
-            'booleantrue': self.c_booleantrue,
-            # 'calindaymonthyear': self.c_calindaymonthyear,
-            # 'datedaymonth': self.c_datedaymonth,
-            # 'datedaymonthdk': self.c_datedaymonthdk,
-            # 'datedaymonthen': self.c_datedaymonthen,
-            # 'datedaymonthyear': self.c_datedaymonthyear,
-            # 'datedaymonthyeardk': self.c_datedaymonthyeardk,
-            # 'datedaymonthyearen': self.c_datedaymonthyearen,
-            # 'datedaymonthyearin': self.c_datedaymonthyearin,
-            # 'dateerayearmonthdayjp': self.c_dateerayearmonthdayjp,
-            # 'dateerayearmonthjp': self.c_dateerayearmonthjp,
-            # 'datemonthday': self.c_datemonthday,
-            # 'datemonthdayen': self.c_datemonthdayen,
-            # 'datemonthdayyear': self.c_datemonthdayyearen,
-            # 'datemonthyear': self.c_datemonthyear,
-            # 'datemonthyeardk': self.c_datemonthyeardk,
-            # 'datemonthyearen': self.c_datemonthyearen,
-            # 'datemonthyearin': self.c_datemonthyearin,
-            # 'dateyearmonthday': self.c_dateyearmonthday,
-            # 'dateyearmonthdaycjk': self.c_dateyearmonthdaycjk,
-            # 'dateyearmonthcjk': self.c_dateyearmonthcjk,
-            # 'dateyearmonthen': self.c_dateyearmonthen,
-            'numdotdecimalin': self.c_numdotdecimal,
-            'numunitdecimal': self.c_numunitdecimal,
-            'numunitdecimalin': self.c_numunitdecimal,
-
-            # SEC
-            'duryear': self.c_sec_duryear,
-            'durmonth': self.c_sec_durmonth,
-            'durweek': self.c_sec_durweek,
-            'durday': self.c_sec_durday,
-            'durhour': self.c_sec_durhour,
-            'durwordsen': self.c_sec_durwordsen,
-            'numwordsen': self.c_sec_numwordsen,
-            'datequarterend': self.c_sec_datequarterend,
-            'boolballotbox': self.c_sec_boolballotbox,
-            'exchnameen': self.c_sec_exchnameen,
-            'stateprovnameen': self.c_sec_stateprovnameen,
-            'countrynameen': self.c_sec_countrynameen,
-            'edgarprovcountryen': self.c_sec_edgarprovcountryen,
-            'entityfilercategoryen': self.c_sec_entityfilercategoryen,
-
-            # TR5
-            'date-day-month': self.tr5_repeat,
-            'date-day-month-year': self.tr5_repeat,
-            'date-day-monthname-bg': self.tr5_repeat,
-            'date-day-monthname-cs': self.tr5_repeat,
-            'date-day-monthname-cy': self.tr5_repeat,
-            'date-day-monthname-da': self.tr5_repeat,
-            'date-day-monthname-de': self.tr5_repeat,
-            'date-day-monthname-el': self.tr5_repeat,
-            'date-day-monthname-en': self.tr5_repeat,
-            'date-day-monthname-es': self.tr5_repeat,
-            'date-day-monthname-et': self.tr5_repeat,
-            'date-day-monthname-fi': self.tr5_repeat,
-            'date-day-monthname-fr': self.tr5_repeat,
-            'date-day-monthname-hr': self.tr5_repeat,
-            'date-day-monthname-it': self.tr5_repeat,
-            'date-day-monthname-lv': self.tr5_repeat,
-            'date-day-monthname-nl': self.tr5_repeat,
-            'date-day-monthname-no': self.tr5_repeat,
-            'date-day-monthname-pl': self.tr5_repeat,
-            'date-day-monthname-pt': self.tr5_repeat,
-            'date-day-monthname-ro': self.tr5_repeat,
-            'date-day-monthname-sk': self.tr5_repeat,
-            'date-day-monthname-sl': self.tr5_repeat,
-            'date-day-monthname-sv': self.tr5_repeat,
-            'date-day-monthname-year-bg': self.tr5_repeat,
-            'date-day-monthname-year-cs': self.tr5_repeat,
-            'date-day-monthname-year-cy': self.tr5_repeat,
-            'date-day-monthname-year-da': self.tr5_repeat,
-            'date-day-monthname-year-de': self.tr5_repeat,
-            'date-day-monthname-year-el': self.tr5_repeat,
-            'date-day-monthname-year-en': self.tr5_repeat,
-            'date-day-monthname-year-es': self.tr5_repeat,
-            'date-day-monthname-year-et': self.tr5_repeat,
-            'date-day-monthname-year-fi': self.tr5_repeat,
-            'date-day-monthname-year-fr': self.tr5_repeat,
-            'date-day-monthname-year-hi': self.tr5_repeat,
-            'date-day-monthname-year-hr': self.tr5_repeat,
-            'date-day-monthname-year-it': self.tr5_repeat,
-            'date-day-monthname-year-nl': self.tr5_repeat,
-            'date-day-monthname-year-no': self.tr5_repeat,
-            'date-day-monthname-year-pl': self.tr5_repeat,
-            'date-day-monthname-year-pt': self.tr5_repeat,
-            'date-day-monthname-year-ro': self.tr5_repeat,
-            'date-day-monthname-year-sk': self.tr5_repeat,
-            'date-day-monthname-year-sl': self.tr5_repeat,
-            'date-day-monthname-year-sv': self.tr5_repeat,
-            'date-day-monthroman': self.tr5_repeat,
-            'date-day-monthroman-year': self.tr5_repeat,
-            'date-ind-day-monthname-year-hi': self.tr5_repeat,
-            'date-jpn-era-year-month': self.tr5_repeat,
-            'date-jpn-era-year-month-day': self.tr5_repeat,
-            'date-month-day': self.tr5_repeat,
-            'date-month-day-year': self.tr5_repeat,
-            'date-month-year': self.tr5_repeat,
-            'date-monthname-day-en': self.tr5_repeat,
-            'date-monthname-day-hu': self.tr5_repeat,
-            'date-monthname-day-lt': self.tr5_repeat,
-            'date-monthname-day-year-en': self.tr5_repeat,
-            'date-monthname-year-bg': self.tr5_repeat,
-            'date-monthname-year-cs': self.tr5_repeat,
-            'date-monthname-year-cy': self.tr5_repeat,
-            'date-monthname-year-da': self.tr5_repeat,
-            'date-monthname-year-de': self.tr5_repeat,
-            'date-monthname-year-el': self.tr5_repeat,
-            'date-monthname-year-en': self.tr5_repeat,
-            'date-monthname-year-es': self.tr5_repeat,
-            'date-monthname-year-et': self.tr5_repeat,
-            'date-monthname-year-fi': self.tr5_repeat,
-            'date-monthname-year-fr': self.tr5_repeat,
-            'date-monthname-year-hi': self.tr5_repeat,
-            'date-monthname-year-hr': self.tr5_repeat,
-            'date-monthname-year-it': self.tr5_repeat,
-            'date-monthname-year-nl': self.tr5_repeat,
-            'date-monthname-year-no': self.tr5_repeat,
-            'date-monthname-year-pl': self.tr5_repeat,
-            'date-monthname-year-pt': self.tr5_repeat,
-            'date-monthname-year-ro': self.tr5_repeat,
-            'date-monthname-year-sk': self.tr5_repeat,
-            'date-monthname-year-sl': self.tr5_repeat,
-            'date-monthname-year-sv': self.tr5_repeat,
-            'date-monthroman-year': self.tr5_repeat,
-            'date-year-day-monthname-lv': self.tr5_repeat,
-            'date-year-month': self.tr5_repeat,
-            'date-year-month-day': self.tr5_repeat,
-            'date-year-monthname-day-hu': self.tr5_repeat,
-            'date-year-monthname-day-lt': self.tr5_repeat,
-            'date-year-monthname-en': self.tr5_repeat,
-            'date-year-monthname-hu': self.tr5_repeat,
-            'date-year-monthname-lt': self.tr5_repeat,
-            'date-year-monthname-lv': self.tr5_repeat,
-            'fixed-empty': self.tr5_fixedempty,
-            'fixed-false': self.tr5_fixedfalse,
-            'fixed-true': self.tr5_fixedtrue,
-            'fixed-zero': self.tr5_fixedzero,
-            'numcommadecimal': self.tr5_numcommadecimal,
-            'num-comma-decimal': self.tr5_numcommadecimal,
-            'num-dot-decimal': self.tr5_numdotdecimal,
-            'num-unit-decimal': self.tr5_repeat,
-            'num-comma-decimal-apos': self.tr5_numdotdecimal,
-            'num-dot-decimal-apos': self.tr5_numcommadecimal,
-            'num-unit-decimal-apos': self.tr5_repeat
-
-        }
-        self.sec_states = {
-            'alabama': 'AL', 'alaska': 'AK', 'arizona': 'AZ', 'arkansas': 'AR', 'california': 'CA',
-            'colorado': 'CO', 'connecticut': 'CT', 'delaware': 'DE', 'florida': 'FL', 'georgia': 'GA',
-            'hawaii': 'HI', 'idaho': 'ID', 'illinois': 'IL', 'indiana': 'IN', 'iowa': 'IA',
-            'kansas': 'KS', 'kentucky': 'KY', 'louisiana': 'LA', 'maine': 'ME', 'maryland': 'MD',
-            'massachusetts': 'MA', 'michigan': '', 'MI': '', 'minnesota': 'MN', 'mississippi': 'MS',
-            'missouri': 'MO', 'montana': 'MT', 'nebraska': 'NE', 'nevada': 'NV', 'new hampshire': 'NH',
-            'new jersey': 'NJ', 'new mexico': 'NM', 'new york': 'NY', 'north carolina': 'NC', 'north dakota': 'ND',
-            'ohio': 'OH', 'oklahoma': 'OK', 'oregon': 'OR', 'pennsylvania': 'PA', 'rhode island': 'RI',
-            'south carolina': 'SC', 'south dakota': 'SD', 'tennessee': 'TN', 'texas': 'TX', 'utah': 'UT',
-            'vermont': 'VT', 'virginia': 'VA', 'washington': 'WA', 'west virginia': 'WV', 'wisconsin': 'WI',
-            'wyoming': 'WY'
-        }
-        self.en_months_short = {
-            'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-            'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12}
-        self.en_months_long = {
-            'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
-            'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12}
-        self.zerodash_chars = ['-', '-', '-', '֊', '־', '‐', '‑', '‒', '–', '—', '―', '﹘', '﹣', '－']
-        self.dct_numbers = {
-            'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7,
-            'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14,
-            'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19, 'twenty': 20,
-            'thirty': 30, 'forty': 40, 'fifty': 50, 'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90}
-        self.dct_quantifiers = {
-            'hundred': 100, 'thousand': 1000, 'million': 10 ** 6, 'billion': 10 ** 9, 'trillion': 10 ** 12,
-            'quadrillion': 10 ** 15, 'quintillion': 10 ** 18}
-
-        self.exch_names = util.create_key_index({
-            'The New York Stock Exchange': 'NYSE',
-            'York Stock Exchange LLC': 'NYSE',
-            'NASDAQ Global Select Market': 'NASDAQ',
-            'The Nasdaq Stock Market LLC': 'NASDAQ',
-            'BOX Exchange LLC': 'BOX',
-            'Nasdaq BX, Inc.': 'BX',
-            'Cboe C2 Exchange, Inc.': 'C2',
-            'Cboe Exchange, Inc.': 'CBOE',
-            'Chicago Stock Exchange, Inc.': 'CHX',
-            'Cboe BYX Exchange, Inc.': 'CboeBYX',
-            'Cboe BZX Exchange, Inc.': 'CboeBZX',
-            'Cboe EDGA Exchange, Inc.': 'CboeEDGA',
-            'Cboe EDGX Exchange, Inc.': 'CboeEDGX',
-            'Nasdaq GEMX, LLC': 'GEMX',
-            'Investors Exchange LLC': 'IEX',
-            'Nasdaq ISE, LLC': 'ISE',
-            'Miami International Securities Exchange': 'MIAX',
-            'Nasdaq MRX, LLC': 'MRX',
-            'NYSE American LLC': 'NYSEAMER',
-            'NYSE Arca, Inc.': 'NYSEArca',
-            'NYSE National, Inc.': 'NYSENAT',
-            'MIAX PEARL, LLC': 'PEARL',
-            'Nasdaq PHLX LLC': 'Phlx'
-        })
+        """ Same as apply_format_uncached, but results of repeated (value, format) pairs are taken from the cache """
+        self.cached_format = functools.lru_cache(maxsize=TRANSFORM_CACHE_SIZE)(self.apply_format_uncached)
 
     def apply_format(self, v, f):
-        method = self.convertors.get(f)
-        if not method and ':' in f:
-            method = self.convertors.get(f.split(':')[1])
+        """ Transforms a value with given format. Results are memoised per formatter. """
+        return self.cached_format(v, f)
+
+    def apply_format_many(self, values, f):
+        """ Transforms a list of values with the same format. Returns the list of transformed values. """
+        memo = {}
+        for v in values:
+            if v not in memo:
+                memo[v] = self.cached_format(v, f)
+        return [memo[v] for v in values]
+
+    def apply_format_uncached(self, v, f):
+        name = get_convertor(f)
+        method = getattr(self, name, None) if name else None
         if method:
             t = method(v)
             return t[0] if t else v  # First member of the tuple
@@ -286,20 +146,16 @@ class Formatter:
         if not v:
             return v
         v = v.strip()
-        p = '[0-9]{1,3}((,| | )?[0-9]{3})*(\\.[0-9]+)?'
-        if not re.fullmatch(p, v):
-            return None, f'Value {v} does not match pattern {p}'
+        if not P_NUMDOTDECIMAL.fullmatch(v):
+            return None, f'Value {v} does not match pattern {P_NUMDOTDECIMAL.pattern}'
         pos_comma = v.find(',')
         pos_dot = v.find('.')
-        commas = re.findall(v, '\\,')
         if pos_comma != -1 and pos_dot != -1 and pos_comma > pos_dot:
             return None, f'Invalid format for {v}'
         integerPart = v.replace(' ', ',').replace(' ', ',').replace('-', '').split('.')[0]
         split = integerPart.split(',')
         if len([p for p in split if p and len(p) % 3 != 0 and p != split[0]]):
             return None, f'Invalid format for {v} - incorrect position of thousands separator.'
-        if len(commas) > 1:
-            return None, f'Invalid format for {v} - too many commas.'
         if v.startswith('.'):
             return None, f'Invalid format for {v}. Should not start with a separator.'
         v = v.replace(',', '').replace(' ', '').replace(" ", '')
@@ -336,9 +192,8 @@ class Formatter:
         return is_float and f >= 0
 
     def c_numcomma(self, v):
-        p = '\\d+(,\\d+)?'
-        if not re.fullmatch(p, v):
-            return None, f'Invalid value against pattern {p}'
+        if not P_NUMCOMMA.fullmatch(v):
+            return None, f'Invalid value against pattern {P_NUMCOMMA.pattern}'
         # Convert a thousands separator to a canonical value.
         d = str(v).strip().replace(',', '.')
         if not self.is_nonnegative_decimal(d):
@@ -350,9 +205,8 @@ class Formatter:
             No spaces (unless leading or trailing), signs, or exponentials accepted.
             Must have at least one digit before the decimal point, if any. If there is a decimal,
             then it must be followed by at least one digit. """
-        p = '\\d{1,3}(,\\d{3,3})*(\\.\\d+)?'
-        if not re.fullmatch(p, v):
-            return None, f'Invalid value against pattern {p}'
+        if not P_NUMCOMMADOT.fullmatch(v):
+            return None, f'Invalid value against pattern {P_NUMCOMMADOT.pattern}'
 
         # Convert a thousands separator to a canonical value.
         d = str(v).strip().replace(',', '')
@@ -365,7 +219,6 @@ class Formatter:
             No spaces (unless leading or trailing), signs, or exponentials accepted.
             Must have at least one digit before the decimal point, if any.
             If there is a decimal, then it must be followed by at least one digit. """
-        p = '\\d{1,3}(.\\d{3,3})*(,\\d+)?'
         d = str(v).strip().replace('.', '').replace(',', '.')
         if not self.is_nonnegative_decimal(d):
             return None, f'Invalid nonNegativeDecimal {v}'
@@ -376,7 +229,6 @@ class Formatter:
             No spaces (unless leading or trailing), signs, or exponentials accepted.
             Must have at least one digit before the decimal point, if any. If there is a decimal,
             then it must be followed by at least one digit. """
-        p = '\\d{1,3}( \\d{3,3})*(,\\d+)?'
         d = str(v).strip().replace(' ', '').replace(',', '.')
         if not self.is_nonnegative_decimal(d):
             return None, f'Invalid nonNegativeDecimal {v}'
@@ -387,7 +239,6 @@ class Formatter:
             No spaces (unless leading or trailing), signs, or exponentials accepted.
             Must have at least one digit before the decimal point, if any.
             If there is a decimal, then it must be followed by at least one digit. """
-        p = '\\d{1,3}( \\d{3,3})*(\\.\\d+)?'
         d = str(v).strip().replace(' ', '')
         if not self.is_nonnegative_decimal(d):
             return None, f'Invalid nonNegativeDecimal {v}'
@@ -542,8 +393,8 @@ class Formatter:
         1: day position,
         2: month position
         3: year position """
-        if pattern and not re.fullmatch(pattern, value):
-            return None, f'Value {value} does not match pattern {pattern}'
+        if pattern and not pattern.fullmatch(value):
+            return None, f'Value {value} does not match pattern {pattern.pattern}'
         if to_ignore:
             value = util.normalize(value.replace(to_ignore, ' '))
         split = value.split(delimiter)
@@ -565,22 +416,14 @@ class Formatter:
         return f'{y}-{m}-{d}', None
 
     def c_datemonthdayyearen(self, v):
-        p = '(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr' \
-            '|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC|JANUARY|FEBRUARY|MARCH' \
-            '|APRIL|MAY|JUNE|JULY|AUGUST|SEPTEMBER|OCTOBER|NOVEMBER|DECEMBER)[^0-9]+[0-9]{1,2}[^0-9]+([0-9]{1,' \
-            '2}|[0-9]{4}) '
-        if not re.fullmatch(p, v):
-            return None, f'Value {v} doesn not match pattern {p}'
-        sp = '(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr' \
-             '|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec|JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC|JANUARY|FEBRUARY|MARCH' \
-             '|APRIL|MAY|JUNE|JULY|AUGUST|SEPTEMBER|OCTOBER|NOVEMBER|DECEMBER) '
-        split = re.split(v, sp)
+        if not P_DATEMONTHDAYYEAREN.fullmatch(v):
+            return None, f'Value {v} doesn not match pattern {P_DATEMONTHDAYYEAREN.pattern}'
+        split = P_DATEMONTHDAYYEAREN_MONTH.split(v)
         if not split:
             return None, f'Invalid date {v}'
-        month_str = [p for p in split if p][0].upper()
+        month_str = [p for p in split if p][0].lower()
         part2 = [p for p in split if p][-1]
-        sp2 = '[^0-9]+'
-        split2 = re.split(part2, sp2)
+        split2 = P_NON_DIGITS.split(part2)
         day_str = [p for p in split2 if p][0]
         year_str = [p for p in split2 if p][-1]
         day = int(day_str)
@@ -597,11 +440,11 @@ class Formatter:
             year_str = f'20{year_str}'
         elif len(year_str) == 1:
             year_str = f'200{year_str}'
-        year = int(year_str)
-        dt = datetime.datetime(year, month, day)
-        if not dt:
-            return None, f'Invalid date'
-        return dt.strftime('%Y-%m-%d')
+        try:
+            dt = datetime.datetime(int(year_str), month, day)
+        except ValueError:
+            return None, f'Incorrect date {v}'
+        return dt.strftime('%Y-%m-%d'), None
 
     def c_datedoteu(self, v):
         """ Date in format DD.MM.YY(YY). Will also accept single digits for D, M, Y.
@@ -611,44 +454,37 @@ class Formatter:
     def c_datedotus(self, v):
         """ Date in format MM.DD.YY(YY). Will also accept single digits for D, M, Y.
             Does not check for valid day or month. e.g. accepts 02.30.2008 40.40.2008 """
-        p = '\\d{1,2}\\.\\d{1,2}\\.(\\d|\\d{2,2}|\\d{4,4})'
-        return self.format_date(v, p, None, '.', (1, 0, 2), None)
+        return self.format_date(v, P_DATEDOTUS, None, '.', (1, 0, 2), None)
 
     def c_datelonguk(self, v):
         """ Date in format DD Month YY(YY). Will also accept single digits for D.
             Does not check for valid day or month. e.g. accepts "30 February 2008" and "40 March 2008" """
-        p = '(\\d|\\d{2,2}) (January|February|March|April|May|June|July|August|September|October|November|December) (\\d{2,2}|\\d{4,4})'
-        return self.format_date(v, p, None, ' ', (0, 1, 2), self.en_months_long)
+        return self.format_date(v, P_DATELONGUK, None, ' ', (0, 1, 2), self.en_months_long)
 
     def c_datelongus(self, v):
         """ Date in format Month DD, YY(YY). Will also accept single digits for D.
             Does not check for valid day or month. e.g. accepts 'February 30, 2008' and 'March 40, 2008'. """
-        p = '(January|February|March|April|May|June|July|August|September|October|November|December) (\\d|\\d{2,2}), (\\d{2,2}|\\d{4,4})'
-        return self.format_date(v, p, ',', ' ', (1, 0, 2), self.en_months_long)
+        return self.format_date(v, P_DATELONGUS, ',', ' ', (1, 0, 2), self.en_months_long)
 
     def c_dateshortuk(self, v):
         """ Date in format DD Mon YY(YY). Will also accept single digits for D.
             Does not check for valid day or month. e.g. accepts "30 Feb 2008" and "40 Mar 2008" """
-        p = '(\\d|\\d{2,2}) (Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) (\\d{2,2}|\\d{4,4})'
-        return self.format_date(v, p, None, ' ', (0, 1, 2), self.en_months_short)
+        return self.format_date(v, P_DATESHORTUK, None, ' ', (0, 1, 2), self.en_months_short)
 
     def c_dateshortus(self, v):
         """ Date in format Mon DD, YY(YY). Will also accept single digits for D.
             Does not check for valid day or month. e.g. accepts "Feb 30, 2008" and "Mar 40, 2008". """
-        p = '(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) (\\d|\\d{2,2}), (\\d{4,4}|\\d{2,2})'
-        return self.format_date(v, p, ',', ' ', (1, 0, 2), self.en_months_short)
+        return self.format_date(v, P_DATESHORTUS, ',', ' ', (1, 0, 2), self.en_months_short)
 
     def c_dateslasheu(self, v):
         """ Date in format DD/MM/YY(YY). Will also accept single digits for D, M, Y.
             Does not check for valid day or month. e.g. accepts 30/02/2008 40/40/2008 """
-        p = '\\d{1,2}/\\d{1,2}/(\\d|\\d{2,2}|\\d{4,4})'
-        return self.format_date(v, p, None, '/', (0, 1, 2), None)
+        return self.format_date(v, P_DATESLASH, None, '/', (0, 1, 2), None)
 
     def c_dateslashus(self, v):
         """ Date in format MM/DD/YY(YY). Will also accept single digits for D, M, Y.
             Does not check for valid day or month. e.g. accepts 02/30/2008 40/40/2008 """
-        p = '\\d{1,2}/\\d{1,2}/(\\d|\\d{2,2}|\\d{4,4})'
-        return self.format_date(v, p, None, '/', (1, 0, 2), None)
+        return self.format_date(v, P_DATESLASH, None, '/', (1, 0, 2), None)
 
     def c_datelongdaymonthuk(self, v):
         return None, v
@@ -679,3 +515,205 @@ class Formatter:
 
     def c_dateshortmonthyear(self, v):
         return None, v
+
+
+""" Transformations by format name (local name of the format QName). Values are names of Formatter methods taking
+    the value and returning the tuple (transformed value, error message). Methods are looked up on the formatter, so
+    subclasses can override them. """
+CONVERTORS = {
+        # TR1
+        'datedoteu': 'c_datedoteu',
+        'datedotus': 'c_datedotus',
+        'datelonguk': 'c_datelonguk',
+        'datelongus': 'c_datelongus',
+        'dateshortuk': 'c_dateshortuk',
+        'dateshortus': 'c_dateshortus',
+        'dateslasheu': 'c_dateslasheu',
+        'dateslashus': 'c_dateslashus',
+        'datelongdaymonthuk': 'c_datelongdaymonthuk',
+        'datelongmonthdayus': 'c_datelongmonthdayus',
+        'dateshortdaymonthuk': 'c_dateshortdaymonthuk',
+        'dateshortmonthdayus': 'c_dateshortmonthdayus',
+        'dateslashdaymontheu': 'c_dateslashdaymontheu',
+        'dateslashmonthdayus': 'c_dateslashmonthdayus',
+        'datelongyearmonth': 'c_datelongyearmonth',
+        'dateshortyearmonth': 'c_dateshortyearmonth',
+        'datelongmonthyear': 'c_datelongmonthyear',
+        'dateshortmonthyear': 'c_dateshortmonthyear',
+        'numcomma': 'c_numcomma',
+        'numcommadot': 'c_numcommadot',
+        'numdash': 'c_numdash',
+        'numdotcomma': 'c_numdotcomma',
+        'numspacecomma': 'c_numspacecomma',
+        'numspacedot': 'c_numspacedot',
+        # TR2
+
+        'datemonthdayyearen': 'c_datemonthdayyearen',
+        'numdotdecimal': 'c_numdotdecimal',
+        'nocontent': 'c_nocontent',
+        'zerodash': 'c_zerodash',
+
+        # TR3
+        'booleanfalse': 'c_booleanfalse',
+        'booleantrue': 'c_booleantrue',
+        # 'calindaymonthyear': 'c_calindaymonthyear',
+        # 'datedaymonth': 'c_datedaymonth',
+        # 'datedaymonthdk': 'c_datedaymonthdk',
+        # 'datedaymonthen': 'c_datedaymonthen',
+        # 'datedaymonthyear': 'c_datedaymonthyear',
+        # 'datedaymonthyeardk': 'c_datedaymonthyeardk',
+        # 'datedaymonthyearen': 'c_datedaymonthyearen',
+        # 'datedaymonthyearin': 'c_datedaymonthyearin',
+        # 'dateerayearmonthdayjp': 'c_dateerayearmonthdayjp',
+        # 'dateerayearmonthjp': 'c_dateerayearmonthjp',
+        # 'datemonthday': 'c_datemonthday',
+        # 'datemonthdayen': 'c_datemonthdayen',
+        # 'datemonthdayyear': 'c_datemonthdayyearen',
+        # 'datemonthyear': 'c_datemonthyear',
+        # 'datemonthyeardk': 'c_datemonthyeardk',
+        # 'datemonthyearen': 'c_datemonthyearen',
+        # 'datemonthyearin': 'c_datemonthyearin',
+        # 'dateyearmonthday': 'c_dateyearmonthday',
+        # 'dateyearmonthdaycjk': 'c_dateyearmonthdaycjk',
+        # 'dateyearmonthcjk': 'c_dateyearmonthcjk',
+        # 'dateyearmonthen': 'c_dateyearmonthen',
+        'numdotdecimalin': 'c_numdotdecimal',
+        'numunitdecimal': 'c_numunitdecimal',
+        'numunitdecimalin': 'c_numunitdecimal',
+
+        # SEC
+        'duryear': 'c_sec_duryear',
+        'durmonth': 'c_sec_durmonth',
+        'durweek': 'c_sec_durweek',
+        'durday': 'c_sec_durday',
+        'durhour': 'c_sec_durhour',
+        'durwordsen': 'c_sec_durwordsen',
+        'numwordsen': 'c_sec_numwordsen',
+        'datequarterend': 'c_sec_datequarterend',
+        'boolballotbox': 'c_sec_boolballotbox',
+        'exchnameen': 'c_sec_exchnameen',
+        'stateprovnameen': 'c_sec_stateprovnameen',
+        'countrynameen': 'c_sec_countrynameen',
+        'edgarprovcountryen': 'c_sec_edgarprovcountryen',
+        'entityfilercategoryen': 'c_sec_entityfilercategoryen',
+
+        # TR5
+        'date-day-month': 'tr5_repeat',
+        'date-day-month-year': 'tr5_repeat',
+        'date-day-monthname-bg': 'tr5_repeat',
+        'date-day-monthname-cs': 'tr5_repeat',
+        'date-day-monthname-cy': 'tr5_repeat',
+        'date-day-monthname-da': 'tr5_repeat',
+        'date-day-monthname-de': 'tr5_repeat',
+        'date-day-monthname-el': 'tr5_repeat',
+        'date-day-monthname-en': 'tr5_repeat',
+        'date-day-monthname-es': 'tr5_repeat',
+        'date-day-monthname-et': 'tr5_repeat',
+        'date-day-monthname-fi': 'tr5_repeat',
+        'date-day-monthname-fr': 'tr5_repeat',
+        'date-day-monthname-hr': 'tr5_repeat',
+        'date-day-monthname-it': 'tr5_repeat',
+        'date-day-monthname-lv': 'tr5_repeat',
+        'date-day-monthname-nl': 'tr5_repeat',
+        'date-day-monthname-no': 'tr5_repeat',
+        'date-day-monthname-pl': 'tr5_repeat',
+        'date-day-monthname-pt': 'tr5_repeat',
+        'date-day-monthname-ro': 'tr5_repeat',
+        'date-day-monthname-sk': 'tr5_repeat',
+        'date-day-monthname-sl': 'tr5_repeat',
+        'date-day-monthname-sv': 'tr5_repeat',
+        'date-day-monthname-year-bg': 'tr5_repeat',
+        'date-day-monthname-year-cs': 'tr5_repeat',
+        'date-day-monthname-year-cy': 'tr5_repeat',
+        'date-day-monthname-year-da': 'tr5_repeat',
+        'date-day-monthname-year-de': 'tr5_repeat',
+        'date-day-monthname-year-el': 'tr5_repeat',
+        'date-day-monthname-year-en': 'tr5_repeat',
+        'date-day-monthname-year-es': 'tr5_repeat',
+        'date-day-monthname-year-et': 'tr5_repeat',
+        'date-day-monthname-year-fi': 'tr5_repeat',
+        'date-day-monthname-year-fr': 'tr5_repeat',
+        'date-day-monthname-year-hi': 'tr5_repeat',
+        'date-day-monthname-year-hr': 'tr5_repeat',
+        'date-day-monthname-year-it': 'tr5_repeat',
+        'date-day-monthname-year-nl': 'tr5_repeat',
+        'date-day-monthname-year-no': 'tr5_repeat',
+        'date-day-monthname-year-pl': 'tr5_repeat',
+        'date-day-monthname-year-pt': 'tr5_repeat',
+        'date-day-monthname-year-ro': 'tr5_repeat',
+        'date-day-monthname-year-sk': 'tr5_repeat',
+        'date-day-monthname-year-sl': 'tr5_repeat',
+        'date-day-monthname-year-sv': 'tr5_repeat',
+        'date-day-monthroman': 'tr5_repeat',
+        'date-day-monthroman-year': 'tr5_repeat',
+        'date-ind-day-monthname-year-hi': 'tr5_repeat',
+        'date-jpn-era-year-month': 'tr5_repeat',
+        'date-jpn-era-year-month-day': 'tr5_repeat',
+        'date-month-day': 'tr5_repeat',
+        'date-month-day-year': 'tr5_repeat',
+        'date-month-year': 'tr5_repeat',
+        'date-monthname-day-en': 'tr5_repeat',
+        'date-monthname-day-hu': 'tr5_repeat',
+        'date-monthname-day-lt': 'tr5_repeat',
+        'date-monthname-day-year-en': 'tr5_repeat',
+        'date-monthname-year-bg': 'tr5_repeat',
+        'date-monthname-year-cs': 'tr5_repeat',
+        'date-monthname-year-cy': 'tr5_repeat',
+        'date-monthname-year-da': 'tr5_repeat',
+        'date-monthname-year-de': 'tr5_repeat',
+        'date-monthname-year-el': 'tr5_repeat',
+        'date-monthname-year-en': 'tr5_repeat',
+        'date-monthname-year-es': 'tr5_repeat',
+        'date-monthname-year-et': 'tr5_repeat',
+        'date-monthname-year-fi': 'tr5_repeat',
+        'date-monthname-year-fr': 'tr5_repeat',
+        'date-monthname-year-hi': 'tr5_repeat',
+        'date-monthname-year-hr': 'tr5_repeat',
+        'date-monthname-year-it': 'tr5_repeat',
+        'date-monthname-year-nl': 'tr5_repeat',
+        'date-monthname-year-no': 'tr5_repeat',
+        'date-monthname-year-pl': 'tr5_repeat',
+        'date-monthname-year-pt': 'tr5_repeat',
+        'date-monthname-year-ro': 'tr5_repeat',
+        'date-monthname-year-sk': 'tr5_repeat',
+        'date-monthname-year-sl': 'tr5_repeat',
+        'date-monthname-year-sv': 'tr5_repeat',
+        'date-monthroman-year': 'tr5_repeat',
+        'date-year-day-monthname-lv': 'tr5_repeat',
+        'date-year-month': 'tr5_repeat',
+        'date-year-month-day': 'tr5_repeat',
+        'date-year-monthname-day-hu': 'tr5_repeat',
+        'date-year-monthname-day-lt': 'tr5_repeat',
+        'date-year-monthname-en': 'tr5_repeat',
+        'date-year-monthname-hu': 'tr5_repeat',
+        'date-year-monthname-lt': 'tr5_repeat',
+        'date-year-monthname-lv': 'tr5_repeat',
+        'fixed-empty': 'tr5_fixedempty',
+        'fixed-false': 'tr5_fixedfalse',
+        'fixed-true': 'tr5_fixedtrue',
+        'fixed-zero': 'tr5_fixedzero',
+        'numcommadecimal': 'tr5_numcommadecimal',
+        'num-comma-decimal': 'tr5_numcommadecimal',
+        'num-dot-decimal': 'tr5_numdotdecimal',
+        'num-unit-decimal': 'tr5_repeat',
+        'num-comma-decimal-apos': 'tr5_numdotdecimal',
+        'num-dot-decimal-apos': 'tr5_numcommadecimal',
+        'num-unit-decimal-apos': 'tr5_repeat'
+}
+
+
+def get_convertor(f):
+    """ Returns the name of the transformation method for a format given by its QName or local name. """
+    method = CONVERTORS.get(f)
+    if not method and ':' in f:
+        method = CONVERTORS.get(f.split(':')[1])
+    return method
+
+
+""" Formatter used by transform """
+DEFAULT_FORMATTER = Formatter()
+
+
+def transform(v, f):
+    """ Transforms a value with given format using the default formatter. """
+    return DEFAULT_FORMATTER.apply_format(v, f)
@@ -1,37 +1,66 @@
 from xbrl.base import ebase, const, util
 from xbrl.ixbrl import m_format
+from xbrl.instance import m_xbrl, fact
+import copy
 import math
+import urllib.parse
 from lxml import etree as lxml
 
+""" iXBRL elements of both namespaces. """
+IXBRL_TAGS = (f'{{{const.NS_IXBRL}}}*', f'{{{const.NS_IXBRL_2008}}}*')
+EXCLUDE_TAGS = (f'{{{const.NS_IXBRL}}}exclude', f'{{{const.NS_IXBRL_2008}}}exclude')
+XML_BASE = f'{{{const.NS_XML}}}base'
+
 
 class IxbrlModel(ebase.XmlElementBase):
     """ Implements an iXbrl model """
     def __init__(self, e, container_instance):
         self.instance = container_instance
-        self.idx_n = {}  # iXBRL elements by element name
-        self.idx_a = {}  # iXBRL elements by attribute name
-        self.idx_na = {}  # iXBRL elements by element name and attribute name
-        self.idx_av = {}  # iXBRL elements by attribute name and attribute value
-        self.idx_nav = {}  # iXBRL elements by element name, attribute name and attribute value
+        self.root = e
+        """ iXBRL elements by local element name. Each entry is built on first access (see get_by_name). """
+        self.idx_n = {}
+        """ iXBRL elements by element name, attribute name and attribute value. Key is the tuple (element name,
+            attribute name), value is the dictionary of element lists by attribute value, built on first access. """
+        self.idx_nav = {}
         self.idx_tuple_content = set([]) # All elements, which are inside tuple content
         self.output = None
         self.prefixes = {}
-        self.followed = {}  # Followed continuations
+        """ If not set, content of continuations is not appended to facts. Instead, the tuple (fact, continuedAt,
+            is escaped) is recorded in open_continuations, so that chains can be resolved across the documents of
+            an inline XBRL document set. """
+        self.follow_continuations = True
+        self.open_continuations = []
+        """ Inherited attribute values. Key is the tuple (attribute name, resolve parent), value is the dictionary
+            of effective values by element (see build_inherited_map). """
+        self.inherited = {}
         self.allowed_reference_names = [
             f'{{{const.NS_LINK}}}schemaRef',
             f'{{{const.NS_LINK}}}linkbaseRef']
         self.formatter = m_format.Formatter()
         super().__init__(e)
-        self.index(e)
 
-    def index(self, e, level=0):
-        """ Populates indixes """
-        if isinstance(e, lxml._ProcessingInstruction) or isinstance(e, lxml._Comment):
-            return
-        if self.is_i_xbrl(e):
-            self.index_element(e)
-        for e2 in e.iterchildren():
-            self.index(e2, level+1)
+    def get_by_name(self, name):
+        """ Returns the list of iXBRL elements with given local name in document order. Elements are collected with
+            a single non-recursive pass of lxml over both iXBRL namespaces only when first requested. """
+        lst = self.idx_n.get(name)
+        if lst is None:
+            lst = [ebase.XmlElementBase(e, parsers=None, assign_origin=True)
+                   for e in self.root.iter(f'{{{const.NS_IXBRL}}}{name}', f'{{{const.NS_IXBRL_2008}}}{name}')]
+            self.idx_n[name] = lst
+        return lst
+
+    def get_by_attribute(self, name, attribute, value):
+        """ Returns the list of iXBRL elements with given local name and attribute value, e.g. continuations by id. """
+        key = (name, attribute)
+        idx = self.idx_nav.get(key)
+        if idx is None:
+            idx = {}
+            for eb in self.get_by_name(name):
+                v = eb.origin.attrib.get(attribute)
+                if v is not None:
+                    util.u_dct_list(idx, v, eb)
+            self.idx_nav[key] = idx
+        return idx.get(value)
 
     @staticmethod
     def is_i_xbrl(e):
@@ -41,20 +70,6 @@ class IxbrlModel(ebase.XmlElementBase):
             return False
         return e.tag.startswith(f'{{{const.NS_IXBRL}}}') or e.tag.startswith(f'{{{const.NS_IXBRL_2008}}}')
 
-    def index_element(self, e):
-        eb = ebase.XmlElementBase(e, parsers=None, assign_origin=True)
-        key_name = eb.name
-        util.u_dct_list(self.idx_n, key_name, eb)
-        for a in e.attrib.items():
-            key_a = f'{a[0]}'
-            util.u_dct_list(self.idx_a, key_a, eb)
-            key_na = f'{eb.name}|{a[0]}'
-            util.u_dct_list(self.idx_na, key_na, eb)
-            key_av = f'{a[0]}|{a[1]}'
-            util.u_dct_list(self.idx_av, key_av, eb)
-            key_nav = f'{eb.name}|{a[0]}|{a[1]}'
-            util.u_dct_list(self.idx_nav, key_nav, eb)
-
     def strip(self):
         """ Serializes native XBRL """
         self.output = []
@@ -70,13 +85,82 @@ class IxbrlModel(ebase.XmlElementBase):
         self.strip_non_numeric()
         self.output.append('</xbrl>')
 
+    def to_model(self):
+        """ Extracts native XBRL content directly into an XBRL model. Produces the same model as parsing the
+            document serialized by strip, but without building and reparsing the intermediate XML. """
+        model = m_xbrl.XbrlModel(None, self.instance)
+        self.extract_refs(model)
+        self.extract_resources(model)
+        self.extract_non_fraction(model)
+        self.extract_non_numeric(model)
+        model.compile()
+        return model
+
+    def extract_refs(self, model):
+        for r in self.get_by_name('references'):
+            for e2 in r.origin.iterchildren():
+                if e2.tag not in self.allowed_reference_names:
+                    continue
+                href = self.get_inherited_attribute(e2, XML_BASE, e2.attrib.get(f'{{{const.NS_XLINK}}}href', ''), True)
+                if e2.tag == f'{{{const.NS_LINK}}}schemaRef':
+                    model.schema_refs.add(href)
+                else:
+                    model.linkbase_refs.add(href)
+
+    def extract_resources(self, model):
+        for e2 in self.get_resources():
+            model.load(e2)
+
+    def get_resources(self):
+        """ Yields XBRL resource elements (contexts and units) of ix:resources. """
+        for r in self.get_by_name('resources'):
+            for e2 in r.origin.iterchildren():
+                if isinstance(e2, lxml._ProcessingInstruction) or isinstance(e2, lxml._Comment):
+                    continue
+                if util.get_namespace(e2.tag) != const.NS_XBRLI:
+                    continue
+                yield e2
+
+    def create_fact(self, model, e, value, **kwargs):
+        name = e.attrib.get('name')
+        prefix = name.split(':')[0] if ':' in name else ''
+        return fact.Fact.create(
+            len(model.facts) + 1, name, self.instance.namespaces.get(prefix, ''),
+            context_ref=e.attrib.get('contextRef'), value=value if value else None, **kwargs)
+
+    def extract_non_fraction(self, model):
+        for nf in self.get_by_name('nonFraction'):
+            if nf in self.idx_tuple_content or not nf.origin.attrib.get('name'):
+                continue
+            deci = nf.origin.attrib.get('decimals')
+            prec = nf.origin.attrib.get('precision')
+            model.add_fact(self.create_fact(
+                model, nf.origin, self.normalize_numeric_content(nf.origin), unit_ref=nf.origin.attrib.get('unitRef'),
+                decimals=deci if deci else None, precision=prec if prec and not deci else None))
+
+    def extract_non_numeric(self, model):
+        for nn in self.get_by_name('nonNumeric'):
+            if nn in self.idx_tuple_content or not nn.origin.attrib.get('name'):
+                continue
+            content = self.get_full_content(nn.origin)
+            fct = self.create_fact(model, nn.origin, self.normalize_line_breaks(content))
+            model.add_fact(fct)
+            continued_at = nn.origin.attrib.get('continuedAt')
+            if continued_at and not self.follow_continuations:
+                self.open_continuations.append(
+                    (fct, continued_at.strip(), nn.origin.attrib.get('escape') in ('true', '1')))
+
+    @staticmethod
+    def normalize_line_breaks(s):
+        return s.replace('\r\n', '\n').replace('\r', '\n')
+
     def to_xml(self):
         if not self.output:
             self.strip()
         return ''.join(self.output)
 
     def strip_non_numeric(self):
-        non_numerics = self.idx_n.get('nonNumeric')
+        non_numerics = self.get_by_name('nonNumeric')
         if not non_numerics:
             return
         cnt = 0
@@ -88,13 +172,11 @@ class IxbrlModel(ebase.XmlElementBase):
             if not name or nn.origin is None:
                 continue
             cref = nn.origin.attrib.get('contextRef')
-            part1 = f'{(nn.origin.text if nn.origin.text else "")}' if len(nn.origin) else ''
-            rest = self.get_full_content(nn.origin, [])
-            content = util.escape_xml(f'{part1}{rest}')
+            content = util.escape_xml(self.get_full_content(nn.origin))
             self.output.append(f'<{name} contextRef="{cref}">{content}</{name}>')
 
     def strip_non_fraction(self):
-        non_fractions = self.idx_n.get('nonFraction')
+        non_fractions = self.get_by_name('nonFraction')
         if not non_fractions:
             return
         for nf in non_fractions:
@@ -112,7 +194,7 @@ class IxbrlModel(ebase.XmlElementBase):
             self.output.append(f'<{name} contextRef="{cref}" unitRef="{uref}" {rounding}>{text}</{name}>')
 
     def strip_resources(self):
-        resources = self.idx_n.get('resources')
+        resources = self.get_by_name('resources')
         if not resources:
             return
         for r in resources:
@@ -125,7 +207,7 @@ class IxbrlModel(ebase.XmlElementBase):
                 self.output.append(e2b.serialize())
 
     def strip_refs(self):
-        refs = self.idx_n.get('references')
+        refs = self.get_by_name('references')
         if not refs:
             return
         for r in refs:
@@ -137,54 +219,50 @@ class IxbrlModel(ebase.XmlElementBase):
                 continue
             self.serialize_ix_element(e2)
 
-    def get_full_content(self, e, stack):
-        if e is None or str(e.tag).endswith('exclude'):
+    def get_full_content(self, e):
+        """ Returns the content of an iXBRL element followed by the content of its continuations. Escaped content
+            (escape="true") is the serialized XML of the child nodes, otherwise it is the text. Excluded parts
+            (ix:exclude) are left out and nested iXBRL elements are replaced by their content. """
+        if e is None or e.tag in EXCLUDE_TAGS:
             return ''
-        is_escaped = False
-        continued_at = None
-        for a in e.attrib.items():
-            if a[0] == 'escape':
-                is_escaped = a[1] == 'true' or a[1] == '1'
-            elif a[0] == 'continuedAt':
-                continued_at = a[1].strip()
-        # if is_escaped:
-        #     return
-
-        result = []
-        if len(e):
-            for e2 in e.iterchildren():
-                if e.tag == f'{{{const.NS_IXBRL}}}continuation':
-                    """ Even if there is a sub-note from iXBRL namespace, we serialize it as a generic element, 
-                    otherwise we will lose HTML formatting. Then the child elements from iXBRL namespace will be separately 
-                    resulved in the processing, because they are indexed in nonNumeric and nonFraction collections."""
-                    result.append(ebase.XmlElementBase(e2, assign_origin=True).serialize())
-                    continue
-                if self.is_i_xbrl(e2):  # All other elements form iXBRL space
-                    result.append(self.get_full_content(e2, stack))
-                    continue
-                # all other XML tags
-                result.append(ebase.XmlElementBase(e2, assign_origin=True).serialize())
-        else:
-            if e.text:
-                content = util.escape_xml(e.text) if is_escaped else e.text
-                result.append(content)
+        is_escaped = e.attrib.get('escape') in ('true', '1')
+        result = [self.get_content(e, is_escaped)]
+        if not self.follow_continuations:
+            return result[0]
+        for continuation in self.get_continuation_chain(e.attrib.get('continuedAt')):
+            result.append(self.get_content(continuation, is_escaped))
+        return ''.join(result)
 
-            # TODO - Verify this with normative examples
-            # if e.tail and e.tag == f'{{{const.NS_IXBRL}}}nonNumeric':
-            #     result.append(e.tail)
+    @staticmethod
+    def get_content(e, is_escaped):
+        if next(e.iterdescendants(*IXBRL_TAGS), None) is not None:
+            e = copy.deepcopy(e)
+            lxml.strip_elements(e, *EXCLUDE_TAGS, with_tail=False)
+            lxml.strip_tags(e, *IXBRL_TAGS)
+        if not is_escaped:
+            return ''.join(e.itertext())
+        if not len(e):
+            return util.escape_xml(e.text) if e.text else ''
+        # Content between the start and the end tag. Namespaces are declared only in the start tag.
+        s = lxml.tostring(e, encoding='unicode', with_tail=False)
+        return s[s.index('>') + 1:s.rindex('</')]
 
-        continuations = self.idx_nav.get(f'continuation|id|{continued_at}')
-        if continued_at and continuations:
-            for continuation in continuations:
-                if continued_at in self.followed:
-                    continue
-                if continuation in stack:
-                    continue
-                self.followed[continued_at] = continuation
-                stack.append(continuation)
-                result.append(self.get_full_content(continuation.origin, stack))
-                stack.pop()
-        return ''.join(result)
+    def get_continuation_chain(self, continued_at):
+        """ Returns the list of continuation elements, which follow the element with given continuedAt attribute.
+            Continuations are looked up by id in the attribute index (see get_by_attribute). The chain stops at a
+            missing continuation or at a continuation, which is already in the chain. """
+        chain = []
+        visited = set()
+        continued_at = continued_at.strip() if continued_at else None
+        while continued_at and continued_at not in visited:
+            visited.add(continued_at)
+            continuations = self.get_by_attribute('continuation', 'id', continued_at)
+            if not continuations:
+                break
+            continuation = continuations[0].origin
+            chain.append(continuation)
+            continued_at = continuation.attrib.get('continuedAt', '').strip()
+        return chain
 
     def to_canonical_format(self, text, frmt):
         if not frmt:
@@ -192,7 +270,7 @@ class IxbrlModel(ebase.XmlElementBase):
         return self.formatter.apply_format(text, frmt)  # TODO: Maybe return empty value and stop process
 
     def normalize_numeric_content(self, e):
-        value = self.get_full_content(e, [])
+        value = self.get_full_content(e)
         frmt = e.attrib.get('format')
         scle = e.attrib.get('scale')
         sign = e.attrib.get('sign')
@@ -211,19 +289,42 @@ class IxbrlModel(ebase.XmlElementBase):
         except Exception as ex:
             return f'{sgn}{value}'
 
-    def get_inherited_attribute(self, e, name, initial='', concatenate_parent=False):
-        if e is None:
+    def get_inherited_attribute(self, e, name, initial='', resolve_parent=False):
+        """ Returns the value of an attribute given on the element or inherited from its nearest ancestor. If
+            resolve_parent is set, values are URI references resolved against the values of the ancestors from the
+            root down (e.g. xml:base) and given initial value is resolved against the result. """
+        idx = self.inherited.get((name, resolve_parent))
+        if idx is None:
+            idx = self.build_inherited_map(name, resolve_parent)
+        value = idx.get(e)
+        if value is None:
             return initial
-        value = e.attrib.get(name)
-        if value and not concatenate_parent:
-            return value
-        parent = e.getparent()
-        return self.get_inherited_attribute(parent, name, f'{value if value and concatenate_parent else ""}{initial}', concatenate_parent)
+        return urllib.parse.urljoin(value, initial) if resolve_parent else value
+
+    def build_inherited_map(self, name, resolve_parent):
+        """ Computes effective values of an inherited attribute in a single top-down pass over the document.
+            Only elements with an effective value are stored. """
+        idx = {}
+        self.inherited[(name, resolve_parent)] = idx
+        uri = util.get_namespace(name)
+        query = f'boolean(//@{"a:" if uri else ""}{util.get_local_name(name)})'
+        if not self.root.xpath(query, namespaces={'a': uri} if uri else None):
+            return idx
+        for e in self.root.iter(lxml.Element):
+            inherited = idx.get(e.getparent())
+            value = e.attrib.get(name)
+            if not value:
+                value = inherited
+            elif resolve_parent and inherited:
+                value = urllib.parse.urljoin(inherited, value)
+            if value is not None:
+                idx[e] = value
+        return idx
 
     def serialize_ix_element(self, e):
         if e.tag is lxml.Comment:
             return
-        text_content = self.get_full_content(e, [e])
+        text_content = self.get_full_content(e)
         eb = ebase.XmlElementBase(e, parsers=None, assign_origin=True)
         self.prefixes[eb.prefix] = True
         self.output.append(f'<{eb.qname}')
@@ -246,8 +347,7 @@ class IxbrlModel(ebase.XmlElementBase):
             a_uri = util.get_namespace(a[0])
             a_qname = a_name
             if a_name == 'href':
-                xml_base = self.get_inherited_attribute(eb.origin, "xml:base", '', True)
-                value = f'{xml_base}{value}'
+                value = self.get_inherited_attribute(eb.origin, XML_BASE, value, True)
             if a_uri:
                 aprefix = self.instance.namespaces_reverse.get(a_uri)
                 if aprefix:
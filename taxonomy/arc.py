@@ -16,6 +16,9 @@ class Arc(ebase.XmlElementBase):
         u = e.attrib.get(f'{{{const.NS_XBRLDT}}}usable')
         self.usable = False if u is not None and u in ['false', '0'] else True
         self.target_role = e.attrib.get(f'{{{const.NS_XBRLDT}}}targetRole')
+        c = e.attrib.get(f'{{{const.NS_XBRLDT}}}closed')
+        self.closed = c is not None and c in ['true', '1']
+        self.context_element = e.attrib.get(f'{{{const.NS_XBRLDT}}}contextElement')
         self.axis = e.attrib.get('axis')  # for tableBreakdownArc
         if self.xlink is not None:
             self.xlink.arcs_from.setdefault(f'{self.arcrole}|{self.xl_from}', []).append(self)
@@ -7,6 +7,15 @@ class BaseSet:
         self.arcrole = arcrole
         self.role = role
         self.roots = []
+        """ Compiled tree - tuple with following structure: (nodes in pre-order, index of the end of the branch for
+            each node, positions of nodes by concept QName, positions of roots). None, if relationships or labels of
+            member concepts changed since the tree was compiled - see invalidate. """
+        self.tree = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['tree'] = None  # Compiled again on first use, so that node labels reflect the restored concepts
+        return state
 
     def __str__(self):
         return self.info()
@@ -24,6 +33,79 @@ class BaseSet:
     """
 
     def get_members(self, start_concept=None, include_head=True, s_groups=None):
+        if s_groups is not None:
+            return self.get_members_filtered(start_concept, include_head, s_groups)
+        nodes, ends, positions, root_positions = self.get_tree()
+        members = []
+        for i in root_positions if not start_concept else positions.get(start_concept, []):
+            members.extend(nodes[i if include_head else i + 1:ends[i]])
+        return members
+
+    def get_tree(self):
+        if self.tree is None:
+            self.compile()
+        return self.tree
+
+    def invalidate(self):
+        """ Drops the compiled tree, e.g. when a relationship or a label is connected to a member concept. """
+        self.tree = None
+
+    def compile(self):
+        """ Flattens the whole base set into a list of nodes in pre-order. Each branch is then a slice of the list. """
+        key = self.get_key()
+        nodes = []
+        root_positions = []
+        for r in self.roots:
+            root_positions.append(len(nodes))
+            nodes.append(data_wrappers.BaseSetNode(r, 0, None, r.chain_dn.get(key) is None, r.get_label()))
+            path = [r]
+            on_path = {r}
+            branches = [iter(self.get_children(r, key, on_path))]
+            while branches:
+                child = next(branches[-1], None)
+                if child is None:
+                    branches.pop()
+                    on_path.discard(path.pop())
+                    continue
+                c, a, label = child
+                nodes.append(data_wrappers.BaseSetNode(c, len(path), a, c.chain_dn.get(key) is None, label))
+                path.append(c)
+                on_path.add(c)
+                branches.append(iter(self.get_children(c, key, on_path)))
+        ends = [len(nodes)] * len(nodes)
+        open_nodes = []
+        positions = {}
+        for i, n in enumerate(nodes):
+            while open_nodes and nodes[open_nodes[-1]].Level >= n.Level:
+                ends[open_nodes.pop()] = i
+            open_nodes.append(i)
+            positions.setdefault(n.Concept.qname, []).append(i)
+        self.tree = (nodes, ends, positions, root_positions)
+
+    @staticmethod
+    def get_children(concept, key, on_path):
+        """ Returns the list of tuples (concept, arc, preferred label) for children of the concept in arc order. """
+        cbs_dn = concept.chain_dn.get(key, None)
+        if cbs_dn is None:
+            return []
+        lst = sorted([n for n in cbs_dn if n.Concept not in on_path],
+                     key=lambda t: 0 if t.Arc.order is None else float(t.Arc.order))
+        used = set()
+        children = []
+        for node in lst:
+            if node.Concept.qname in used:
+                continue
+            used.add(node.Concept.qname)
+            node_lbl = node.Concept.get_label()
+            node_lbl_pref = node_lbl
+            if node.Arc.preferredLabel:
+                node_lbl_pref = node.Concept.get_label(role=node.Arc.preferredLabel)
+            if not node_lbl_pref:
+                node_lbl_pref = node_lbl
+            children.append((node.Concept, node.Arc, node_lbl_pref))
+        return children
+
+    def get_members_filtered(self, start_concept=None, include_head=True, s_groups=None):
         members = []
         for r in self.roots:
             r_label = r.get_label()
@@ -72,7 +154,10 @@ class BaseSet:
 
     def get_langs(self):
         langs = set()
-        lbls = [n.Concept.resources.get('label', {}) for n in self.get_members()]
+        members = self.get_members()
+        for n in members:
+            n.Concept.load_resources(('label',))
+        lbls = [n.Concept.resources.get('label', {}) for n in members]
         for dct in lbls:
             for v in dct.values():
                 for lbl in v:
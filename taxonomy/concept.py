@@ -31,10 +31,12 @@ class Concept(element.Element):
         if self.schema is not None:
             self.namespace = self.schema.target_namespace
         # Collections
-        self.resources = {}  # Related labels - first by lang and then by role
+        # Related labels - first by lang and then by role. In lazy mode, call load_resources before reading it directly.
+        self.resources = {}
         self.references = {}  # Related reference resources
         self.chain_up = {}  # Related parent concepts. Key is the base set key, value is the list of parent concepts
         self.chain_dn = {}  # Related child concepts. Key is the base set key, value is the list of child concepts
+        self.label_cache = None  # Resolved labels. Key is the tuple (lang, role), value is the label text
 
         unique_id = f'{self.namespace}:{self.name}'
         self.schema.concepts[unique_id] = self
@@ -45,21 +47,40 @@ class Concept(element.Element):
     def __repr__(self):
         return self.qname
 
+    def load_resources(self, kinds):
+        """ Loads linkbases of given kinds, which are deferred by taxonomies using this concept (lazy mode only). """
+        pool = self.schema.pool
+        if pool is not None and pool.lazy_linkbases:
+            pool.load_deferred_linkbases(self.schema.location, kinds)
+
     def get_label(self, lang='en', role='/label'):
-        return util.get_label(self.resources, lang, role)
+        self.load_resources(('label',))
+        return util.get_compiled_label(self.compile_labels(), self.resources, lang, role)
+
+    def compile_labels(self):
+        """ Returns the dictionary of resolved labels (see util.compile_labels). """
+        if self.label_cache is None:
+            self.label_cache = util.compile_labels(self.resources)
+        return self.label_cache
+
+    def reset_labels(self):
+        """ Drops resolved labels, e.g. when a new label resource is connected to the concept. """
+        self.label_cache = None
 
     def get_label_or_qname(self, lang='en', role='/label'):
-        lbl = util.get_label(self.resources, lang, role)
+        lbl = self.get_label(lang, role)
         return lbl if lbl else self.qname
 
     def get_label_or_name(self, lang='en', role='/label'):
-        lbl = util.get_label(self.resources, lang, role)
+        lbl = self.get_label(lang, role)
         return self.name if lbl is None else lbl
 
     def get_lang(self):
+        self.load_resources(('label',))
         return util.get_lang(self.resources)
 
     def get_enum_label(self, role):
+        self.load_resources(('label',))
         labels = self.resources.get('label', None)
         if labels is None:
             return None
@@ -69,6 +90,7 @@ class Concept(element.Element):
         return candidates[0].text
 
     def get_reference(self, lang='en', role='/label'):
+        self.load_resources(('reference',))
         return util.get_reference(self.resources, lang, role)
 
     def info(self):
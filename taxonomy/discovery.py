@@ -0,0 +1,69 @@
+import os
+import concurrent.futures
+from xbrl.base import const, fbase, util
+
+
+class DtsDiscovery:
+    """ Discovers the DTS of a set of entry points breadth-first and fetches and parses all documents concurrently.
+        Parsed documents are stored in pool.prefetched, so that the serial load of the taxonomy only builds
+        the objects in its usual (deterministic) order without waiting for I/O and parsing. """
+    def __init__(self, container_pool, workers=None):
+        self.pool = container_pool
+        self.workers = workers if workers else os.cpu_count()
+        """ All discovered locations. """
+        self.discovered = set()
+
+    def prefetch(self, entry_points):
+        frontier = self.resolve(entry_points, '')
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while frontier:
+                next_frontier = []
+                for url, root in zip(frontier, executor.map(self.fetch, frontier)):
+                    if root is None:
+                        root = self.pool.documents.get(url)  # Already parsed for another taxonomy
+                        if root is None:
+                            continue
+                    else:
+                        self.pool.prefetched[url] = root
+                    next_frontier.extend(self.resolve(self.get_references(root), os.path.split(url)[0]))
+                frontier = next_frontier
+
+    def resolve(self, hrefs, base):
+        """ Returns the list of effective locations, which are not discovered yet. """
+        result = []
+        for href in hrefs:
+            url = self.pool.resolve_reference(href, base)
+            if url is None:
+                continue
+            url = util.reduce_url(url)
+            if url in self.discovered:
+                continue
+            self.discovered.add(url)
+            result.append(url)
+        return result
+
+    def fetch(self, url):
+        if url in self.pool.documents:
+            return None
+        try:
+            return fbase.read_root(url, self.pool)
+        except Exception:
+            return None  # The error is reported when the document is loaded by the serial process
+
+    @staticmethod
+    def get_references(root):
+        """ Returns all hrefs, which the schema or linkbase loader would follow for a given root element. """
+        refs = []
+        for e in [root] + list(root.iter(f'{{{const.NS_LINK}}}linkbase')):
+            sl = e.attrib.get(f'{{{const.NS_XSI}}}schemaLocation')
+            if sl:
+                refs.extend(util.normalize(sl).split(' ')[1::2])
+        for e in root.iter(f'{{{const.NS_XS}}}import'):
+            refs.append(e.attrib.get('schemaLocation'))
+        for e in root.iter(
+                f'{{{const.NS_LINK}}}linkbaseRef', f'{{{const.NS_LINK}}}roleRef',
+                f'{{{const.NS_LINK}}}arcroleRef', f'{{{const.NS_LINK}}}loc'):
+            href = e.attrib.get(f'{{{const.NS_XLINK}}}href')
+            if href and not href.startswith('#'):
+                refs.append(href.split('#')[0])
+        return refs
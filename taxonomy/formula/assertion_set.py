@@ -6,4 +6,4 @@ class AssertionSet(resource.Resource):
         self.assertions = {}
         self.tables = {}
         super().__init__(e, container_xlink)
-        container_xlink.linkbase.pool.current_taxonomy.assertion_sets[container_xlink.linkbase.location] = self
+        container_xlink.linkbase.register('assertion_sets', container_xlink.linkbase.location, self)
@@ -7,4 +7,4 @@ class ConsistencyAssertion(assertion.Assertion):
         self.strict = e.attrib.get('strict')
         self.abs_radius = e.attrib.get('absoluteAcceptanceRadius')
         self.prop_radius = e.attrib.get('proportionalAcceptanceRadius')
-        container_xlink.linkbase.pool.current_taxonomy.consistency_assertions[self.xlabel] = self
+        container_xlink.linkbase.register('consistency_assertions', self.xlabel, self)
@@ -20,4 +20,4 @@ class CustomFunction(resource.Resource):
                 self.inputs.append(ty)
 
         super().__init__(e, container_xlink)
-        container_xlink.linkbase.pool.current_taxonomy.resources[self.xlabel] = self
+        container_xlink.linkbase.register('resources', self.xlabel, self)
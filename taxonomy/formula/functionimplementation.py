@@ -25,6 +25,6 @@ class FunctionImplementation(resource.Resource):
                 self.outputs.append(p)
 
         super().__init__(e, container_xlink)
-        container_xlink.linkbase.pool.current_taxonomy.resources[self.xlabel] = self
+        container_xlink.linkbase.register('resources', self.xlabel, self)
 
 
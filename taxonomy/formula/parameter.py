@@ -8,4 +8,4 @@ class Parameter(resource.Resource):
         self.name = e.attrib.get('name')
         self.select = e.attrib.get('select')
         self.data_type = e.attrib.get('as')
-        container_xlink.linkbase.pool.current_taxonomy.parameters[self.xlabel] = self
+        container_xlink.linkbase.register('parameters', self.xlabel, self)
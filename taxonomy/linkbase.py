@@ -20,6 +20,11 @@ class Linkbase(fbase.XmlFileBase):
         self.refs = set({})
         self.pool = container_pool
         self.links = []
+        """ Objects to be registered in the taxonomy, where the linkbase is attached. List of tuples with following
+            structure: (name of the taxonomy collection, key, object) """
+        self.registrations = []
+        if self.pool is not None and self.pool.load_profile is not None:
+            self.pool.load_profile.filter_parsers(parsers, self.l_skip)
         resolved_location = util.reduce_url(location)
         if self.pool is not None:
             self.pool.discovered[location] = True
@@ -33,10 +38,16 @@ class Linkbase(fbase.XmlFileBase):
             self.pool.add_reference(href, self.base)
         self.l_children(e)
 
+    def register(self, collection, key, obj):
+        self.registrations.append((collection, key, obj))
+
     def l_link(self, e):
         xl = xlink.XLink(e, self)
         self.links.append(xl)
 
+    def l_skip(self, e):
+        pass
+
     ''' Effectively reading roleRef and arcroleRef is the same thing here, 
         because it only discovers the corresponding schema '''
     def l_arcrole_ref(self, e):
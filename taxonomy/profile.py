@@ -0,0 +1,46 @@
+from xbrl.base import const, util
+
+
+class LoadProfile:
+    """ Defines, which parts of the linkbases are materialised when a taxonomy is loaded. Filtered elements are
+        skipped while the linkbase is parsed, so that no objects are created for them. """
+    def __init__(self, languages=None, label_roles=None, exclude=None):
+        """ Label languages to load, e.g. ['en']. A language also matches its subtags, e.g. 'en' matches 'en-GB',
+            but not 'eng'. Labels without language are always loaded. If not set, labels in all languages are loaded. """
+        self.languages = tuple(lang.lower() for lang in languages) if languages else None
+        """ Label roles to load, given as full role URIs or role endings, e.g. ['/label', '/terseLabel'].
+            If not set, labels with all roles are loaded. """
+        self.label_roles = tuple(label_roles) if label_roles else None
+        """ Local names of extended links, arcs and resources, which are not loaded at all,
+            e.g. ['referenceLink', 'referenceArc', 'reference'] """
+        self.exclude = set(exclude) if exclude else set()
+
+    def get_key(self):
+        """ Returns a string identifying the profile. """
+        return '|'.join([
+            ','.join(self.languages) if self.languages else '*',
+            ','.join(self.label_roles) if self.label_roles else '*',
+            ','.join(sorted(self.exclude))])
+
+    def filter_parsers(self, parsers, skip_method):
+        """ Replaces parser methods of excluded elements with given method. """
+        for tag in parsers:
+            if util.get_local_name(tag) in self.exclude:
+                parsers[tag] = skip_method
+
+    def accepts_language(self, lang):
+        """ Checks whether a language tag equals one of the profile languages or is one of their subtags. """
+        lang = lang.lower()
+        return any(lang == x or lang.startswith(f'{x}-') for x in self.languages)
+
+    def accepts_label(self, e):
+        """ Checks whether a label resource element is to be loaded based on its language and role. """
+        if self.languages is not None:
+            lang = e.attrib.get(f'{{{const.NS_XML}}}lang')
+            if lang is not None and not self.accepts_language(lang):
+                return False
+        if self.label_roles is not None:
+            role = e.attrib.get(f'{{{const.NS_XLINK}}}role', const.ROLE_LABEL)
+            if not role.endswith(self.label_roles):
+                return False
+        return True
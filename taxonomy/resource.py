@@ -11,11 +11,22 @@ class Resource(ebase.XmlElementBase):
         self.text = e.text
         self.parent = None  # Parent resource if any - e.g. a table
         self.order = 0  # Order in the structure taken from arc
+        self.label_cache = None  # Resolved labels. Key is the tuple (lang, role), value is the label text
         if self.xlink is not None:
             self.xlink.resources.setdefault(self.xlabel, []).append(self)
 
     def get_label(self, lang='en', role='/label'):
-        return util.get_label(self.nested, lang, role)
+        return util.get_compiled_label(self.compile_labels(), self.nested, lang, role)
+
+    def compile_labels(self):
+        """ Returns the dictionary of resolved labels (see util.compile_labels). """
+        if self.label_cache is None:
+            self.label_cache = util.compile_labels(self.nested)
+        return self.label_cache
+
+    def reset_labels(self):
+        """ Drops resolved labels, e.g. when a new label resource is nested in this resource. """
+        self.label_cache = None
 
     def get_rc_label(self):
         return util.get_rc_label(self.nested)
@@ -4,7 +4,7 @@ import os
 
 
 class Schema(fbase.XmlFileBase):
-    def __init__(self, location, container_pool):
+    def __init__(self, location, container_pool, root=None):
         self.target_namespace = ''
         self.target_namespace_prefix = ''
         parsers = {
@@ -46,7 +46,7 @@ class Schema(fbase.XmlFileBase):
         resolved_location = util.reduce_url(location)
         if self.pool is not None:
             self.pool.discovered[location] = True
-        super().__init__(resolved_location, container_pool, parsers)
+        super().__init__(resolved_location, container_pool, parsers, root)
         if self.pool is not None:
             self.pool.schemas[resolved_location] = self
 
@@ -95,7 +95,7 @@ class Schema(fbase.XmlFileBase):
         if not href.startswith('http'):
             href = util.reduce_url(os.path.join(self.base, href).replace('\\', '/'))
         self.linkbase_refs[href] = e
-        self.pool.add_reference(href, self.base)
+        self.pool.current_taxonomy.add_linkbase_ref(href, self.base, e)
 
     def l_roletype(self, e):
         roletype.RoleType(e, self)
@@ -0,0 +1,145 @@
+import os
+import gc
+import copyreg
+import pickle
+import tempfile
+from lxml import etree as lxml
+from xbrl.base import util
+from xbrl.taxonomy import concept
+
+""" Version of the snapshot format. Snapshots written with a different version are ignored and rebuilt. """
+SNAPSHOT_VERSION = 9
+
+
+class SnapshotPickler(pickle.Pickler):
+    """ Pickler for compiled taxonomies. The data pool is stored as a persistent reference, lxml elements are
+        stored as serialized XML and concept relationships (chain_up/chain_dn) are taken out of the concept objects,
+        because otherwise pickling deep hierarchies runs out of recursion depth. """
+    def __init__(self, file, container_pool):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.pool = container_pool
+
+    def persistent_id(self, obj):
+        return 'pool' if obj is self.pool else None
+
+    def reducer_override(self, obj):
+        if isinstance(obj, concept.Concept):
+            state = {k: v for k, v in obj.__dict__.items() if k not in ('chain_up', 'chain_dn')}
+            return copyreg.__newobj__, (type(obj),), state
+        if isinstance(obj, lxml._Element):
+            return lxml.fromstring, (lxml.tostring(obj, with_tail=False),)
+        return NotImplemented
+
+
+class SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file, container_pool):
+        super().__init__(file)
+        self.pool = container_pool
+
+    def persistent_load(self, pid):
+        if pid == 'pool':
+            return self.pool
+        raise pickle.UnpicklingError(f'Unknown persistent id: {pid}')
+
+
+class SnapshotCache:
+    """ Persistent on-disk cache of fully compiled taxonomies. Snapshots are keyed by the hash of the entry points
+        and are invalidated automatically if any of the source files of the DTS changes. """
+    def __init__(self, container_pool, folder=None):
+        self.pool = container_pool
+        self.folder = folder if folder else os.path.join(self.pool.cache_folder, 'snapshots')
+        if not os.path.exists(self.folder):
+            os.makedirs(self.folder)
+
+    def get_location(self, entry_points):
+        key = ",".join(entry_points)
+        if self.pool.load_profile is not None:
+            key = f'{key}|{self.pool.load_profile.get_key()}'  # Filtered taxonomies are stored separately
+        return os.path.join(self.folder, f'{util.get_hash(key)}.pickle')
+
+    def get_file_state(self, url):
+        """ Returns a tuple (file, size, mtime) identifying the current state of the file where the URL is read from.
+            For packaged files the state of the taxonomy package is returned. """
+        filename = url
+        if self.pool.packaged_locations and url in self.pool.packaged_locations:
+            filename = self.pool.packaged_locations[url][0].location
+        elif url.startswith('http'):
+            filename = self.pool.get_cached_location(url)
+        if filename is None or not os.path.exists(filename):
+            return filename, None, None
+        st = os.stat(filename)
+        return filename, st.st_size, st.st_mtime_ns
+
+    def get_manifest(self, tax):
+        return {url: self.get_file_state(url) for url in list(tax.schemas) + list(tax.linkbases)}
+
+    def is_valid(self, manifest):
+        return all(state[1] is not None and self.get_file_state(url) == state for url, state in manifest.items())
+
+    def load(self, entry_points):
+        """ Returns the taxonomy stored for given entry points or None if there is no valid snapshot. """
+        location = self.get_location(entry_points)
+        if not os.path.exists(location):
+            return None
+        # Cyclic garbage collection is suspended, because it is triggered over and over by the bulk object creation.
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(location, 'rb') as f:
+                up = SnapshotUnpickler(f, self.pool)
+                version = up.load()
+                if version != SNAPSHOT_VERSION:
+                    return None
+                manifest = up.load()
+                if not self.is_valid(manifest):
+                    return None
+                tax = up.load()
+                chains = up.load()
+        except Exception as ex:
+            print('Cannot load taxonomy snapshot:', location, ex)
+            return None
+        finally:
+            if gc_enabled:
+                gc.enable()
+        for c, chain_up, chain_dn in chains:
+            c.chain_up = chain_up
+            c.chain_dn = chain_dn
+        self.attach(tax)
+        return tax
+
+    def attach(self, tax):
+        """ Registers a taxonomy loaded from a snapshot in the data pool. """
+        tax.pool = self.pool
+        self.pool.current_taxonomy = tax
+        self.pool.current_taxonomy_hash = util.get_hash(','.join(tax.entry_points))
+        for href, sh in tax.schemas.items():
+            self.pool.schemas[href] = sh
+            self.pool.discovered[f'{self.pool.current_taxonomy_hash}_{href}'] = True
+            self.pool.reference_document(href)
+        for href, lb in tax.linkbases.items():
+            self.pool.linkbases[href] = lb
+            self.pool.discovered[f'{self.pool.current_taxonomy_hash}_{href}'] = True
+            self.pool.reference_document(href)
+
+    def save(self, tax):
+        location = self.get_location(tax.entry_points)
+        concepts = {id(c): c for sh in tax.schemas.values() for c in sh.concepts.values()}
+        chains = [(c, c.chain_up, c.chain_dn) for c in concepts.values()]
+        fd, temp_location = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                p = SnapshotPickler(f, self.pool)
+                p.dump(SNAPSHOT_VERSION)
+                p.dump(self.get_manifest(tax))
+                p.dump(tax)
+                p.dump(chains)
+            os.replace(temp_location, location)
+        except Exception as ex:
+            print('Cannot save taxonomy snapshot:', location, ex)
+            if os.path.exists(temp_location):
+                os.remove(temp_location)
+
+    def invalidate(self, entry_points):
+        location = self.get_location(entry_points)
+        if os.path.exists(location):
+            os.remove(location)
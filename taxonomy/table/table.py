@@ -10,7 +10,7 @@ class Table(tlb_resource.TableResource):
         self.open_dimensions = {}
         self.parent_child_order = e.attrib.get('parentChildOrder')
         super().__init__(e, container_xlink)
-        container_xlink.linkbase.pool.current_taxonomy.tables[self.xlabel] = self
+        container_xlink.linkbase.register('tables', self.xlabel, self)
 
     def get_label(self, lang='en', role='/label'):
         lbl = super().get_label(lang, role)
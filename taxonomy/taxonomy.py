@@ -1,5 +1,25 @@
+import re
 from xbrl.base import const, data_wrappers, util
-from xbrl.taxonomy.xdt import dr_set
+from xbrl.taxonomy.xdt import dr_set, validity_index
+
+""" Kinds of linkbases, which are loaded on demand in lazy mode, in the order of loading. Definition linkbases are
+    always loaded, because they are needed for dimensional validation. """
+LAZY_LINKBASE_KINDS = ('label', 'reference', 'presentation', 'calculation', 'table', 'formula')
+""" Kind of linkbase by the role of the linkbase reference. """
+LAZY_LINKBASE_ROLES = {
+    const.ROLE_LINKBASE_REF_LABEL: 'label',
+    const.ROLE_LINKBASE_REF_REFERENCE: 'reference',
+    const.ROLE_LINKBASE_REF_PRESENTATION: 'presentation',
+    const.ROLE_LINKBASE_REF_CALCULATION: 'calculation'}
+""" Kind of linkbase by the usual file name suffix - used if the linkbase reference has no role. """
+LAZY_LINKBASE_SUFFIXES = {
+    'lab': 'label', 'ref': 'reference', 'pre': 'presentation', 'cal': 'calculation', 'rend': 'table', 'for': 'formula'}
+LAZY_LINKBASE_PATTERN = re.compile(r'[-_](lab|ref|pre|cal|rend|for)([-_][\w.-]*)?\.xml$')
+""" Kinds of linkbases needed by base sets of a given arc name. """
+LAZY_ARC_KINDS = {
+    'definitionArc': (),
+    'presentationArc': ('label', 'presentation'),
+    'calculationArc': ('label', 'calculation')}
 
 
 class Taxonomy:
@@ -18,6 +38,13 @@ class Taxonomy:
         self.concepts = {}
         """ All concepts indexed by QName"""
         self.concepts_by_qname = {}
+        """ Namespace prefixes declared in all schemas. Key is the prefix, value is the namespace URI. If a prefix is
+            bound to different namespaces, the binding in the first schema is used. """
+        self.namespaces = {}
+        """ Key is the namespace URI, value is the prefix """
+        self.namespaces_reverse = {}
+        """ Resolved QNames. Key is the QName, value is the tuple (namespace, local name). """
+        self.qnames = {}
         """ General elements, which are not concepts """
         self.elements = {}
         self.elements_by_id = {}
@@ -39,8 +66,10 @@ class Taxonomy:
         self.idx_hc_drs = {}
         """ Key is the QName of the member. Value is the set of DR keys, where this member participates. """
         self.idx_mem_drs = {}
+        """ Compiled dimensional relationship sets for validity checks - created on first use. """
+        self._validity_index = None
         """ All table resources in taxonom """
-        self.tables = {}
+        self._tables = {}
         """ All role types in all schemas """
         self.role_types = {}
         self.role_types_by_href = {}
@@ -52,13 +81,13 @@ class Taxonomy:
         """ All locators """
         self.locators = {}
         """ All parameters """
-        self.parameters = {}
+        self._parameters = {}
         """ All assertions by type """
-        self.value_assertions = {}
-        self.existence_assertions = {}
-        self.consistency_assertions = {}
+        self._value_assertions = {}
+        self._existence_assertions = {}
+        self._consistency_assertions = {}
         """ Assertion Sets """
-        self.assertion_sets = {}
+        self._assertion_sets = {}
         """ Simple types """
         self.simple_types = {}
         """ Complex types with simple content. Key is the QName, value is the item type object. """
@@ -69,10 +98,44 @@ class Taxonomy:
         self.tuple_types = {}
         """ Complex types with complex content: Key is unique identifier, value is the tuple type object """
         self.tuple_types_by_id = {}
+        """ Linkbases not loaded yet (lazy mode only). Key is the kind of linkbase, value is a dictionary, where
+            key is the linkbase location and value is the base location of the referring schema. """
+        self.deferred_linkbases = {}
 
         self.load()
         self.compile()
 
+    """ Collections populated by table and formula linkbases. In lazy mode, these linkbases are loaded on first access. """
+    @property
+    def tables(self):
+        self.load_linkbases(('label', 'table'))
+        return self._tables
+
+    @property
+    def parameters(self):
+        self.load_linkbases(('label', 'formula'))
+        return self._parameters
+
+    @property
+    def value_assertions(self):
+        self.load_linkbases(('label', 'formula'))
+        return self._value_assertions
+
+    @property
+    def existence_assertions(self):
+        self.load_linkbases(('label', 'formula'))
+        return self._existence_assertions
+
+    @property
+    def consistency_assertions(self):
+        self.load_linkbases(('label', 'formula'))
+        return self._consistency_assertions
+
+    @property
+    def assertion_sets(self):
+        self.load_linkbases(('label', 'formula'))
+        return self._assertion_sets
+
     def __str__(self):
         return self.info()
 
@@ -80,6 +143,7 @@ class Taxonomy:
         return self.info()
 
     def info(self):
+        self.load_linkbases()  # Counts below include resources of linkbases loaded on demand
         return '\n'.join([
             f'Schemas: {len(self.schemas)}',
             f'Linkbases: {len(self.linkbases)}',
@@ -111,41 +175,89 @@ class Taxonomy:
             self.pool.add_reference(ep, '')
 
     def resolve_prefix(self, pref):
-        for sh in self.schemas.values():
-            ns = sh.namespaces.get(pref, None)
-            if ns is not None:
-                return ns
-        return None
+        return self.namespaces.get(pref, None)
+
+    def split_qname(self, qname):
+        """ Returns the tuple (namespace, local name) for a QName. Namespace is None, if the prefix is not declared
+            in any schema of the taxonomy. """
+        parts = self.qnames.get(qname)
+        if parts is None:
+            pref, sep, nm = qname.partition(':')
+            parts = (self.namespaces.get(pref), nm) if sep else (self.namespaces.get(''), qname)
+            self.qnames[qname] = parts
+        return parts
 
     def resolve_qname(self, qname):
-        pref = qname.split(':')[0] if ':' in qname else ''
-        ns = self.resolve_prefix(pref)
-        nm = qname.split(':')[1] if ':' in qname else qname
+        ns, nm = self.split_qname(qname)
         return f'{ns}:{nm}'
 
     def attach_schema(self, href, sh):
         if href in self.schemas:
             return
         self.schemas[href] = sh
-        for key, imp in sh.imports.items():
-            self.pool.add_reference(key, sh.base)
-        for key, ref in sh.linkbase_refs.items():
-            self.pool.add_reference(key, sh.base)
 
     def attach_linkbase(self, href, lb):
         if href in self.linkbases:
             return
         self.linkbases[href] = lb
-        for href in lb.refs:
-            self.pool.add_reference(href, lb.base)
+        for collection, key, obj in lb.registrations:
+            # Collections loaded on demand are populated directly, so that loading is not triggered recursively
+            target = getattr(self, f'_{collection}', None)
+            (getattr(self, collection) if target is None else target)[key] = obj
+
+    def add_linkbase_ref(self, href, base, e):
+        """ Loads a linkbase referenced from a schema or, in lazy mode, defers loading until its content is needed. """
+        kind = self.get_linkbase_kind(href, e) if self.pool.lazy_linkbases else None
+        if kind is None:
+            self.pool.add_reference(href, base)
+            return
+        self.deferred_linkbases.setdefault(kind, {})[href] = base
+
+    @staticmethod
+    def get_linkbase_kind(href, e):
+        """ Returns the kind of a referenced linkbase, if it can be loaded on demand, otherwise None. """
+        role = e.get(f'{{{const.NS_XLINK}}}role')
+        if role:
+            return LAZY_LINKBASE_ROLES.get(role)
+        m = LAZY_LINKBASE_PATTERN.search(href.split('/')[-1])
+        return LAZY_LINKBASE_SUFFIXES.get(m.group(1)) if m else None
+
+    def load_linkbases(self, kinds=None):
+        """ Loads and compiles deferred linkbases of given kinds. If kinds is not set, all deferred linkbases are loaded. """
+        if not self.deferred_linkbases:
+            return
+        refs = [(href, base) for kind in LAZY_LINKBASE_KINDS if kinds is None or kind in kinds
+                for href, base in self.deferred_linkbases.pop(kind, {}).items()]
+        if not refs:
+            return
+        known_schemas, known_linkbases = set(self.schemas), list(self.linkbases)
+        # The pool may be in the middle of loading another taxonomy, so that its state is restored afterwards
+        state = (self.pool.current_taxonomy, self.pool.current_taxonomy_hash, self.pool.packaged_locations)
+        self.pool.current_taxonomy = self
+        self.pool.current_taxonomy_hash = util.get_hash(','.join(self.entry_points))
+        for ep in self.entry_points:
+            self.pool.add_packaged_entrypoints(ep)
+        try:
+            for href, base in refs:
+                self.pool.add_reference(href, base)
+            self.compile_schemas([sh for href, sh in self.schemas.items() if href not in known_schemas])
+            self.compile_linkbases([lb for href, lb in self.linkbases.items() if href not in known_linkbases])
+            # Arcs of previously loaded linkbases may refer to resources, which are loaded just now
+            for href in known_linkbases:
+                for xl in self.linkbases[href].links:
+                    xl.resolve()
+        finally:
+            self.pool.current_taxonomy, self.pool.current_taxonomy_hash, self.pool.packaged_locations = state
 
     def get_bs_roots(self, arc_name, role, arcrole):
+        self.load_linkbases(LAZY_ARC_KINDS.get(arc_name, LAZY_LINKBASE_KINDS))
         bs = self.base_sets.get(f'{arc_name}|{arcrole}|{role}')
         if not bs:
             return None
         return bs.roots
 
     def get_bs_members(self, arc_name, role, arcrole, start_concept=None, include_head=True):
+        self.load_linkbases(LAZY_ARC_KINDS.get(arc_name, LAZY_LINKBASE_KINDS))
         bs = self.base_sets.get(f'{arc_name}|{arcrole}|{role}', None)
         if not bs:
             return None
@@ -183,8 +295,13 @@ class Taxonomy:
         self.compile_defaults()
         self.compile_dr_sets()
 
-    def compile_schemas(self):
-        for sh in self.schemas.values():
+    def compile_schemas(self, schemas=None):
+        for sh in self.schemas.values() if schemas is None else schemas:
+            for pref, ns in sh.namespaces.items():
+                if pref not in self.namespaces:
+                    self.namespaces[pref] = ns
+                    self.qnames.clear()  # Previously unresolved prefixes may be resolved now
+                self.namespaces_reverse.setdefault(ns, pref)
             for c in sh.concepts.values():
                 self.concepts_by_qname[c.qname] = c
                 if c.id is not None:
@@ -213,9 +330,11 @@ class Taxonomy:
             for key, st in sh.simple_types.items():
                 self.simple_types[key] = st
 
-    def compile_linkbases(self):
+    def compile_linkbases(self, linkbases=None):
+        if linkbases is None:
+            linkbases = list(self.linkbases.values())
         # Pass 1 - Index global objects
-        for lb in self.linkbases.values():
+        for lb in linkbases:
             for xl in lb.links:
                 for key, loc in xl.locators_by_href.items():
                     self.locators[key] = loc
@@ -225,10 +344,21 @@ class Taxonomy:
                             href = f'{xl.linkbase.location}#{res.id}'
                             self.resources[href] = res
         # Pass 2 - Connect resources to each other
-        for lb in self.linkbases.values():
+        for lb in linkbases:
             for xl in lb.links:
                 xl.compile()
 
+    def compile_labels(self):
+        """ Resolves labels of all concepts and resources in advance, e.g. before rendering all tables. Labels of
+            a concept or resource are compiled only once, unless new labels are connected to it, and are then reused
+            by its get_label. """
+        self.load_linkbases(('label', 'table'))
+        owners = [c for c in self.concepts_by_qname.values() if 'label' in c.resources]
+        owners.extend(res for lb in self.linkbases.values() for xl in lb.links
+                      for l_res in xl.resources.values() for res in l_res if 'label' in res.nested)
+        for owner in owners:
+            owner.compile_labels()
+
     def compile_defaults(self):
         # key = f'definitionArc|{const.XDT_DIMENSION_DEFAULT_ARCROLE}|{const.ROLE_LINK}'
         frag = f'definitionArc|{const.XDT_DIMENSION_DEFAULT_ARCROLE}'
@@ -258,6 +388,11 @@ class Taxonomy:
                 self.add_drs(bs, self.dr_sets_excluding)
                 continue
 
+    def get_validity_index(self):
+        if self._validity_index is None:
+            self._validity_index = validity_index.ValidityIndex(self)
+        return self._validity_index
+
     def add_drs(self, bs, drs_collection):
         drs = dr_set.DrSet(bs, self)
         drs.compile()
@@ -276,4 +411,5 @@ class Taxonomy:
         return set(c.prefix for c in self.concepts.values())
 
     def get_languages(self):
+        self.load_linkbases(('label',))
         return set([r.lang for k, r in self.resources.items() if r.name == 'label'])
@@ -2,6 +2,7 @@ import os
 import zipfile
 from lxml import etree as lxml
 from xbrl.base import const, resolver, util, data_wrappers
+from xbrl.taxonomy import tpack_index
 
 
 class TaxonomyPackage(resolver.Resolver):
@@ -19,42 +20,64 @@ class TaxonomyPackage(resolver.Resolver):
         self.properties = {}
         """ List of superseded packages, each represented by ts URL. """
         self.superseded_packages = []
-        """ List of XBRL reports included in the package """
+        """ List of XBRL reports included in the package (names of the archive members) """
         self.reports = []
         self.files = None
         self.redirects = {}
         self.redirects_reduced = None
         self.catalog_location = None
+        """ Persistent index of the package file - available if the package is read from a location. """
+        self.index = None
         if self.location and os.path.exists(self.location):
-            self.archive = zipfile.ZipFile(self.location)
+            self.index = tpack_index.PackageIndex(self.location)
+            if not self.index.load():
+                self.archive = zipfile.ZipFile(self.location)
+                self.index.build(self.archive)
+                self.index.save()
             self.init()
 
     def __del__(self):
         if self.archive:
             self.archive.close()
+        if self.index:
+            self.index.close()
+
+    def get_names(self):
+        """ Returns names of all files in the package. """
+        if self.index is not None:
+            return list(self.index.members)
+        return [zi.filename for zi in self.archive.infolist() if not zi.is_dir()]
+
+    def read(self, name):
+        """ Reads the binary content of a file in the package. """
+        if self.index is not None:
+            content = self.index.read(name)
+            if content is not None:
+                return content
+        if self.archive is None:
+            self.archive = zipfile.ZipFile(self.location)
+        with self.archive.open(name) as f:
+            return f.read()
 
     def init(self):
-        zil = self.archive.infolist()
-        package_files = [f for f in zil if f.filename.endswith('META-INF/taxonomyPackage.xml')]
+        names = self.get_names()
+        package_files = [f for f in names if f.endswith('META-INF/taxonomyPackage.xml')]
         if len(package_files) == 0:
             return
-        package_file = package_files[0]
-        with self.archive.open(package_file) as zf:
-            package = lxml.XML(zf.read())
-            for e in package.iterchildren():
-                if str(e.tag).endswith('entryPoints'):
-                    self.l_entrypoints(e)
-                elif str(e.tag).endswith('supersededTaxonomyPackages'):
-                    self.l_superseded(e)
-                elif not len(e):  # second level
-                    name = util.get_local_name(str(e.tag))
-                    self.properties[name] = e.text
-        zi_catalog = [f for f in zil if f.filename.endswith('META-INF/catalog.xml')][0]
-        self.catalog_location = os.path.dirname(zi_catalog.filename)
-        with self.archive.open(zi_catalog) as cf:
-            catalog = lxml.XML(cf.read())
-            self.l_redirects(catalog)
-        self.reports = [f for f in zil if '/reports/' in f.filename]
+        package = lxml.XML(self.read(package_files[0]))
+        for e in package.iterchildren():
+            if str(e.tag).endswith('entryPoints'):
+                self.l_entrypoints(e)
+            elif str(e.tag).endswith('supersededTaxonomyPackages'):
+                self.l_superseded(e)
+            elif not len(e):  # second level
+                name = util.get_local_name(str(e.tag))
+                self.properties[name] = e.text
+        catalog_file = [f for f in names if f.endswith('META-INF/catalog.xml')][0]
+        self.catalog_location = os.path.dirname(catalog_file)
+        catalog = lxml.XML(self.read(catalog_file))
+        self.l_redirects(catalog)
+        self.reports = [f for f in names if '/reports/' in f]
 
     def get_url(self, url):
         """ Reads the binary content of a file addressed by a URL. """
@@ -63,34 +86,32 @@ class TaxonomyPackage(resolver.Resolver):
         file = self.files.get(url)
         if not file:
             return None
-        if self.archive is not None:
-            with self.archive.open(file) as f:
-                return f.read()
+        if self.archive is not None or self.index is not None:
+            return self.read(file)
         return bytes(file, encoding='utf-8')
 
     def get_hash(self):
         return util.get_hash(self.location)
 
     def compile(self):
-        self.files = {}
-        zip_infos = self.archive.infolist()
-        if not zip_infos:
+        if self.index is not None and self.index.files is not None:
+            self.files = self.index.files  # Resolved in a previous run
             return
+        self.files = {}
         # Index files by calculating effective URL based on catalog
-        root = zip_infos[0].filename.split('/')[0]  # Root of the archive file
-        for fn in [zi.filename for zi in zip_infos if not zi.is_dir()]:
-            matched_redirects = [(u, r) for u, r in self.redirects_reduced.items() if fn.startswith(r)]
-
+        trie = tpack_index.PrefixTrie()
+        for url, r in (self.redirects_reduced or {}).items():
+            trie.add(r, url)
+        for fn in self.get_names():
             self.files[fn] = fn
-            if not matched_redirects:
-                # self.files[fn] = fn
+            matched_redirect = trie.match(fn)
+            if matched_redirect is None:
                 continue
-
-
-            file_root = matched_redirects[0][1]
-            rewrite_prefix = matched_redirects[0][0]
-            url = fn.replace(file_root, rewrite_prefix)
-            self.files[url] = fn
+            file_root, rewrite_prefix = matched_redirect
+            self.files[f'{rewrite_prefix}{fn[len(file_root):]}'] = fn
+        if self.index is not None:
+            self.index.files = self.files
+            self.index.save()
 
     def l_redirects(self, ce):
         for e in ce.iterchildren():
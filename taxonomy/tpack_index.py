@@ -0,0 +1,123 @@
+import os
+import json
+import mmap
+import zlib
+import struct
+import tempfile
+import zipfile
+
+""" Version of the index format. Index files written with a different version are ignored and rebuilt. """
+INDEX_VERSION = 1
+
+
+class PrefixTrie:
+    """ Character trie of catalog rewrite prefixes. Finds the longest registered prefix of a string
+        in time proportional to the length of the string, independent of the number of prefixes. """
+    def __init__(self):
+        self.root = {}
+
+    def add(self, prefix, value):
+        node = self.root
+        for ch in prefix:
+            node = node.setdefault(ch, {})
+        node.setdefault(None, (prefix, value))  # First registration wins
+
+    def match(self, s):
+        """ Returns the tuple (prefix, value) for the longest prefix of s or None if there is no match. """
+        node = self.root
+        found = node.get(None)
+        for ch in s:
+            node = node.get(ch)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
+
+
+class PackageIndex:
+    """ Index of a taxonomy package ZIP file, which is stored next to the package and reused across runs.
+        Members are read directly from the memory mapped archive, so the central directory is parsed only
+        when the index is built. """
+    def __init__(self, location):
+        self.location = location
+        self.index_location = f'{location}.idx'
+        """ Key is the member name, value is the tuple (data offset, compressed size, compression method). """
+        self.members = {}
+        """ Key is the effective URL, value is the member name. None if URLs are not resolved yet. """
+        self.files = None
+        self.file = None
+        self.mm = None
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def get_state(self):
+        st = os.stat(self.location)
+        return [st.st_size, st.st_mtime_ns]
+
+    def load(self):
+        """ Loads the index from disk. Returns False, if there is no index or it is out of date. """
+        if not os.path.exists(self.index_location):
+            return False
+        try:
+            with open(self.index_location, 'r', encoding='utf-8') as f:
+                idx = json.load(f)
+        except Exception as ex:
+            print('Cannot read package index:', self.index_location, ex)
+            return False
+        if idx.get('version') != INDEX_VERSION or idx.get('state') != self.get_state():
+            return False
+        self.members = {name: tuple(m) for name, m in idx.get('members').items()}
+        self.files = idx.get('files')
+        return True
+
+    def save(self):
+        idx = {'version': INDEX_VERSION, 'state': self.get_state(), 'members': self.members, 'files': self.files}
+        fd, temp_location = tempfile.mkstemp(dir=os.path.dirname(self.index_location), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(idx, f)
+            os.replace(temp_location, self.index_location)
+        except Exception as ex:
+            print('Cannot save package index:', self.index_location, ex)
+            if os.path.exists(temp_location):
+                os.remove(temp_location)
+
+    def build(self, archive):
+        """ Indexes all file members of an open ZipFile. """
+        self.members = {}
+        self.files = None
+        mm = self.get_map()
+        for zi in archive.infolist():
+            if zi.is_dir():
+                continue
+            # Data starts after the local file header, which may have a different extra field than the central one
+            name_length, extra_length = struct.unpack('<HH', mm[zi.header_offset + 26:zi.header_offset + 30])
+            offset = zi.header_offset + 30 + name_length + extra_length
+            self.members[zi.filename] = (offset, zi.compress_size, zi.compress_type)
+
+    def get_map(self):
+        if self.mm is None:
+            self.file = open(self.location, 'rb')
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.mm
+
+    def read(self, name):
+        """ Returns the content of a member or None, if the member cannot be read from the map directly. """
+        m = self.members.get(name)
+        if m is None:
+            return None
+        offset, size, method = m
+        if method == zipfile.ZIP_STORED:
+            return self.get_map()[offset:offset + size]
+        if method == zipfile.ZIP_DEFLATED:
+            return zlib.decompress(self.get_map()[offset:offset + size], -15)
+        return None
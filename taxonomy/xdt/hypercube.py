@@ -4,6 +4,8 @@ class Hypercube:
         self.container_dr_set = container_dr_set
         self.primary_item = None
         self.target_role = arc.target_role
+        self.closed = arc.closed
+        self.context_element = arc.context_element
         self.dimensions = {}
 
     def has_signature(self, signature):
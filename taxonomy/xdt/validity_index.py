@@ -0,0 +1,87 @@
+class ValidityIndex:
+    """ Compiled dimensional relationship sets of a taxonomy for checking combinations of a primary item and
+        dimension members. Dimensions of all hypercubes of a DRS are flattened into a tuple of
+        (dimension QName, members, has default), where members is the dictionary of usable members indexed by QName
+        (None for typed dimensions) and has default tells whether the default member of the dimension is usable. """
+    def __init__(self, container_taxonomy):
+        self.taxonomy = container_taxonomy
+        """ Key is the DRS, value is the tuple of compiled dimensions. """
+        self.drs_dimensions = {}
+        """ Key is the DRS, value is the tuple of compiled hypercubes (closed, context element, dimension QNames,
+            dimensions). Dimensions are compiled as above. A missing context element is treated as scenario. """
+        self.drs_hypercubes = {}
+        self.compile()
+
+    def compile(self):
+        defaults = self.taxonomy.defaults
+        for drs in list(self.taxonomy.dr_sets.values()) + list(self.taxonomy.dr_sets_excluding.values()):
+            self.drs_dimensions[drs] = tuple(
+                (dim.concept.qname, dim.members,
+                 dim.members is not None and defaults.get(dim.concept.qname) in dim.members)
+                for hc in drs.hypercubes.values() for dim in hc.dimensions.values())
+            self.drs_hypercubes[drs] = tuple(
+                (hc.closed, hc.context_element, frozenset(hc.dimensions),
+                 tuple((dim.concept.qname, dim.members,
+                        dim.members is not None and defaults.get(dim.concept.qname) in dim.members)
+                       for dim in hc.dimensions.values()))
+                for hc in drs.hypercubes.values())
+
+    def get_drs(self, pi_qname):
+        """ Returns the set of DRS, where the primary item participates, or None. """
+        return self.taxonomy.idx_pi_drs.get(pi_qname, None)
+
+    def match_drs(self, drs, members):
+        """ Checks a DRS against a dictionary, where key is the dimension QName and value is the member QName
+            (None for an open dimension, which matches any member). Every DRS dimension must either be given or have
+            a default member and every given dimension must be matched by the DRS. """
+        pending = set(members)
+        for dim_qname, dim_members, has_default in self.drs_dimensions.get(drs, ()):
+            if dim_qname not in pending:
+                if has_default:
+                    continue
+                return False
+            mem = members[dim_qname]
+            if mem is None or dim_members is not None and mem in dim_members:
+                pending.discard(dim_qname)
+        return not pending
+
+    def is_valid(self, pi_qname, members):
+        """ Checks whether a primary item with given dimension members is valid in at least one DRS. """
+        drs_for_pi = self.get_drs(pi_qname)
+        return drs_for_pi is not None and any(self.match_drs(drs, members) for drs in drs_for_pi)
+
+    def match_context(self, drs, segment, scenario):
+        """ Checks whether all hypercubes of a DRS are satisfied by context dimensions. Segment and scenario are
+            dictionaries, where key is the dimension QName and value is the member QName (None for typed members).
+            Dimensions missing in the context are satisfied by their default member, if it belongs to the domain of
+            the dimension in the hypercube. Closed hypercubes do not allow other dimensions in the context element. """
+        for closed, context_element, hc_dimensions, dimensions in self.drs_hypercubes.get(drs, ()):
+            container = segment if context_element == 'segment' else scenario
+            for dim_qname, dim_members, has_default in dimensions:
+                if dim_qname not in container:
+                    if has_default:
+                        continue
+                    return False
+                mem = container[dim_qname]
+                if (mem is not None) if dim_members is None else (mem not in dim_members):
+                    return False  # Explicit member of a typed dimension or member not in the domain
+            if closed and any(d not in hc_dimensions for d in container):
+                return False
+        return True
+
+    def is_valid_context(self, pi_qname, segment, scenario):
+        """ Checks dimensional validity of a primary item in a context (see match_context). The default member of a
+            dimension must not be used for that dimension in a context explicitly. The primary item must satisfy at
+            least one including DRS, if there is any, and no excluding DRS. Primary items without DRS are valid in any
+            context. """
+        defaults = self.taxonomy.defaults
+        if any(mem is not None and defaults.get(dim) == mem
+               for container in (segment, scenario) for dim, mem in container.items()):
+            return False
+        drs_for_pi = self.get_drs(pi_qname)
+        if not drs_for_pi:
+            return True
+        including = [drs for drs in drs_for_pi if drs.drs_type == 'including']
+        if including and not any(self.match_context(drs, segment, scenario) for drs in including):
+            return False
+        return not any(self.match_context(drs, segment, scenario) for drs in drs_for_pi if drs.drs_type != 'including')
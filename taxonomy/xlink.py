@@ -73,8 +73,20 @@ class XLink(ebase.XmlElementBase):
         self.arcs_to = {}
         """ All labelled resources indexed by global identifier """
         self.resources = {}
+        """ Arcs, where the related objects could not be identified during compilation """
+        self.unresolved = []
+        """ Labels (xlink:label) of resources skipped according to the load profile """
+        self.skipped = set()
+        self.profile = None if self.linkbase.pool is None else self.linkbase.pool.load_profile
+        if self.profile is not None:
+            self.profile.filter_parsers(parsers, self.l_skip)
+            for tag in [f'{{{const.NS_LINK}}}label', f'{{{const.NS_GEN_LABEL}}}label']:
+                if parsers.get(tag) == self.l_resource:
+                    parsers[tag] = self.l_label
         super(XLink, self).__init__(e, parsers)
         self.role = e.attrib.get(f'{{{const.NS_XLINK}}}role')
+        if self.skipped:
+            self.prune_arcs()
 
     def l_xlink(self, e):
         self.l_children(e)
@@ -88,6 +100,31 @@ class XLink(ebase.XmlElementBase):
     def l_resource(self, e):
         resource.Resource(e, self)
 
+    def l_label(self, e):
+        if self.profile.accepts_label(e):
+            resource.Resource(e, self)
+        else:
+            self.l_skip(e)
+
+    def l_skip(self, e):
+        xlabel = e.attrib.get(f'{{{const.NS_XLINK}}}label')
+        if xlabel is not None:
+            self.skipped.add(xlabel)
+
+    def prune_arcs(self):
+        """ Removes arcs pointing to skipped resources only. """
+        dead = set([xl for xl in self.skipped if xl not in self.resources and xl not in self.locators])
+        if not dead:
+            return
+        for key in [key for key, arcs in self.arcs_to.items() if arcs[0].xl_to in dead]:
+            del self.arcs_to[key]
+        for key, arcs in list(self.arcs_from.items()):
+            kept = [a for a in arcs if a.xl_to not in dead]
+            if not kept:
+                del self.arcs_from[key]
+            elif len(kept) < len(arcs):
+                self.arcs_from[key] = kept
+
     def l_reference(self, e):
         ref = resource.Resource(e, self)
         ref.origin = e  # Tricky assignment of origin to save memory
@@ -137,19 +174,32 @@ class XLink(ebase.XmlElementBase):
         filter.Filter(e, self)
 
     def compile(self):
-        for arc_list in [a for a in self.arcs_from.values()]:
-            for a in arc_list:
-                from_objects = self.identify_objects(a.xl_from)
-                if from_objects is None:
-                    # print('Cannot resolve arc.from: ', a.xl_from, 'in', self.linkbase.location)
-                    continue
-                to_objects = self.identify_objects(a.xl_to)
-                if to_objects is None:
-                    # print('Cannot resolve arc.to: ', a.xl_to, 'in', self.linkbase.location)
-                    continue
-                for obj_from in from_objects:
-                    for obj_to in to_objects:
-                        self.try_connect_objects(a, obj_from, obj_to)
+        self.unresolved = []
+        self.connect_arcs([a for arc_list in self.arcs_from.values() for a in arc_list])
+
+    def resolve(self):
+        """ Connects arcs, which could not be resolved before, because related objects were not loaded yet. """
+        if not self.unresolved:
+            return
+        arcs = self.unresolved
+        self.unresolved = []
+        self.connect_arcs(arcs)
+
+    def connect_arcs(self, arcs):
+        for a in arcs:
+            from_objects = self.identify_objects(a.xl_from)
+            if from_objects is None:
+                # print('Cannot resolve arc.from: ', a.xl_from, 'in', self.linkbase.location)
+                self.unresolved.append(a)
+                continue
+            to_objects = self.identify_objects(a.xl_to)
+            if to_objects is None:
+                # print('Cannot resolve arc.to: ', a.xl_to, 'in', self.linkbase.location)
+                self.unresolved.append(a)
+                continue
+            for obj_from in from_objects:
+                for obj_to in to_objects:
+                    self.try_connect_objects(a, obj_from, obj_to)
 
     def try_connect_objects(self, a, obj_from, obj_to):
         key = f'{self.get_obj_type(obj_from)}=>{self.get_obj_type(obj_to)}'
@@ -160,11 +210,15 @@ class XLink(ebase.XmlElementBase):
         method(a, obj_from, obj_to)
 
     def conn_cr(self, a, c, res):
+        if res.name == 'label':
+            self.invalidate_base_sets(set(c.chain_dn) | set(c.chain_up))  # Labels of base set nodes may change
         r_list = c.resources.get(res.name, None)
         if r_list is None:
             r_list = {}
             c.resources[res.name] = r_list
         r_list.setdefault(self.get_resource_key(res), []).append(res)  # Multiple resources of the same type may be related
+        if res.name == 'label':
+            c.reset_labels()
 
     def conn_cc(self, a, c_from, c_to):
         key = f'{a.arcrole}|{a.xl_from}'
@@ -176,9 +230,19 @@ class XLink(ebase.XmlElementBase):
             self.linkbase.pool.current_taxonomy.base_sets[bs_key] = bs
         if is_root and c_from not in bs.roots:
             bs.roots.append(c_from)
+        self.invalidate_base_sets((bs_key,))
         # Populate concept child and parent sets
-        c_from.chain_dn.setdefault(bs_key, []).append(data_wrappers.BaseSetNode(c_to, 0, a, False, c_to.get_label()))
-        c_to.chain_up.setdefault(bs_key, []).append(data_wrappers.BaseSetNode(c_from, 0, a, False, c_from.get_label()))
+        # Labels are resolved on access, so that arcs are connected without looking up label resources
+        c_from.chain_dn.setdefault(bs_key, []).append(data_wrappers.BaseSetNode(c_to, 0, a, False, None))
+        c_to.chain_up.setdefault(bs_key, []).append(data_wrappers.BaseSetNode(c_from, 0, a, False, None))
+
+    def invalidate_base_sets(self, keys):
+        """ Drops compiled trees of base sets with given keys in the current taxonomy. """
+        base_sets = self.linkbase.pool.current_taxonomy.base_sets
+        for key in keys:
+            bs = base_sets.get(key)
+            if bs is not None:
+                bs.invalidate()
 
     def conn_rr(self, a, r_from, r_to):
         if not isinstance(r_from, assertion_set.AssertionSet):
@@ -187,6 +251,8 @@ class XLink(ebase.XmlElementBase):
         if isinstance(r_to, breakdown.Breakdown):
             r_to.axis = a.axis
         r_from.nested.setdefault(r_to.name, {}).setdefault(self.get_resource_key(r_to), []).append(r_to)
+        if r_to.name == 'label':
+            r_from.reset_labels()
 
     def conn_rstr(self, a, ass, sev):
         if isinstance(ass, assertion.Assertion):
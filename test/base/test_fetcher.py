@@ -0,0 +1,129 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+import time
+import threading
+import urllib.error
+import http.client
+import http.server
+import pytest
+from xbrl.base import resolver
+from xbrl.base.fetcher import Fetcher
+
+
+class Handler(http.server.SimpleHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    """ Number of requests being served at the moment and its maximum """
+    active = 0
+    max_active = 0
+    """ Seconds to wait before a response is sent """
+    delay = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        if self.path == '/broken.xsd':
+            # The connection is closed before the announced content is sent
+            self.send_response(200)
+            self.send_header('Content-Length', '100000')
+            self.end_headers()
+            self.wfile.write(b'<schema')
+            self.close_connection = True
+            return
+        with Handler.lock:
+            Handler.active += 1
+            Handler.max_active = max(Handler.max_active, Handler.active)
+        try:
+            time.sleep(Handler.delay)
+            super().do_GET()
+        finally:
+            with Handler.lock:
+                Handler.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path):
+    root = str(tmp_path / 'www')
+    os.mkdir(root)
+    with open(os.path.join(root, 'package.zip'), 'wb') as f:
+        f.write(bytes(range(256)) * 1000)
+    for i in range(5):
+        with open(os.path.join(root, f'doc{i}.xsd'), 'wb') as f:
+            f.write(f'<schema id="{i}"/>'.encode())
+    httpd = http.server.ThreadingHTTPServer(
+        ('127.0.0.1', 0), lambda *args, **kwargs: Handler(*args, directory=root, **kwargs))
+    Handler.active, Handler.max_active, Handler.delay = 0, 0, 0
+    t = threading.Thread(target=httpd.serve_forever, daemon=True)
+    t.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}', root
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_fetch_binary(server, tmp_path):
+    url, root = server
+    target = str(tmp_path / 'package.zip')
+    Fetcher().fetch(f'{url}/package.zip', target)
+    with open(target, 'rb') as f:
+        assert f.read() == bytes(range(256)) * 1000
+
+
+def test_fetch_many_reuses_connection(server, tmp_path):
+    url, root = server
+    folder = str(tmp_path)
+    fetcher = Fetcher(max_workers=1)
+    errors = fetcher.fetch_many([(f'{url}/doc{i}.xsd', os.path.join(folder, f'doc{i}.xsd')) for i in range(5)])
+    assert errors == {}
+    assert fetcher.connections_opened == 1
+    for i in range(5):
+        with open(os.path.join(folder, f'doc{i}.xsd'), 'rb') as f:
+            assert f.read() == f'<schema id="{i}"/>'.encode()
+
+
+def test_fetch_missing(server, tmp_path):
+    url, root = server
+    target = str(tmp_path / 'missing.xsd')
+    with pytest.raises(urllib.error.HTTPError):
+        Fetcher().fetch(f'{url}/missing.xsd', target)
+    assert not os.path.exists(target)
+
+
+def test_host_limit(server, tmp_path):
+    url, root = server
+    Handler.delay = 0.05
+    fetcher = Fetcher(max_workers=5, max_connections_per_host=2)
+    errors = fetcher.fetch_many([(f'{url}/doc{i}.xsd', str(tmp_path / f'doc{i}.xsd')) for i in range(5)])
+    assert errors == {}
+    assert Handler.max_active <= 2
+    assert fetcher.connections_opened <= 2
+    assert all(os.path.exists(tmp_path / f'doc{i}.xsd') for i in range(5))
+
+
+def test_broken_download(server, tmp_path):
+    url, root = server
+    target = str(tmp_path / 'broken.xsd')
+    with pytest.raises(http.client.IncompleteRead):
+        Fetcher().fetch(f'{url}/broken.xsd', target)
+    assert os.listdir(tmp_path) == ['www']  # Neither the target nor the temporary file
+
+
+def test_prefetch(server, tmp_path):
+    url, root = server
+    cache_folder = tmp_path / 'cache'
+    cache_folder.mkdir()
+    res = resolver.Resolver(cache_folder=str(cache_folder))
+    locations = [f'{url}/doc{i}.xsd' for i in range(5)]
+    errors = res.prefetch(locations + [f'{url}/broken.xsd', f'{url}/missing.xsd'])
+    assert sorted(errors) == [f'{url}/broken.xsd', f'{url}/missing.xsd']
+    for i, location in enumerate(locations):
+        cached_file = res.get_cached_location(location)
+        with open(cached_file, 'rb') as f:
+            assert f.read() == f'<schema id="{i}"/>'.encode()
+    folder = os.path.dirname(res.get_cached_location(locations[0]))
+    assert sorted(os.listdir(folder)) == [f'doc{i}.xsd' for i in range(5)]
+    # Cached locations are not downloaded again
+    opened = res.fetcher.connections_opened
+    assert res.prefetch(locations) == {}
+    assert res.fetcher.connections_opened == opened
@@ -0,0 +1,52 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+from xbrl.base import pool
+
+DTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'dts')
+ENTRY_POINT = os.path.normpath(os.path.join(DTS, 't.xsd'))
+SHARED = os.path.normpath(os.path.join(DTS, 'd.xsd'))
+
+
+def test_shared_documents(tmp_path):
+    dp = pool.Pool(cache_folder=str(tmp_path))
+    tax = dp.add_taxonomy([ENTRY_POINT])
+    shared = dp.add_taxonomy([SHARED])
+    assert dp.parses_avoided == 1
+    assert dp.documents[SHARED] is not None
+    # Objects are built per taxonomy from the shared parsed document
+    assert shared.schemas[SHARED] is not tax.schemas[SHARED]
+    assert shared.concepts_by_qname['d:Europe'] is not tax.concepts_by_qname['d:Europe']
+    assert sorted(shared.concepts_by_qname) == ['d:AllRegions', 'd:Asia', 'd:Europe', 'd:Japan', 'd:RegionAxis']
+
+    dp.remove_taxonomy(ENTRY_POINT)
+    assert ENTRY_POINT not in dp.schemas and ENTRY_POINT not in dp.documents
+    assert dp.schemas[SHARED] is shared.schemas[SHARED]
+    assert not dp.linkbases
+    assert sorted(dp.documents) == [SHARED]
+    assert sorted(shared.concepts_by_qname) == ['d:AllRegions', 'd:Asia', 'd:Europe', 'd:Japan', 'd:RegionAxis']
+
+    tax = dp.add_taxonomy([ENTRY_POINT])
+    assert dp.parses_avoided == 2
+    assert tax.concepts_by_qname['t:Assets'].get_label() == 'Assets'
+    assert tax.schemas[SHARED] is not shared.schemas[SHARED]
+
+    dp.remove_taxonomy(SHARED)
+    assert dp.schemas[SHARED] is tax.schemas[SHARED]
+    assert len(dp.linkbases) == 4
+    assert SHARED in dp.documents
+    assert 'd:Europe' in tax.concepts_by_qname
+    assert tax.concepts_by_qname['d:Europe'].get_label() == 'Europe'
+
+
+def test_isolated_taxonomies(tmp_path):
+    dp = pool.Pool(cache_folder=str(tmp_path))
+    tax = dp.add_taxonomy([ENTRY_POINT])
+    ext = dp.add_taxonomy([os.path.normpath(os.path.join(DTS, 'ext.xsd'))])
+    assert dp.parses_avoided > 0
+    # Relationships and labels of the extension are connected to its own concepts only
+    key = 'presentationArc|http://www.xbrl.org/2003/arcrole/parent-child|http://example.com/role/r1'
+    assert [n.Concept.qname for n in tax.concepts_by_qname['t:Cash'].chain_dn.get(key, [])] == []
+    assert [n.Concept.qname for n in ext.concepts_by_qname['t:Cash'].chain_dn.get(key, [])] == ['t:Name']
+    assert tax.concepts_by_qname['t:Other'].get_label() == 'Sonstige'
+    assert ext.concepts_by_qname['t:Other'].get_label() == 'Other assets'
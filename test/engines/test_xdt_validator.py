@@ -0,0 +1,40 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+from xbrl.base import pool
+from xbrl.engines import xdt_validator
+
+DTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'dts')
+INSTANCE = os.path.normpath(os.path.join(DTS, 'dim.xbrl'))
+
+
+def test_validate(tmp_path):
+    dp = pool.Pool(cache_folder=str(tmp_path))
+    xid = dp.add_instance_location(INSTANCE, attach_taxonomy=True)
+    validator = xdt_validator.XdtValidator(xid.taxonomy)
+    assert validator.validate(xid) == {
+        # Closed hypercube on scenario, Japan excluded by a notAll hypercube
+        'c1': True,  # Default member
+        'c2': True,
+        'c3': False,  # Excluded
+        'c4': False,  # Default member used explicitly
+        'c5': False,  # Member not in the domain
+        'c6': False,  # Closed hypercube with another dimension
+        # Open hypercube on scenario, dimension without default, domain member not usable
+        's1': False,
+        's2': True,
+        's3': True,
+        's4': False,
+        # Closed hypercube on segment
+        'g1': True,
+        'g2': True,  # Scenario is not constrained, the segment dimension is defaulted
+        'g3': False,
+        # Closed hypercube without context element - scenario is used
+        'p1': True,
+        'p2': True,
+        'p3': False,
+        # No dimensional relationship set
+        'n1': True}
+    assert sorted(validator.get_invalid_facts(xid)) == ['c3', 'c4', 'c5', 'c6', 'g3', 'p3', 's1', 's4']
+    # Facts with the same concept and dimensions are validated once
+    assert len(validator.results) == 17
@@ -0,0 +1,45 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+from lxml import etree as lxml
+from xbrl.base import pool, const
+from xbrl.instance import fact
+
+DTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'dts')
+INSTANCE = os.path.normpath(os.path.join(DTS, 'i.xbrl'))
+NS_XSI = 'http://www.w3.org/2001/XMLSchema-instance'
+
+
+def test_extra_attributes():
+    e = lxml.XML(f'<t:A xmlns:t="http://example.com/t" xmlns:xsi="{NS_XSI}" xmlns:o="http://example.com/o" '
+                 f'contextRef="c1" xml:lang="de" xsi:nil="true" o:x="1" plain="2"/>')
+    fct = fact.Fact(1, e)
+    assert fct.lang == 'de'
+    assert fct.attributes == (('xml:lang', 'de'), ('xsi:nil', 'true'), ('o:x', '1'), ('plain', '2'))
+    out = lxml.XML(f'<r xmlns:t="http://example.com/t" xmlns:xsi="{NS_XSI}" xmlns:o="http://example.com/o">'
+                   f'{fct.serialize()}</r>')[0]
+    assert dict(out.attrib) == {
+        'contextRef': 'c1', f'{{{const.NS_XML}}}lang': 'de', f'{{{NS_XSI}}}nil': 'true',
+        '{http://example.com/o}x': '1', 'plain': '2'}
+
+
+def test_undeclared_prefix(capsys):
+    fct = fact.Fact.create(1, 't:A', 'http://example.com/t', 'c1', value='v')
+    fct.attributes = (('{http://example.com/o}x', '1'),)
+    assert fct.serialize({'http://example.com/o': 'o'}) == '<t:A contextRef="c1" o:x="1">v</t:A>'
+    assert fct.serialize() == '<t:A contextRef="c1">v</t:A>'  # Skipped rather than bound to an invented prefix
+    assert capsys.readouterr().out == ''
+
+
+def test_round_trip(tmp_path):
+    dp = pool.Pool(cache_folder=str(tmp_path))
+    xid = dp.add_instance_location(INSTANCE, attach_taxonomy=False)
+    root = lxml.XML(xid.xbrl.to_xml().encode('utf-8'))
+    names = root.findall('{http://example.com/t}Name')
+    assert len(names) == 1
+    assert names[0].attrib.get(f'{{{const.NS_XML}}}lang') == 'en'
+    assert names[0].text == 'ACME & Co'
+    assert 'ns1:' not in xid.xbrl.to_xml()
+    facts = [e for e in root if e.attrib.get('contextRef')]
+    assert [(lxml.QName(e).localname, e.attrib.get('contextRef'), e.text) for e in facts] == \
+           [(f.name, f.context_ref, f.value) for f in xid.xbrl.facts.values()]
@@ -0,0 +1,66 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+import math
+import decimal
+from xbrl.base import pool
+
+DTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'dts')
+INSTANCE = os.path.normpath(os.path.join(DTS, 'i.xbrl'))
+ASPECTS = ['concept', 'entity', 'period_start', 'period_end', 'unit', 'decimals', 'd:RegionAxis']
+
+
+def load(tmp_path):
+    dp = pool.Pool(cache_folder=str(tmp_path))
+    return dp.add_instance_location(INSTANCE, attach_taxonomy=False).xbrl
+
+
+def get_row(table, i):
+    return {name: table.dictionaries[name][table.columns[name][i]] for name in ASPECTS}
+
+
+def test_encoding(tmp_path):
+    model = load(tmp_path)
+    table = model.to_columns()
+    assert table.size == 5
+    assert table.ids == [f.id for f in model.facts.values()]
+    assert sorted(table.dictionaries) == sorted(ASPECTS)
+    assert all(table.dictionaries[name][0] is None for name in ASPECTS)  # Code 0 stands for None
+    assert table.dictionaries['concept'] == [None, 't:Assets', 't:Cash', 't:Other', 't:Name']
+    assert list(table.columns['concept']) == [1, 1, 2, 3, 4]
+    assert table.dictionaries['unit'] == [None, 'iso4217:EUR', 'iso4217:EUR/xbrli:shares']
+    assert list(table.columns['unit']) == [1, 1, 1, 2, 0]
+    # Dimension columns
+    assert table.dictionaries['d:RegionAxis'] == [None, 'd:Europe', 'd:Japan']
+    assert list(table.columns['d:RegionAxis']) == [0, 1, 2, 1, 0]
+    assert table.decode('d:RegionAxis') == [None, 'd:Europe', 'd:Japan', 'd:Europe', None]
+    assert table.get_code('d:RegionAxis', 'd:Japan') == 2
+    assert table.get_code('d:RegionAxis', None) == 0
+    assert table.get_code('d:RegionAxis', 'd:Asia') is None
+    assert table.get_code('decimals', '2') == 2
+
+
+def test_values(tmp_path):
+    model = load(tmp_path)
+    values = list(model.to_columns().columns['value'])
+    assert values[:4] == [1000.0, 400.0, 50.0, 1.5]
+    assert math.isnan(values[4])  # Non-numeric
+    assert list(model.to_columns('decimal').columns['value']) == [
+        decimal.Decimal('1000'), decimal.Decimal('400'), decimal.Decimal('50'), decimal.Decimal('1.5'), None]
+
+
+def test_round_trip(tmp_path):
+    model = load(tmp_path)
+    table = model.to_columns('decimal')
+    for i, fct in enumerate(model.facts.values()):
+        ctx = fct.context
+        assert get_row(table, i) == {
+            'concept': fct.qname,
+            'entity': f'{ctx.entity_scheme}:{ctx.entity_identifier}',
+            'period_start': ctx.period_start,
+            'period_end': ctx.period_instant if ctx.period_instant else ctx.period_end,
+            'unit': None if fct.unit is None else fct.unit.get_aspect_value(),
+            'decimals': fct.decimals,
+            'd:RegionAxis': ctx.get_member('d:RegionAxis')}
+        value = table.columns['value'][i]
+        assert (None if value is None else str(value)) == (fct.value if fct.unit_ref else None)
@@ -0,0 +1,57 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+from lxml import etree as lxml
+from xbrl.base import pool
+
+DTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'dts')
+INSTANCE = os.path.normpath(os.path.join(DTS, 'i.xbrl'))
+
+""" Same ids as in i.xbrl, but with other content - context c1 is for another entity, unit EUR is USD. """
+CLASHING = '''<?xml version="1.0" encoding="utf-8"?>
+<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:iso4217="http://www.xbrl.org/2003/iso4217"
+  xmlns:t="http://example.com/t">
+ <xbrli:context id="c1"><xbrli:entity><xbrli:identifier scheme="http://lei">E9</xbrli:identifier></xbrli:entity><xbrli:period><xbrli:instant>2020-12-31</xbrli:instant></xbrli:period></xbrli:context>
+ <xbrli:context id="c9"><xbrli:entity><xbrli:identifier scheme="http://lei">E2</xbrli:identifier></xbrli:entity><xbrli:period><xbrli:startDate>2020-01-01</xbrli:startDate><xbrli:endDate>2020-12-31</xbrli:endDate></xbrli:period></xbrli:context>
+ <xbrli:unit id="EUR"><xbrli:measure>iso4217:USD</xbrli:measure></xbrli:unit>
+ <t:Assets id="f1" contextRef="c1" unitRef="EUR" decimals="0">7</t:Assets>
+ <t:Name contextRef="c9">ACME &amp; Co</t:Name>
+ <t:Name contextRef="c9">Other name</t:Name>
+</xbrli:xbrl>'''
+
+
+def describe(model):
+    return ([(c.id, c.get_signature()) for c in model.contexts.values()],
+            [(u.id, u.get_aspect_value(), u.origin.get('id')) for u in model.units.values()],
+            [(f.id, f.explicit_id, f.qname, f.context_ref, f.context, f.unit_ref, f.unit, f.value)
+             for f in model.facts.values()])
+
+
+def test_merge_many(tmp_path):
+    location = str(tmp_path / 'clashing.xbrl')
+    with open(location, 'w', encoding='utf-8') as f:
+        f.write(CLASHING)
+    dp = pool.Pool(cache_folder=str(tmp_path))
+    target = dp.add_instance_location(INSTANCE, key='target', attach_taxonomy=False).xbrl
+    first = dp.add_instance_location(INSTANCE, key='first', attach_taxonomy=False).xbrl
+    second = dp.add_instance_location(location, attach_taxonomy=False).xbrl
+    sources = (describe(first), describe(second))
+
+    target.merge_many([first, second])
+    assert (describe(first), describe(second)) == sources
+    # Nothing is taken over from the identical document
+    assert len(target.contexts) == 5 and len(target.units) == 3 and len(target.facts) == 7
+    assert not set(map(id, target.facts.values())) & set(map(id, list(first.facts.values()) + list(second.facts.values())))
+
+    ctx = target.contexts[[cid for cid, c in target.contexts.items() if c.entity_identifier == 'E9'][0]]
+    assert ctx.id != 'c1' and target.contexts['c1'].entity_identifier == 'E1'
+    usd = [u for u in target.units.values() if u.get_aspect_value() == 'iso4217:USD'][0]
+    assert usd.id != 'EUR' and target.units['EUR'].get_aspect_value() == 'iso4217:EUR'
+    merged = [f for f in target.facts.values() if f.value in ('7', 'Other name')]
+    assert [(f.qname, f.context_ref, f.unit_ref) for f in merged] == [
+        ('t:Assets', ctx.id, usd.id), ('t:Name', 'c3', None)]
+    assert merged[0].id not in ('f1', 1) and merged[0].context is ctx and merged[0].unit is usd
+
+    root = lxml.XML(target.to_xml().encode('utf-8'))
+    assert len(root.findall('{http://www.xbrl.org/2003/instance}unit')) == 3
+    assert len(set(e.get('id') for e in root if e.get('id'))) == len([e for e in root if e.get('id')])
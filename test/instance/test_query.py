@@ -0,0 +1,56 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+from xbrl.base import pool
+
+DTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'dts')
+INSTANCE = os.path.normpath(os.path.join(DTS, 'i.xbrl'))
+DIM_INSTANCE = os.path.normpath(os.path.join(DTS, 'dim.xbrl'))
+R, P = 'd:RegionAxis', 'x:ProductAxis'
+
+
+def load(tmp_path, location):
+    dp = pool.Pool(cache_folder=str(tmp_path))
+    return dp.add_instance_location(location, attach_taxonomy=False).xbrl
+
+
+def ids(facts):
+    return [f.id for f in facts]
+
+
+def test_query(tmp_path):
+    model = load(tmp_path, INSTANCE)
+    assert ids(model.query()) == ['f1', 2, 3, 4, 5]
+    assert ids(model.query(concept='t:Assets')) == ['f1', 2]
+    assert ids(model.query(concept=['t:Cash', 't:Other'])) == [3, 4]
+    assert ids(model.query(entity='E2')) == [5]
+    assert ids(model.query(period='2020-01-01/2020-12-31')) == [5]
+    assert ids(model.query(period='2020-12-31', unit='iso4217:EUR')) == ['f1', 2, 3]
+    assert ids(model.query(unit='iso4217:EUR/xbrli:shares')) == [4]
+    assert ids(model.query(concept='t:Assets', dims={R: 'd:Europe'})) == [2]
+    assert ids(model.query(dims={R: ['d:Europe', 'd:Japan']})) == [2, 3, 4]
+    assert ids(model.query(concept='t:Assets', dims={R: None})) == ['f1']
+    assert ids(model.query(dims={'d:Other': None})) == ['f1', 2, 3, 4, 5]
+    assert ids(model.query(concept='t:Missing')) == []
+
+
+def test_get_posting(tmp_path):
+    model = load(tmp_path, DIM_INSTANCE)
+    rows = {f.id: row for row, f in enumerate(model.fact_rows)}
+    with_region = {rows[fid] for fid in ('c2', 'c3', 'c4', 'c5', 'c6', 's3', 'g1', 'g2', 'p1', 'n1')}
+    assert set(model.dimension_postings[R]) == with_region
+    assert model.get_posting(R, None) == set(range(len(model.fact_rows))) - with_region
+    assert model.get_posting(R, 'd:Europe') == {rows[fid] for fid in ('c2', 'c6', 's3', 'g1', 'g2', 'p1')}
+    assert model.get_posting(P, ['x:Cars', 'x:Products']) == \
+           {rows[fid] for fid in ('c6', 's2', 's3', 's4', 'g3', 'p2', 'p3')}
+    # Segment and scenario dimensions are queried alike
+    assert ids(model.query(concept='x:Staff', dims={R: 'd:Europe'})) == ['g1', 'g2']
+    assert ids(model.query(dims={R: None, P: None})) == ['c1', 's1']
+
+
+def test_index_rebuilt_after_merge(tmp_path):
+    model = load(tmp_path, INSTANCE)
+    assert len(model.query(concept='x:Costs')) == 0
+    model.merge_many([load(tmp_path, DIM_INSTANCE)])
+    assert ids(model.query(concept='x:Costs', dims={R: None})) == ['c1']
+    assert len(model.query(dims={R: None})) == len(model.facts) - len(model.dimension_postings[R])
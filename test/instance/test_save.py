@@ -0,0 +1,38 @@
+import sys
+sys.path.insert(0, r'../../../')
+import io
+import os
+from lxml import etree as lxml
+from xbrl.base import pool, const
+from xbrl.instance import instance
+
+DTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'dts')
+INSTANCE = os.path.normpath(os.path.join(DTS, 'i.xbrl'))
+
+
+def check(data):
+    root = lxml.XML(data)
+    assert root.tag == f'{{{const.NS_XBRLI}}}xbrl'
+    name = root.find('{http://example.com/t}Name')
+    assert name.attrib.get(f'{{{const.NS_XML}}}lang') == 'en'
+    assert name.text == 'ACME & Co'
+    assert len(root.findall(f'{{{const.NS_XBRLI}}}context')) == 4
+    assert len(root.findall(f'{{{const.NS_XBRLI}}}unit')) == 2
+    assert len(root.findall('{http://example.com/t}Assets')) == 2
+    assert len(root.findall(f'{{{const.NS_LINK}}}footnoteLink')) == 1
+
+
+def test_save(tmp_path):
+    dp = pool.Pool(cache_folder=str(tmp_path))
+    for keep_origin in (False, True):
+        xid = instance.Instance(location=INSTANCE, container_pool=dp, keep_origin=keep_origin)
+        model = xid.xbrl
+        for buffer_size in (16, 65536):  # Flushed many times or once
+            buffer = io.BytesIO()
+            model.save(buffer, buffer_size)
+            check(buffer.getvalue())
+            assert buffer.getvalue() == model.to_xml().encode('utf-8')
+        location = str(tmp_path / f'saved-{keep_origin}.xbrl')
+        model.save(location)
+        with open(location, 'rb') as f:
+            check(f.read())
@@ -0,0 +1,55 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+from xbrl.base import pool, data_wrappers
+
+DTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'dts')
+INSTANCE = os.path.normpath(os.path.join(DTS, 'i.xbrl'))
+
+TUPLES = '''<?xml version="1.0" encoding="utf-8"?>
+<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance" xmlns:t="http://example.com/t">
+ <xbrli:context id="c1"><xbrli:entity><xbrli:identifier scheme="http://lei">E1</xbrli:identifier></xbrli:entity><xbrli:period><xbrli:instant>2020-12-31</xbrli:instant></xbrli:period></xbrli:context>
+ <t:Name contextRef="c1">A</t:Name>
+ <t:Tuple id="tp"><t:Name contextRef="c1">B</t:Name><t:Name contextRef="c1">C</t:Name></t:Tuple>
+ <t:Tuple><t:Name id="n" contextRef="c1">D</t:Name></t:Tuple>
+</xbrli:xbrl>'''
+
+
+def stream(dp, location):
+    records = list(dp.stream_instance(location))
+    return ([r for r in records if isinstance(r, data_wrappers.StreamContext)],
+            [r for r in records if isinstance(r, data_wrappers.StreamUnit)],
+            [r for r in records if isinstance(r, data_wrappers.StreamFact)])
+
+
+def test_stream_matches_model(tmp_path):
+    dp = pool.Pool(cache_folder=str(tmp_path))
+    contexts, units, facts = stream(dp, INSTANCE)
+    model = dp.add_instance_location(INSTANCE, attach_taxonomy=False).xbrl
+
+    assert [(c.Id, c.EntityScheme, c.EntityIdentifier, c.PeriodInstant, c.PeriodStart, c.PeriodEnd, dict(c.Dimensions))
+            for c in contexts] == \
+           [(c.id, c.entity_scheme, c.entity_identifier, c.period_instant, c.period_start, c.period_end,
+             {d: c.get_member(d) for d in c.descriptors}) for c in model.contexts.values()]
+    assert [(u.Id, u.Measure) for u in units] == [(u.id, u.get_aspect_value()) for u in model.units.values()]
+    assert [(f.Concept, f.ContextRef, f.UnitRef, f.Decimals, f.Precision, f.Value) for f in facts] == \
+           [(f.qname, f.context_ref, f.unit_ref, f.decimals, f.precision, f.value) for f in model.facts.values()]
+    assert [f.Id for f in facts] == ['f1', 'f2', 'f3', 'f4', 'f5']
+    assert all(f.Parent is None for f in facts)
+
+
+def test_stream_fact_ids(tmp_path):
+    location = str(tmp_path / 'tuples.xbrl')
+    with open(location, 'w', encoding='utf-8') as f:
+        f.write(TUPLES)
+    dp = pool.Pool(cache_folder=str(tmp_path))
+    contexts, units, facts = stream(dp, location)
+    assert [(f.Id, f.Concept, f.Value, f.Parent) for f in facts] == [
+        ('f1', 't:Name', 'A', None),
+        ('tp', 't:Tuple', None, None),
+        ('f3', 't:Name', 'B', 'tp'),
+        ('f4', 't:Name', 'C', 'tp'),
+        ('f5', 't:Tuple', None, None),
+        ('n', 't:Name', 'D', 'f5')]
+    assert all(isinstance(f.Id, str) for f in facts)
+    assert len(set(f.Id for f in facts)) == len(facts)
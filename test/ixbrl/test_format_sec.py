@@ -7,3 +7,36 @@ def test_numwordsen():
     formatter = Formatter()
     formatted = formatter.apply_format('one', 'numwordsen')
     assert formatted == 1
+
+
+def test_apply_format_many():
+    formatter = Formatter()
+    formatted = formatter.apply_format_many(['1,234,567.5', '-', '1,234,567.5'], 'ixt:numdotdecimal')
+    assert formatted == [1234567.5, None, 1234567.5]
+
+
+def test_numdotdecimal():
+    formatter = Formatter()
+    assert formatter.c_numdotdecimal('1 234.5') == (1234.5, None)
+    assert formatter.c_numdotdecimal('1,234.5,6')[0] is None  # Comma in the fraction part
+    assert formatter.c_numdotdecimal('1,23.5')[0] is None
+
+
+def test_datemonthdayyearen():
+    formatter = Formatter()
+    assert formatter.apply_format('January 5, 2020 ', 'ixt:datemonthdayyearen') == '2020-01-05'
+    assert formatter.apply_format('DEC 31, 2020 ', 'ixt:datemonthdayyearen') == '2020-12-31'
+    assert formatter.apply_format('Feb 30, 2020 ', 'ixt:datemonthdayyearen') is None
+
+
+def test_override():
+    class NumberFormatter(Formatter):
+        dct_numbers = dict(Formatter.dct_numbers, eins=1)
+
+        def tr5_numdotdecimal(self, v):
+            return f'{v}!', None
+
+    formatter = NumberFormatter()
+    assert formatter.apply_format('1,234.5', 'ixt:num-dot-decimal') == '1,234.5!'
+    assert formatter.apply_format('eins', 'ixt-sec:numwordsen') == 1
+    assert Formatter().apply_format('1,234.5', 'ixt:num-dot-decimal') != '1,234.5!'
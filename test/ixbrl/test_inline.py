@@ -0,0 +1,69 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+from lxml import etree as lxml
+from xbrl.base import pool, const
+from xbrl.instance import instance
+
+DTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'dts')
+INLINE = os.path.normpath(os.path.join(DTS, 'inline.xhtml'))
+
+BASES = '''<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:ix="http://www.xbrl.org/2013/inlineXBRL"
+ xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink">
+<head><title>Bases</title></head><body xml:base="http://example.com/a/b/"><div style="display:none"><ix:header>
+<ix:references xml:base="../c/">
+ <link:schemaRef xlink:type="simple" xlink:href="t.xsd"/>
+ <link:linkbaseRef xml:base="lb/" xlink:type="simple" xlink:href="../l1.xml"/>
+ <link:linkbaseRef xml:base="/root/" xlink:type="simple" xlink:href="l2.xml"/>
+ <link:linkbaseRef xml:base="http://other.com/x/" xlink:type="simple" xlink:href="l3.xml"/>
+ <link:linkbaseRef xml:base="lb/" xlink:type="simple" xlink:href="http://abs.com/l4.xml"/>
+</ix:references></ix:header></div></body></html>'''
+
+
+def test_extracted_facts():
+    model = instance.Instance(INLINE).xbrl
+    assert sorted(model.schema_refs) == ['http://example.com/base/t.xsd']
+    assert sorted(model.linkbase_refs) == ['http://example.com/base/lb/t-lab.xml']
+    assert sorted(model.contexts) == ['c1', 'c3']
+    assert sorted(model.units) == ['EUR']
+    assert [(f.qname, f.context_ref, f.unit_ref, f.decimals, f.value) for f in model.facts.values()] == [
+        ('t:Assets', 'c1', 'EUR', '-3', '1234500'),  # Format and scale
+        ('t:Other', 'c1', 'EUR', '0', '-1250'),  # Sign
+        ('t:Cash', 'c1', 'EUR', '0', '15'),  # Nested in t:Note
+        ('t:Name', 'c3', None, None, 'Hello bold world & co more'),  # Exclude and continuation chain with a cycle
+        ('t:Note', 'c3', None, None, '<p>Cash 15 &amp; more</p>')]  # Escaped
+    assert all(f.context is not None for f in model.facts.values())
+
+
+def test_continuation_chain():
+    ixm = instance.Instance(INLINE).ixbrl
+    assert [e.attrib.get('id') for e in ixm.get_continuation_chain(' k1 ')] == ['k1', 'k2']
+    assert ixm.get_continuation_chain('k9') == []
+    assert list(ixm.idx_nav) == [('continuation', 'id')]  # Lookups go through the attribute index
+    assert [eb.origin.text for eb in ixm.get_by_attribute('continuation', 'id', 'k2')] == [' more']
+
+
+def test_to_xml(tmp_path):
+    xid = instance.Instance(INLINE, container_pool=pool.Pool(cache_folder=str(tmp_path)))
+    root = lxml.XML(xid.to_xml().encode('utf-8'))
+    assert [e.attrib.get(f'{{{const.NS_XLINK}}}href') for e in root.iter(f'{{{const.NS_LINK}}}*')] == [
+        'http://example.com/base/t.xsd', 'http://example.com/base/lb/t-lab.xml']
+    facts = [e for e in root if e.attrib.get('contextRef')]
+    assert [(lxml.QName(e).localname, e.attrib.get('contextRef'), e.text) for e in facts] == \
+           [(f.name, f.context_ref, f.value) for f in xid.xbrl.facts.values()]
+
+
+def test_xml_base(tmp_path):
+    location = str(tmp_path / 'bases.xhtml')
+    with open(location, 'w', encoding='utf-8') as f:
+        f.write(BASES)
+    xid = instance.Instance(location)
+    assert sorted(xid.xbrl.schema_refs) == ['http://example.com/a/c/t.xsd']
+    assert sorted(xid.xbrl.linkbase_refs) == [
+        'http://abs.com/l4.xml', 'http://example.com/a/c/l1.xml', 'http://example.com/root/l2.xml',
+        'http://other.com/x/l3.xml']
+    root = lxml.XML(xid.to_xml().encode('utf-8'))
+    assert [e.attrib.get(f'{{{const.NS_XLINK}}}href') for e in root.iter(f'{{{const.NS_LINK}}}*')] == [
+        'http://example.com/a/c/t.xsd', 'http://example.com/a/c/l1.xml', 'http://example.com/root/l2.xml',
+        'http://other.com/x/l3.xml', 'http://abs.com/l4.xml']
@@ -0,0 +1,41 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+from xbrl.base import pool
+
+IXDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ixds')
+DOC1 = os.path.join(IXDS, 'doc1.xhtml')
+DOC2 = os.path.join(IXDS, 'doc2.xhtml')
+FACTS = [
+    ('t:Assets', 'c1', 'EUR', '1234500'),
+    ('t:Cash', 'c1', 'EUR', '-15'),
+    ('t:Name', 'c3', None, 'Hello bold world & co'),  # k1 in the second document, k2 in the first one continues at k1
+    ('t:Other', 'c1', 'EUR', '1.5'),
+    ('t:Note', 'c3', None, '<p>Some <b>bold</b></p><i>more</i> &lt; 5'),
+    ('t:Plain', 'c3', None, 'plain text')]
+
+
+def describe(xid):
+    model = xid.xbrl
+    assert all(f.context is not None for f in model.facts.values())
+    return [(f.qname, f.context_ref, f.unit_ref, f.value) for f in model.facts.values()]
+
+
+def test_workers(tmp_path):
+    dp = pool.Pool(cache_folder=str(tmp_path))
+    serial = dp.add_ixds(IXDS, key='serial', workers=1)
+    parallel = dp.add_ixds(IXDS, key='parallel', workers=2)
+    assert describe(serial) == FACTS
+    assert describe(parallel) == FACTS
+    assert describe(dp.add_ixds([DOC1, DOC2], workers=2)) == FACTS
+    assert sorted(parallel.xbrl.schema_refs) == ['t.xsd']
+    assert sorted(parallel.xbrl.contexts) == ['c1', 'c3']
+    assert [f.id for f in parallel.xbrl.facts.values()] == [1, 2, 3, 4, 5, 6]
+
+
+def test_single_document(tmp_path):
+    dp = pool.Pool(cache_folder=str(tmp_path))
+    xid = dp.add_ixds(DOC1)
+    assert [(f.qname, f.value) for f in xid.xbrl.facts.values()] == [
+        ('t:Assets', '1234500'), ('t:Cash', '-15'), ('t:Name', 'Hello bold')]
+    assert xid.base == IXDS
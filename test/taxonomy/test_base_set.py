@@ -0,0 +1,60 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+from xbrl.base import pool
+
+DTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'dts')
+ENTRY_POINT = os.path.normpath(os.path.join(DTS, 't.xsd'))
+EXTENSION = os.path.normpath(os.path.join(DTS, 'ext.xsd'))
+PRESENTATION = 'presentationArc|http://www.xbrl.org/2003/arcrole/parent-child|http://example.com/role/r1'
+
+
+def describe(members):
+    return [(n.Concept.qname, n.Level, n.Arc, n.IsLeaf, n.Label) for n in members]
+
+
+def check(bs):
+    """ Compares the compiled pre-order with the recursive traversal for all branches. """
+    assert describe(bs.get_members()) == describe(bs.get_members_filtered())
+    for qname in set(n.Concept.qname for n in bs.get_members()):
+        for include_head in (True, False):
+            assert describe(bs.get_members(qname, include_head)) == \
+                   describe(bs.get_members_filtered(qname, include_head))
+
+
+def test_pre_order(tmp_path):
+    dp = pool.Pool(cache_folder=str(tmp_path))
+    tax = dp.add_taxonomy([ENTRY_POINT])
+    for bs in tax.base_sets.values():
+        check(bs)
+    bs = tax.base_sets[PRESENTATION]
+    assert [(n.Concept.qname, n.Level, n.Label) for n in bs.get_members()] == [
+        ('t:Root', 0, 'Root'), ('t:Assets', 1, 'Total assets'), ('t:Cash', 2, 'Cash'),
+        ('t:Other', 2, 'Sonstige'), ('t:Name', 1, '')]
+    assert bs.get_tree() is bs.get_tree()  # Compiled once
+
+
+def test_late_relationship(tmp_path):
+    dp = pool.Pool(cache_folder=str(tmp_path))
+    tax = dp.add_taxonomy([ENTRY_POINT])
+    bs = tax.base_sets[PRESENTATION]
+    definition_trees = {key: b.get_tree() for key, b in tax.base_sets.items() if key != PRESENTATION}
+    assert [n.Concept.qname for n in bs.get_members('t:Cash')] == ['t:Cash']
+    assert bs.get_members('t:Other')[0].Label == 'Sonstige'
+
+    # The extension connects Cash => Name in the same base set and an English label to Other. The first taxonomy
+    # is not affected.
+    ext = dp.add_taxonomy([EXTENSION])
+    assert [n.Concept.qname for n in bs.get_members('t:Cash')] == ['t:Cash']
+    assert bs.get_members('t:Other')[0].Label == 'Sonstige'
+    ext_bs = ext.base_sets[PRESENTATION]
+    # Cash is also a root, because it is the source of the arc in another extended link
+    assert [(n.Concept.qname, n.Level) for n in ext_bs.get_members()] == [
+        ('t:Root', 0), ('t:Assets', 1), ('t:Cash', 2), ('t:Name', 3), ('t:Other', 2), ('t:Name', 1),
+        ('t:Cash', 0), ('t:Name', 1)]
+    assert ext_bs.get_members('t:Other')[0].Label == 'Other assets'
+    check(bs)
+    check(ext_bs)
+    # Other base sets are not affected
+    assert all(tax.base_sets[key].tree is tree for key, tree in definition_trees.items())
+
@@ -0,0 +1,19 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+from xbrl.base import pool
+
+DTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'dts')
+ENTRY_POINT = os.path.normpath(os.path.join(DTS, 't.xsd'))
+
+
+def test_parallel_discovery(tmp_path):
+    serial_pool = pool.Pool(cache_folder=str(tmp_path))
+    serial = serial_pool.add_taxonomy([ENTRY_POINT])
+    parallel_pool = pool.Pool(cache_folder=str(tmp_path), discovery_workers=4)
+    parallel = parallel_pool.add_taxonomy([ENTRY_POINT])
+    assert not parallel_pool.prefetched
+    assert sorted(parallel.schemas) == sorted(serial.schemas)
+    assert sorted(parallel.linkbases) == sorted(serial.linkbases) and len(serial.linkbases) == 4
+    assert sorted(parallel.concepts_by_qname) == sorted(serial.concepts_by_qname)
+    assert sorted(parallel.base_sets) == sorted(serial.base_sets)
@@ -0,0 +1,28 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+from xbrl.base import pool
+
+DTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'dts')
+ENTRY_POINT = os.path.normpath(os.path.join(DTS, 'tab.xsd'))
+
+
+def get_labels(tax):
+    return {qn: (c.get_label(), c.get_label(lang='de'), c.get_label(lang='en-GB'), c.get_label(role='/totalLabel'),
+                 c.get_label(role='http://www.xbrl.org/2003/role/totalLabel'))
+            for qn, c in tax.concepts_by_qname.items()}
+
+
+def test_compile_labels(tmp_path):
+    dp = pool.Pool(cache_folder=str(tmp_path))
+    tax = dp.add_taxonomy([ENTRY_POINT])
+    labels = get_labels(tax)
+    for c in tax.concepts_by_qname.values():
+        c.reset_labels()
+    tax.compile_labels()
+    assets = tax.concepts_by_qname['t:Assets']
+    assert assets.label_cache[('en', '/totalLabel')] == 'Total assets'
+    assert assets.label_cache[('de', '/label')] == 'Vermoegen'
+    assert tax.tables['tab1'].label_cache[('de', '/label')] == 'Bilanz'
+    assert get_labels(tax) == labels
+    assert labels['t:Assets'] == ('Assets', 'Vermoegen', 'Assets', 'Total assets', 'Total assets')
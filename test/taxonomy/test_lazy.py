@@ -0,0 +1,66 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+from xbrl.base import pool
+
+DTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'dts')
+ENTRY_POINT = os.path.normpath(os.path.join(DTS, 'tab.xsd'))
+
+
+def get_tree(res):
+    """ Returns the tree of nested table resources with their labels. """
+    return (res.name, res.xlabel, getattr(res, 'order', None), res.get_label(), res.get_label(lang='de'),
+            [get_tree(r) for name, d in sorted(res.nested.items()) if name != 'label'
+             for key, lst in sorted(d.items()) for r in lst])
+
+
+def describe(tax, base_set_keys):
+    return (
+        [(qn, c.get_label(), c.get_label(lang='de'), c.get_label(role='/totalLabel'))
+         for qn, c in sorted(tax.concepts_by_qname.items())],
+        {key: [(n.Concept.qname, n.Level) for n in tax.get_bs_members(arc_name, role, arcrole)]
+         for key in base_set_keys for arc_name, arcrole, role in [key.split('|')]},
+        [get_tree(t) for key, t in sorted(tax.tables.items())])
+
+
+def load(tmp_path, lazy):
+    folder = tmp_path / ('lazy' if lazy else 'eager')
+    folder.mkdir()
+    dp = pool.Pool(cache_folder=str(folder), lazy_linkbases=lazy)
+    return dp.add_taxonomy([ENTRY_POINT])
+
+
+def test_lazy_loading(tmp_path):
+    eager = load(tmp_path, False)
+    lazy = load(tmp_path, True)
+    assert not eager.deferred_linkbases
+    assert set(lazy.deferred_linkbases) == {'label', 'presentation', 'reference', 'table'}
+    assert len(lazy.linkbases) < len(eager.linkbases)
+
+    tables = lazy.tables  # Loads table and label linkbases only
+    assert set(lazy.deferred_linkbases) == {'presentation', 'reference'}
+    assert [get_tree(t) for key, t in sorted(tables.items())] == [
+        ('table', 'tab1', 0, 'Balance sheet', 'Bilanz', [
+            ('breakdown', 'x1', '1', '', '', [('ruleNode', 'rPeriod', '1', '', '', [])]),
+            ('breakdown', 'y1', '2', '', '', [
+                ('ruleNode', 'rAssets', '1', 'Assets row', 'Assets row', [('ruleNode', 'rCash', '1', '', '', [])])])])]
+    assert describe(lazy, eager.base_sets) == describe(eager, eager.base_sets)
+    assert lazy.info() == eager.info()
+    assert not lazy.deferred_linkbases
+
+
+def test_lazy_info(tmp_path):
+    eager = load(tmp_path, False)
+    lazy = load(tmp_path, True)
+    # info reads collections through the loader, so that counts do not depend on what was accessed before
+    assert lazy.info() == eager.info()
+    assert 'Tables: 1' in lazy.info()
+
+
+def test_lazy_concept_resources(tmp_path):
+    lazy = load(tmp_path, True)
+    assets = lazy.concepts_by_qname['t:Assets']
+    assert assets.resources == {}
+    assets.load_resources(('label', 'reference'))
+    assert len(assets.resources['label']) == 3
+    assert assets.get_reference(lang=None, role='/reference')
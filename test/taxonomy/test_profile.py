@@ -0,0 +1,68 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+from lxml import etree as lxml
+from xbrl.base import pool, const
+from xbrl.taxonomy import profile
+
+DTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'dts')
+ENTRY_POINT = os.path.normpath(os.path.join(DTS, 't.xsd'))
+
+
+def make_label(lang=None, role=None):
+    e = lxml.Element(f'{{{const.NS_LINK}}}label')
+    if lang is not None:
+        e.set(f'{{{const.NS_XML}}}lang', lang)
+    if role is not None:
+        e.set(f'{{{const.NS_XLINK}}}role', role)
+    return e
+
+
+def load(tmp_path, lp):
+    dp = pool.Pool(cache_folder=str(tmp_path), load_profile=lp)
+    return dp.add_taxonomy([ENTRY_POINT])
+
+
+def test_languages():
+    lp = profile.LoadProfile(languages=['en', 'DE'])
+    assert lp.accepts_label(make_label('en'))
+    assert lp.accepts_label(make_label('en-GB'))
+    assert lp.accepts_label(make_label('EN-us'))
+    assert lp.accepts_label(make_label('de'))
+    assert lp.accepts_label(make_label())
+    assert not lp.accepts_label(make_label('eng'))
+    assert not lp.accepts_label(make_label('fr'))
+    assert not lp.accepts_label(make_label('e'))
+
+
+def test_label_roles():
+    lp = profile.LoadProfile(label_roles=['/label', 'http://www.xbrl.org/2003/role/terseLabel'])
+    assert lp.accepts_label(make_label('en'))  # Standard label role by default
+    assert lp.accepts_label(make_label('en', const.ROLE_LABEL))
+    assert lp.accepts_label(make_label('en', 'http://www.xbrl.org/2003/role/terseLabel'))
+    assert not lp.accepts_label(make_label('en', 'http://www.xbrl.org/2003/role/totalLabel'))
+
+
+def test_profile_key():
+    assert profile.LoadProfile().get_key() == '*|*|'
+    lp = profile.LoadProfile(['en'], ['/label'], ['referenceArc', 'referenceLink'])
+    assert lp.get_key() == 'en|/label|referenceArc,referenceLink'
+
+
+def test_filtered_taxonomy(tmp_path):
+    tax = load(tmp_path, profile.LoadProfile(languages=['en'], label_roles=['/label']))
+    assets = tax.concepts_by_qname['t:Assets']
+    assert assets.get_label() == 'Assets'
+    assert sorted(assets.resources['label']) == [f'en|{const.ROLE_LABEL}']
+    assert tax.concepts_by_qname['d:Europe'].get_label(lang='en-GB') == 'Europe'  # Subtag of en
+    langs = {lbl.lang for c in tax.concepts_by_qname.values()
+             for lst in c.resources.get('label', {}).values() for lbl in lst}
+    assert langs == {'en', 'en-GB'}
+
+
+def test_excluded_arcs(tmp_path):
+    tax = load(tmp_path, profile.LoadProfile(exclude=['presentationArc', 'referenceLink']))
+    assert not [key for key in tax.base_sets if key.startswith('presentationArc')]
+    assert [key for key in tax.base_sets if key.startswith('definitionArc')]
+    assert tax.concepts_by_qname['t:Assets'].get_reference(lang=None, role='/reference') == []
+    assert tax.concepts_by_qname['t:Assets'].get_label(lang='de') == 'Vermoegen'
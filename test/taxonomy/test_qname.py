@@ -0,0 +1,21 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+from xbrl.base import pool
+
+DTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'dts')
+ENTRY_POINT = os.path.normpath(os.path.join(DTS, 't.xsd'))
+
+
+def test_split_qname(tmp_path):
+    dp = pool.Pool(cache_folder=str(tmp_path))
+    tax = dp.add_taxonomy([ENTRY_POINT])
+    assert tax.split_qname('t:Assets') == ('http://example.com/t', 'Assets')
+    assert tax.split_qname('d:Europe') == ('http://example.com/d', 'Europe')
+    assert tax.resolve_qname('t:Assets') == 'http://example.com/t:Assets'
+    assert tax.resolve_prefix('t') == 'http://example.com/t'
+    # Unknown prefix and no prefix without a default namespace
+    assert tax.split_qname('x:Assets') == (None, 'Assets')
+    assert tax.split_qname('Assets') == (None, 'Assets')
+    assert tax.resolve_prefix('x') is None
+
@@ -0,0 +1,45 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+from xbrl.base import pool
+from xbrl.taxonomy import schema
+
+DTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'dts')
+ENTRY_POINT = os.path.normpath(os.path.join(DTS, 't.xsd'))
+SHARED = os.path.normpath(os.path.join(DTS, 'd.xsd'))
+
+
+def describe(tax):
+    return (
+        sorted(tax.concepts_by_qname),
+        {key: [(n.Concept.qname, n.Level) for n in bs.get_members()] for key, bs in tax.base_sets.items()},
+        [(c.get_label(), c.get_label(lang='de'), c.get_label(role='/totalLabel'))
+         for _, c in sorted(tax.concepts_by_qname.items())])
+
+
+def fail(*args):
+    raise AssertionError('Schema parsed although a snapshot exists')
+
+
+def test_snapshot_round_trip(tmp_path, monkeypatch):
+    tax = pool.Pool(cache_folder=str(tmp_path), use_snapshots=True).add_taxonomy([ENTRY_POINT])
+    assert os.listdir(tmp_path / 'snapshots')
+    monkeypatch.setattr(schema.Schema, '__init__', fail)
+    dp = pool.Pool(cache_folder=str(tmp_path), use_snapshots=True)
+    restored = dp.add_taxonomy([ENTRY_POINT])
+    assert dp.parses_avoided == 0
+    assert restored.pool is dp
+    assert describe(restored) == describe(tax)
+    assert all(dp.schemas[href] is sh for href, sh in restored.schemas.items())
+
+
+def test_snapshot_with_pooled_documents(tmp_path):
+    tax = pool.Pool(cache_folder=str(tmp_path), use_snapshots=True).add_taxonomy([ENTRY_POINT])
+    dp = pool.Pool(cache_folder=str(tmp_path), use_snapshots=True)
+    shared = dp.add_taxonomy([SHARED])
+    restored = dp.add_taxonomy([ENTRY_POINT])
+    assert dp.parses_avoided == 0
+    assert describe(restored) == describe(tax)
+    # The restored taxonomy has its own objects
+    assert restored.schemas[SHARED] is not shared.schemas[SHARED]
+    assert sorted(shared.concepts_by_qname) == ['d:AllRegions', 'd:Asia', 'd:Europe', 'd:Japan', 'd:RegionAxis']
@@ -0,0 +1,95 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+import zipfile
+from xbrl.taxonomy import tpack, tpack_index
+
+PACKAGE_XML = '''<tp:taxonomyPackage xmlns:tp="http://xbrl.org/2016/taxonomy-package">
+  <tp:name>Test</tp:name>
+  <tp:entryPoints>
+    <tp:entryPoint>
+      <tp:name>ep</tp:name>
+      <tp:entryPointDocument href="http://example.com/tax/a/ep.xsd"/>
+    </tp:entryPoint>
+  </tp:entryPoints>
+</tp:taxonomyPackage>'''
+
+CATALOG_XML = '''<catalog xmlns="urn:oasis:names:tc:entity:xmlns:xml:catalog">
+  <rewriteURI uriStartString="http://example.com/tax/" rewritePrefix="../www/"/>
+  <rewriteURI uriStartString="http://example.com/other/a/" rewritePrefix="../www/a/"/>
+</catalog>'''
+
+
+def make_package(folder, stored=False):
+    location = os.path.join(folder, 'pkg.zip')
+    compression = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(location, 'w', compression) as z:
+        z.writestr('pkg/META-INF/taxonomyPackage.xml', PACKAGE_XML)
+        z.writestr('pkg/META-INF/catalog.xml', CATALOG_XML)
+        z.writestr('pkg/www/a/ep.xsd', '<schema/>')
+        z.writestr('pkg/www/b.xsd', '<b/>')
+        z.writestr('pkg/reports/r1.xbrl', '<xbrl/>')
+    return location
+
+
+def test_trie_longest_prefix():
+    trie = tpack_index.PrefixTrie()
+    trie.add('pkg/www/', 'short')
+    trie.add('pkg/www/a/', 'long')
+    trie.add('pkg/', 'root')
+    assert trie.match('pkg/www/a/ep.xsd') == ('pkg/www/a/', 'long')
+    assert trie.match('pkg/www/b.xsd') == ('pkg/www/', 'short')
+    assert trie.match('pkg/other.xsd') == ('pkg/', 'root')
+    assert trie.match('pkg') is None
+    assert trie.match('other/www/a/ep.xsd') is None
+
+
+def test_trie_first_registration_wins():
+    trie = tpack_index.PrefixTrie()
+    trie.add('pkg/www/', 'first')
+    trie.add('pkg/www/', 'second')
+    assert trie.match('pkg/www/x.xsd') == ('pkg/www/', 'first')
+
+
+def test_trie_empty_prefix():
+    trie = tpack_index.PrefixTrie()
+    trie.add('', 'any')
+    trie.add('pkg/', 'pkg')
+    assert trie.match('x.xsd') == ('', 'any')
+    assert trie.match('pkg/x.xsd') == ('pkg/', 'pkg')
+
+
+def test_package_index(tmp_path):
+    for stored in (False, True):
+        folder = tmp_path / ('stored' if stored else 'deflated')
+        folder.mkdir()
+        location = make_package(str(folder), stored)
+        index = tpack_index.PackageIndex(location)
+        assert not index.load()
+        with zipfile.ZipFile(location) as archive:
+            index.build(archive)
+        index.save()
+        assert index.read('pkg/www/b.xsd') == b'<b/>'
+        assert index.read('missing') is None
+        index.close()
+
+        reloaded = tpack_index.PackageIndex(location)
+        assert reloaded.load()
+        assert reloaded.members == index.members
+        assert reloaded.read('pkg/www/a/ep.xsd') == b'<schema/>'
+        reloaded.close()
+
+
+def test_package_rewrites(tmp_path):
+    location = make_package(str(tmp_path))
+    for run in range(2):  # The second run reads the persisted index
+        tp = tpack.TaxonomyPackage(location, cache_folder=str(tmp_path))
+        tp.compile()
+        # Both rewrites match pkg/www/a/ep.xsd, the longest rewrite prefix is used
+        assert tp.files.get('http://example.com/other/a/ep.xsd') == 'pkg/www/a/ep.xsd'
+        assert 'http://example.com/tax/a/ep.xsd' not in tp.files
+        assert tp.files.get('http://example.com/tax/b.xsd') == 'pkg/www/b.xsd'
+        assert tp.get_url('http://example.com/tax/b.xsd') == b'<b/>'
+        assert tp.reports == ['pkg/reports/r1.xbrl']
+        assert tp.entrypoints[0].Urls == ['http://example.com/tax/a/ep.xsd']
+        tp.index.close()
@@ -0,0 +1,84 @@
+import sys
+sys.path.insert(0, r'../../../')
+import os
+from xbrl.base import pool
+
+DTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures', 'dts')
+ENTRY_POINT = os.path.normpath(os.path.join(DTS, 'dim.xsd'))
+R, P, D = 'd:RegionAxis', 'x:ProductAxis', 'x:DestinationAxis'
+
+
+def get_index(tmp_path):
+    dp = pool.Pool(cache_folder=str(tmp_path))
+    tax = dp.add_taxonomy([ENTRY_POINT])
+    return tax, tax.get_validity_index()
+
+
+def get_drs(tax, role, arcrole='all'):
+    dr_sets = tax.dr_sets if arcrole == 'all' else tax.dr_sets_excluding
+    return dr_sets[f'definitionArc|http://xbrl.org/int/dim/arcrole/{arcrole}|http://example.com/role/{role}']
+
+
+def test_compile(tmp_path):
+    tax, index = get_index(tmp_path)
+    assert tax.defaults == {R: 'd:AllRegions'}
+    closed = get_drs(tax, 'rClosed')
+    assert [(d, sorted(m), has_default) for d, m, has_default in index.drs_dimensions[closed]] == \
+           [(R, ['d:AllRegions', 'd:Asia', 'd:Europe', 'd:Japan'], True)]
+    assert [(c, ce, sorted(dims)) for c, ce, dims, _ in index.drs_hypercubes[closed]] == [(True, 'scenario', [R])]
+    opened = get_drs(tax, 'rOpen')
+    assert [(d, sorted(m), has_default) for d, m, has_default in index.drs_dimensions[opened]] == \
+           [(P, ['x:Bikes', 'x:Cars'], False)]  # Products is not usable
+    assert [(c, ce) for c, ce, _, _ in index.drs_hypercubes[get_drs(tax, 'rDef')]] == [(True, None)]
+    excluded = get_drs(tax, 'rEx', 'notAll')
+    assert [(d, sorted(m), has_default) for d, m, has_default in index.drs_dimensions[excluded]] == \
+           [(R, ['d:Japan'], False)]  # The default member is not in the excluded domain
+    destination = get_drs(tax, 'rDest')
+    assert [(d, sorted(m), has_default) for d, m, has_default in index.drs_dimensions[destination]] == \
+           [(D, ['d:AllRegions', 'd:Europe'], False)]  # The default member of another dimension
+    assert index.get_drs('x:Costs') == {closed, excluded}
+    assert index.get_drs('x:Note') is None
+
+
+def test_match_drs(tmp_path):
+    tax, index = get_index(tmp_path)
+    closed, opened = get_drs(tax, 'rClosed'), get_drs(tax, 'rOpen')
+    assert index.match_drs(closed, {})  # Default member
+    assert index.match_drs(closed, {R: 'd:Japan'})
+    assert index.match_drs(closed, {R: None})  # Open dimension
+    assert not index.match_drs(closed, {R: 'x:Cars'})
+    assert not index.match_drs(closed, {R: 'd:Europe', P: 'x:Cars'})
+    assert not index.match_drs(opened, {})  # No default member
+    assert index.match_drs(opened, {P: 'x:Cars'})
+    assert not index.match_drs(opened, {P: 'x:Products'})
+    excluded = get_drs(tax, 'rEx', 'notAll')
+    assert index.match_drs(excluded, {R: 'd:Japan'})
+    assert not index.match_drs(excluded, {R: 'd:Europe'})
+    assert not index.match_drs(excluded, {})
+    assert not index.match_drs(get_drs(tax, 'rDest'), {})
+
+    assert index.is_valid('x:Sales', {P: 'x:Bikes'})
+    assert not index.is_valid('x:Sales', {})
+    assert not index.is_valid('x:Note', {})  # No DRS
+
+
+def test_is_valid_context(tmp_path):
+    tax, index = get_index(tmp_path)
+    assert index.is_valid_context('x:Costs', {}, {})
+    assert index.is_valid_context('x:Costs', {}, {R: 'd:Asia'})
+    assert not index.is_valid_context('x:Costs', {}, {R: 'd:Japan'})
+    assert not index.is_valid_context('x:Costs', {}, {R: 'd:AllRegions'})
+    assert not index.is_valid_context('x:Costs', {}, {R: None})  # Typed value of an explicit dimension
+    # Open hypercube allows other dimensions, closed does not - only in its own context element
+    assert index.is_valid_context('x:Sales', {}, {P: 'x:Cars', R: 'd:Europe'})
+    assert index.is_valid_context('x:Sales', {R: 'd:Europe'}, {P: 'x:Cars'})
+    assert not index.is_valid_context('x:Staff', {R: 'd:Europe', P: 'x:Cars'}, {})
+    assert index.is_valid_context('x:Staff', {R: 'd:Europe'}, {P: 'x:Cars'})
+    assert not index.is_valid_context('x:Profit', {}, {P: 'x:Cars'})
+    assert index.is_valid_context('x:Profit', {P: 'x:Cars'}, {})
+    assert index.is_valid_context('x:Note', {P: 'x:Cars'}, {R: 'x:Cars'})
+    # The default member of the region axis is an ordinary member of the destination axis
+    assert index.is_valid_context('x:Freight', {}, {D: 'd:AllRegions'})
+    assert index.is_valid_context('x:Freight', {}, {D: 'd:Europe'})
+    assert not index.is_valid_context('x:Freight', {}, {})
+    assert not index.is_valid_context('x:Freight', {}, {D: 'd:AllRegions', R: 'd:AllRegions'})